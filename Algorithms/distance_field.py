@@ -0,0 +1,179 @@
+import heapq
+from collections import deque
+from Algorithms.astar import __passable__
+
+
+class DistanceField:
+    """Multi-source BFS distances over the walkable tiles of the map. Every tile knows its distance to the nearest source and the next tile on the way there."""
+
+    def __init__(self, map: list, sources: list) -> None:
+        """Initializes the field and runs the BFS from the given sources.
+
+        Args:
+            map (list): the stored map or its Terrain
+            sources (list): tile positions (x, y) the distances get measured to
+        """
+        self.height = len(map)
+        self.width = len(map[0])
+        self.passable = __passable__(map)
+        self.rebuild(sources)
+
+    def __neighbors__(self, index: int) -> list:
+        """Returns the flat indices of the tiles orthogonally adjacent to a tile.
+
+        Args:
+            index (int): flat index of the tile
+
+        Returns:
+            list: flat indices of the neighbors inside the map
+        """
+        x, y = index % self.width, index // self.width
+        neighbors = []
+        if y > 0:
+            neighbors.append(index - self.width)
+        if x < self.width - 1:
+            neighbors.append(index + 1)
+        if y < self.height - 1:
+            neighbors.append(index + self.width)
+        if x > 0:
+            neighbors.append(index - 1)
+        return neighbors
+
+    def rebuild(self, sources: list) -> None:
+        """Recomputes the whole field. Sources don't need to be walkable themselves (e.g. water), the BFS only expands over walkable tiles.
+
+        Args:
+            sources (list): tile positions (x, y) the distances get measured to
+        """
+        size = self.width * self.height
+        self.distances = [-1] * size
+        self.parents = [-1] * size  # next tile on the way to the nearest source
+
+        queue = deque()
+        for x, y in sources:
+            index = y * self.width + x
+            if self.distances[index] == -1:
+                self.distances[index] = 0
+                queue.append(index)
+
+        distances, parents, passable = self.distances, self.parents, self.passable
+        while queue:
+            current = queue.popleft()
+            distance = distances[current] + 1
+            for neighbor in self.__neighbors__(current):
+                if distances[neighbor] == -1 and passable[neighbor]:
+                    distances[neighbor] = distance
+                    parents[neighbor] = current
+                    queue.append(neighbor)
+
+    def add_sources(self, sources: list) -> None:
+        """Adds sources without a rebuild, only the tiles that are now closer to one of them get updated.
+
+        Args:
+            sources (list): tile positions (x, y) of the new sources
+        """
+        distances, parents, passable = self.distances, self.parents, self.passable
+
+        queue = deque()
+        for x, y in sources:
+            index = y * self.width + x
+            if distances[index] != 0:
+                distances[index] = 0
+                parents[index] = -1
+                queue.append(index)
+
+        while queue:
+            current = queue.popleft()
+            distance = distances[current] + 1
+            for neighbor in self.__neighbors__(current):
+                if passable[neighbor] and (distances[neighbor] == -1 or distances[neighbor] > distance):
+                    distances[neighbor] = distance
+                    parents[neighbor] = current
+                    queue.append(neighbor)
+
+    def remove_sources(self, sources: list) -> None:
+        """Removes sources without a rebuild. Only the tiles that led to one of them get recomputed, starting from the unaffected tiles around them.
+
+        Args:
+            sources (list): tile positions (x, y) of the removed sources
+        """
+        distances, parents, passable = self.distances, self.parents, self.passable
+
+        # every tile whose way leads to a removed source, found by walking the parents backwards
+        affected = []
+        for x, y in sources:
+            index = y * self.width + x
+            if distances[index] == 0:
+                distances[index] = -1
+                affected.append(index)
+        for current in affected:  # grows while iterating
+            for neighbor in self.__neighbors__(current):
+                if parents[neighbor] == current and distances[neighbor] > 0:
+                    distances[neighbor] = -1
+                    parents[neighbor] = -1
+                    affected.append(neighbor)
+
+        # the unaffected tiles bordering the region keep their distance and grow back into it
+        border = set()
+        for current in affected:
+            for neighbor in self.__neighbors__(current):
+                if distances[neighbor] != -1:
+                    border.add((distances[neighbor], neighbor))
+
+        open_set = list(border)
+        heapq.heapify(open_set)
+        while open_set:
+            distance, current = heapq.heappop(open_set)
+            if distance > distances[current]:
+                continue  # outdated heap entry
+            distance += 1
+            for neighbor in self.__neighbors__(current):
+                if passable[neighbor] and (distances[neighbor] == -1 or distances[neighbor] > distance):
+                    distances[neighbor] = distance
+                    parents[neighbor] = current
+                    heapq.heappush(open_set, (distance, neighbor))
+
+    def distance(self, pos: tuple) -> int:
+        """Returns the distance from a tile to its nearest source.
+
+        Args:
+            pos (tuple): tile position (x, y)
+
+        Returns:
+            int: amount of steps, None if no source can be reached
+        """
+        distance = self.distances[pos[1] * self.width + pos[0]]
+        return None if distance == -1 else distance
+
+    def next_step(self, pos: tuple) -> tuple:
+        """Returns the next tile on the shortest way to the nearest source.
+
+        Args:
+            pos (tuple): tile position (x, y)
+
+        Returns:
+            tuple: the next tile, None if the tile is a source or no source can be reached
+        """
+        parent = self.parents[pos[1] * self.width + pos[0]]
+        return None if parent == -1 else (parent % self.width, parent // self.width)
+
+    def path(self, pos: tuple) -> list:
+        """Follows the field from a tile to its nearest source, the same format astar.find_path returns.
+
+        Args:
+            pos (tuple): tile position (x, y)
+
+        Returns:
+            list: the path excluding the start and including the source, [pos] if the tile is a source itself, empty if no source can be reached
+        """
+        index = pos[1] * self.width + pos[0]
+        if self.distances[index] == -1:
+            return []
+        if self.distances[index] == 0:
+            return [pos]
+
+        path = []
+        while self.distances[index] > 0:
+            index = self.parents[index]
+            path.append((index % self.width, index // self.width))
+        return path
@@ -1,8 +1,13 @@
 import random as rnd
 
 class GeneticAlgorithm:
-    def __init__(self):
-        pass
+    def __init__(self, rng: rnd.Random = None):
+        """Initializes the algorithm.
+
+        Args:
+            rng (rnd.Random, optional): Random number stream used for inheritance and mutation. Defaults to None so that the random module is used.
+        """
+        self.rng = rnd if rng is None else rng
 
     def generate_genomes(self, genomes1: dict, genomes2: dict) -> dict:
         """Generates a new set of genomes based on the ones passed into the function.
@@ -20,8 +25,8 @@ class GeneticAlgorithm:
         inheritance_values = [0 for _ in range(6)]
 
         for i in range(0, 5, 2):
-            t = rnd.randint(0, 1)
-            r = rnd.randint(0, 3)
+            t = self.rng.randint(0, 1)
+            r = self.rng.randint(0, 3)
             if i == 0:  # age values
                 if t == 0 and r >= 1:  # male dominant stays dominant
                     inheritance_values[i] = genomes_m["max_age_d"]
@@ -59,7 +64,7 @@ class GeneticAlgorithm:
                 inheritance_values[i + 1] = genomes_f["thirst_rate_d"]
                 inheritance_values[i] = genomes_m["thirst_rate_r"]
 
-        if rnd.randint(1, 20) == 1:
+        if self.rng.randint(1, 20) == 1:
             inheritance_values = self.mutate_genes(inheritance_values)
 
         return {
@@ -84,8 +89,8 @@ class GeneticAlgorithm:
         new_values = inh_val
 
         for i in range(0, 5, 2):
-            mut = round((rnd.uniform(new_values[i], new_values[i + 1]) / 4), 2)
-            x = rnd.randint(0, 1)
+            mut = round((self.rng.uniform(new_values[i], new_values[i + 1]) / 4), 2)
+            x = self.rng.randint(0, 1)
             new_values[i] += mut if x == 0 else (-1) * mut
             new_values[i + 1] += mut if x == 0 else (-1) * mut
 
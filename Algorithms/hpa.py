@@ -0,0 +1,427 @@
+import heapq
+from collections import deque
+import Algorithms.astar as ast
+from World.terrain import WATER
+
+# hierarchical pathfinders per map, keyed by the id of the map
+__pathfinders__ = {}
+
+
+class HierarchicalPathfinder:
+    """HPA* over square clusters of the map. Entrances between clusters are precomputed, paths inside a cluster
+    are computed on the first search that crosses the cluster and long queries only refine the clusters they pass."""
+
+    def __init__(self, grid: list, cluster_size: int = 16) -> None:
+        """Partitions the map into clusters and finds all entrances between them.
+
+        Args:
+            grid (list): the map
+            cluster_size (int, optional): Width and height of a cluster in tiles. Defaults to 16.
+        """
+        self.serial = next(ast.NavGrid.__serials__)  # identifies the map in the path cache
+        self.grid = grid
+        self.height = len(grid)
+        self.width = len(grid[0])
+        self.cluster_size = cluster_size
+        self.columns = -(-self.width // cluster_size)
+        self.rows = -(-self.height // cluster_size)
+
+        self.passable = ast.__passable__(grid)
+
+        self.transitions = {}  # (cluster, right or lower cluster) -> [(tile, tile)]
+        self.nodes = {}  # cluster -> abstract nodes (flat tile indices) inside of it
+        self.inter = {}  # abstract node -> nodes across a cluster border
+        self.intra = {}  # cluster -> {node: {node: distance}}, filled lazily
+        self.nav_grid = None  # plain A* for queries between neighboring clusters, built on the first one
+        self.expanded = 0  # tiles and abstract nodes expanded by the last search
+
+        for cy in range(self.rows):
+            for cx in range(self.columns):
+                for neighbor in ((cx + 1, cy), (cx, cy + 1)):
+                    if self.__in_clusters__(neighbor):
+                        self.__build_border__((cx, cy), neighbor)
+
+        for cy in range(self.rows):
+            for cx in range(self.columns):
+                self.__link_cluster__((cx, cy))
+
+    def __in_clusters__(self, cluster: tuple) -> bool:
+        return 0 <= cluster[0] < self.columns and 0 <= cluster[1] < self.rows
+
+    def __cluster__(self, index: int) -> tuple:
+        """Returns the cluster a flat tile index belongs to.
+
+        Args:
+            index (int): flat tile index
+
+        Returns:
+            tuple: cluster coordinates
+        """
+        return (index % self.width) // self.cluster_size, (index // self.width) // self.cluster_size
+
+    def __bounds__(self, cluster: tuple) -> tuple:
+        """Returns the tile bounds of a cluster.
+
+        Args:
+            cluster (tuple): cluster coordinates
+
+        Returns:
+            tuple: x0, y0, x1, y1 with the end values being exclusive
+        """
+        x0, y0 = cluster[0] * self.cluster_size, cluster[1] * self.cluster_size
+        return x0, y0, min(x0 + self.cluster_size, self.width), min(y0 + self.cluster_size, self.height)
+
+    def __build_border__(self, cluster: tuple, neighbor: tuple) -> None:
+        """Finds the entrances on the border between a cluster and its right or lower neighbor.
+        Every run of walkable tile pairs gets one transition in the middle, long runs get one at each end.
+
+        Args:
+            cluster (tuple): cluster coordinates
+            neighbor (tuple): coordinates of the right or lower neighbor
+        """
+        x0, y0, x1, y1 = self.__bounds__(cluster)
+        if neighbor[0] > cluster[0]:  # vertical border
+            pairs = [
+                (y * self.width + x1 - 1, y * self.width + x1) for y in range(y0, y1)
+            ]
+        else:  # horizontal border
+            pairs = [
+                ((y1 - 1) * self.width + x, y1 * self.width + x) for x in range(x0, x1)
+            ]
+
+        transitions = []
+        run = []
+        for pair in pairs + [None]:
+            if pair is not None and self.passable[pair[0]] and self.passable[pair[1]]:
+                run.append(pair)
+                continue
+            if len(run) >= 6:
+                transitions.extend((run[0], run[-1]))
+            elif run:
+                transitions.append(run[len(run) // 2])
+            run = []
+
+        self.transitions[(cluster, neighbor)] = transitions
+
+    def __link_cluster__(self, cluster: tuple) -> None:
+        """Collects the abstract nodes of a cluster from the transitions on its borders and links them to the nodes across.
+
+        Args:
+            cluster (tuple): cluster coordinates
+        """
+        for node in self.nodes.get(cluster, ()):
+            self.inter.pop(node, None)
+
+        nodes = set()
+        cx, cy = cluster
+        borders = (
+            ((cluster, (cx + 1, cy)), 0),
+            ((cluster, (cx, cy + 1)), 0),
+            (((cx - 1, cy), cluster), 1),
+            (((cx, cy - 1), cluster), 1),
+        )
+        for key, side in borders:
+            for pair in self.transitions.get(key, ()):
+                node, other = pair[side], pair[1 - side]
+                nodes.add(node)
+                self.inter.setdefault(node, set()).add(other)
+
+        self.nodes[cluster] = nodes
+        self.intra.pop(cluster, None)
+
+    def __bfs__(self, source: int, cluster: tuple, target: int = None) -> tuple:
+        """Breadth first search restricted to one cluster. The source and the target may lie just outside of it.
+
+        Args:
+            source (int): flat index of the start tile
+            cluster (tuple): cluster coordinates
+            target (int, optional): a tile that may be entered even if it is water or outside the cluster. Defaults to None.
+
+        Returns:
+            tuple: distances and parents of all reached tiles as dictionaries
+        """
+        x0, y0, x1, y1 = self.__bounds__(cluster)
+        width, passable = self.width, self.passable
+        distances, parents = {source: 0}, {source: None}
+        queue = deque([source])
+        while queue:
+            current = queue.popleft()
+            if current == target and current != source:
+                continue  # the target can be entered but not walked through
+            x, y = current % width, current // width
+            for nx, ny in ((x, y - 1), (x + 1, y), (x, y + 1), (x - 1, y)):
+                neighbor = ny * width + nx
+                if neighbor == target and 0 <= nx < width and 0 <= ny < self.height:
+                    pass
+                elif not (x0 <= nx < x1 and y0 <= ny < y1) or not passable[neighbor]:
+                    continue
+                if neighbor in distances:
+                    continue
+                distances[neighbor] = distances[current] + 1
+                parents[neighbor] = current
+                queue.append(neighbor)
+        self.expanded += len(distances)
+        return distances, parents
+
+    def __intra__(self, cluster: tuple) -> dict:
+        """Returns the distances between the abstract nodes of a cluster, computing them on first use.
+
+        Args:
+            cluster (tuple): cluster coordinates
+
+        Returns:
+            dict: node -> {node: distance}
+        """
+        edges = self.intra.get(cluster)
+        if edges is None:
+            edges = {}
+            nodes = self.nodes[cluster]
+            for node in nodes:
+                distances = self.__bfs__(node, cluster)[0]
+                edges[node] = {
+                    other: distances[other]
+                    for other in nodes
+                    if other != node and other in distances
+                }
+            self.intra[cluster] = edges
+        return edges
+
+    def __local_path__(self, source: int, target: int, cluster: tuple) -> list:
+        """Refines one segment of an abstract path inside a cluster.
+
+        Args:
+            source (int): flat index of the start tile
+            target (int): flat index of the end tile
+            cluster (tuple): cluster coordinates
+
+        Returns:
+            list: tile positions excluding the start, empty if the target can't be reached
+        """
+        parents = self.__bfs__(source, cluster, target)[1]
+        if target not in parents:
+            return []
+
+        path = []
+        current = target
+        while current != source:
+            path.append((current % self.width, current // self.width))
+            current = parents[current]
+        path.reverse()
+        return path
+
+    def find_path(self, start: tuple, end: tuple) -> list:
+        """Finds a path on the abstract graph and refines it. Same contract as astar.find_path.
+
+        Paths over entrances can detour: between neighboring clusters they came out up to six times longer than the
+        shortest one, so start and end in the same or neighboring clusters get searched with plain A* and the path
+        is optimal. Farther apart the detours get diluted by the length of the path. On generated maps with clusters
+        of 16 tiles paths two clusters apart were at most 1.75 times as long as the shortest one (1.04 on average),
+        from three clusters on at most 1.4 times (1.02 on average).
+
+        Args:
+            start (tuple): start point
+            end (tuple): end point
+
+        Returns:
+            list: the path excluding the start and including the end, empty if none was found
+        """
+        if start == end:
+            return [end]
+        if not all(0 <= p[0] < self.width and 0 <= p[1] < self.height for p in (start, end)):
+            return []
+
+        source = start[1] * self.width + start[0]
+        target = end[1] * self.width + end[0]
+        (sx, sy), (ex, ey) = self.__cluster__(source), self.__cluster__(target)
+        if abs(sx - ex) <= 1 and abs(sy - ey) <= 1:
+            if self.nav_grid is None:
+                self.nav_grid = ast.NavGrid(self.grid)
+            path = self.nav_grid.search(start, end)
+            self.expanded = self.nav_grid.expanded
+            return path
+
+        self.expanded = 0
+        start_clusters = self.__clusters_around__(source)
+        end_clusters = self.__clusters_around__(target)
+
+        for cluster in start_clusters & end_clusters:
+            path = self.__local_path__(source, target, cluster)
+            if path:
+                return path
+
+        # temporarily connect start and end to the nodes of their clusters
+        start_edges = self.__connect__(source, start_clusters)
+        end_edges = self.__connect__(target, end_clusters)
+
+        abstract = self.__abstract_search__(source, target, start_edges, end_edges)
+        if not abstract:
+            return []
+
+        path = []
+        for a, b in zip(abstract, abstract[1:]):
+            if b in self.inter.get(a, ()):
+                path.append((b % self.width, b // self.width))
+                continue
+            # start and end may lie outside the cluster of the entrance they got connected to
+            segment = self.__local_path__(a, b, self.__cluster__(b if a == source else a))
+            if not segment:
+                return []
+            path.extend(segment)
+        return path
+
+    def __clusters_around__(self, index: int) -> set:
+        """Returns the clusters a tile can be walked in from. Water tiles (e.g. the end of a path to water) can be
+        entered from every adjacent tile, even from one in a neighboring cluster.
+
+        Args:
+            index (int): flat tile index
+
+        Returns:
+            set: cluster coordinates
+        """
+        clusters = {self.__cluster__(index)}
+        if not self.passable[index]:
+            x, y = index % self.width, index // self.width
+            for nx, ny in ((x, y - 1), (x + 1, y), (x, y + 1), (x - 1, y)):
+                if 0 <= nx < self.width and 0 <= ny < self.height and self.passable[ny * self.width + nx]:
+                    clusters.add(self.__cluster__(ny * self.width + nx))
+        return clusters
+
+    def __connect__(self, index: int, clusters: set) -> dict:
+        """Measures the distances from a tile to the abstract nodes of the given clusters.
+
+        Args:
+            index (int): flat tile index
+            clusters (set): cluster coordinates
+
+        Returns:
+            dict: node -> distance
+        """
+        edges = {}
+        for cluster in clusters:
+            distances = self.__bfs__(index, cluster)[0]
+            edges.update(
+                (node, distances[node]) for node in self.nodes[cluster] if node in distances
+            )
+        return edges
+
+    def __abstract_search__(self, source: int, target: int, start_edges: dict, end_edges: dict) -> list:
+        """A* over the abstract graph of entrances.
+
+        Args:
+            source (int): flat index of the start tile
+            target (int): flat index of the end tile
+            start_edges (dict): node -> distance from the start inside its cluster
+            end_edges (dict): node -> distance to the end inside its cluster
+
+        Returns:
+            list: flat indices of the abstract path including start and end, empty if there is none
+        """
+        width = self.width
+        end_x, end_y = target % width, target // width
+
+        score_g = {source: 0}
+        came_from = {source: None}
+        closed = set()
+        count = 0
+        open_set = [(0, count, source)]
+        while open_set:
+            current = heapq.heappop(open_set)[2]
+            if current in closed:
+                continue
+            if current == target:
+                self.expanded += len(closed)
+                path = []
+                while current is not None:
+                    path.append(current)
+                    current = came_from[current]
+                path.reverse()
+                return path
+            closed.add(current)
+
+            edges = list(start_edges.items()) if current == source else []
+            if current in self.inter:  # an entrance, possibly the start itself
+                edges.extend(self.__intra__(self.__cluster__(current)).get(current, {}).items())
+                edges.extend((other, 1) for other in self.inter[current])
+            if current in end_edges:
+                edges.append((target, end_edges[current]))
+
+            for neighbor, cost in edges:
+                score_g_temp = score_g[current] + cost
+                if score_g_temp >= score_g.get(neighbor, float("inf")):
+                    continue
+                score_g[neighbor] = score_g_temp
+                came_from[neighbor] = current
+                count += 1
+                score_f = score_g_temp + abs(neighbor % width - end_x) + abs(neighbor // width - end_y)
+                heapq.heappush(open_set, (score_f, count, neighbor))
+
+        self.expanded += len(closed)
+        return []
+
+    def update_tiles(self, tiles: list) -> None:
+        """Re-reads the given tiles from the map and rebuilds only the entrances and clusters around them.
+
+        Args:
+            tiles (list): tile positions (x, y) that changed
+        """
+        mask = getattr(self.grid, "passable", None)  # a Terrain keeps its mask up to date itself
+        self.nav_grid = None  # rebuilt with the new passability on the next short query
+        affected = set()
+        for x, y in tiles:
+            self.passable[y * self.width + x] = bool(mask[y, x]) if mask is not None else self.grid[y][x] != WATER
+            cx, cy = x // self.cluster_size, y // self.cluster_size
+            affected.update(
+                cluster
+                for cluster in ((cx, cy), (cx - 1, cy), (cx + 1, cy), (cx, cy - 1), (cx, cy + 1))
+                if self.__in_clusters__(cluster)
+            )
+
+        for cx, cy in affected:
+            for neighbor in ((cx + 1, cy), (cx, cy + 1)):
+                if self.__in_clusters__(neighbor):
+                    self.__build_border__((cx, cy), neighbor)
+
+        relink = set(affected)
+        for cx, cy in affected:
+            relink.update(
+                cluster
+                for cluster in ((cx - 1, cy), (cx + 1, cy), (cx, cy - 1), (cx, cy + 1))
+                if self.__in_clusters__(cluster)
+            )
+        for cluster in relink:
+            self.__link_cluster__(cluster)
+
+        ast.path_cache.invalidate(self.serial)
+
+
+def find_path(grid: list, start: tuple, end: tuple) -> list:
+    """Hierarchical counterpart of astar.find_path with the same contract.
+
+    Args:
+        grid (list): the map
+        start (tuple): start point
+        end (tuple): end point
+
+    Returns:
+        list: list containing the path, if none was found an empty one is returned
+    """
+    if start == end:
+        return [end]
+
+    pathfinder = ast.__grid_data__(__pathfinders__, grid, HierarchicalPathfinder)
+    path = ast.path_cache.get(pathfinder.serial, start, end)
+    if path is None:
+        path = pathfinder.find_path(start, end)
+        ast.path_cache.put(pathfinder.serial, start, end, path)
+    return path
+
+
+def update_tiles(grid: list, tiles: list) -> None:
+    """Tells the pathfinder of a map which tiles changed their passability.
+
+    Args:
+        grid (list): the map
+        tiles (list): tile positions (x, y) that changed
+    """
+    ast.__grid_data__(__pathfinders__, grid, HierarchicalPathfinder).update_tiles(tiles)
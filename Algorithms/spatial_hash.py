@@ -0,0 +1,158 @@
+class SpatialHash:
+    """Uniform grid index over tile coordinates. Answers nearest neighbor queries in time proportional to the local density."""
+
+    def __init__(self, cell_size: int = 8) -> None:
+        """Initializes an empty index.
+
+        Args:
+            cell_size (int, optional): Width and height of one grid cell in tiles. Defaults to 8.
+        """
+        self.cell_size = cell_size
+        self.cells = {}  # cell coordinates -> {item: position}
+        self.positions = {}  # item -> position
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    def __contains__(self, item) -> bool:
+        return item in self.positions
+
+    def __cell__(self, pos: tuple) -> tuple:
+        """Returns the cell coordinates of a tile position.
+
+        Args:
+            pos (tuple): The tile position.
+
+        Returns:
+            tuple: cell coordinates
+        """
+        return pos[0] // self.cell_size, pos[1] // self.cell_size
+
+    def insert(self, item, pos: tuple) -> None:
+        """Adds an item at the given tile position.
+
+        Args:
+            item: The item to be indexed, e.g. an animal.
+            pos (tuple): The tile position of the item.
+        """
+        self.positions[item] = pos
+        self.cells.setdefault(self.__cell__(pos), {})[item] = pos
+
+    def remove(self, item) -> None:
+        """Removes an item from the index if it is present.
+
+        Args:
+            item: The item to be removed.
+        """
+        pos = self.positions.pop(item, None)
+        if pos is None:
+            return
+
+        cell = self.__cell__(pos)
+        bucket = self.cells[cell]
+        del bucket[item]
+        if not bucket:
+            del self.cells[cell]
+
+    def move(self, item, pos: tuple) -> None:
+        """Updates the position of an item. Only touches the cells if the item changed its cell.
+
+        Args:
+            item: The item that moved.
+            pos (tuple): The new tile position.
+        """
+        old = self.positions.get(item)
+        if old is None:
+            self.insert(item, pos)
+            return
+
+        self.positions[item] = pos
+        old_cell, new_cell = self.__cell__(old), self.__cell__(pos)
+        if old_cell == new_cell:
+            self.cells[old_cell][item] = pos
+            return
+
+        bucket = self.cells[old_cell]
+        del bucket[item]
+        if not bucket:
+            del self.cells[old_cell]
+        self.cells.setdefault(new_cell, {})[item] = pos
+
+    def nearest(self, pos: tuple, radius: int, predicate=None):
+        """Finds the item closest to a position (manhatten distance) within a square of the given radius.
+
+        Args:
+            pos (tuple): The tile position to search from.
+            radius (int): Maximum distance on each axis.
+            predicate (optional): Function an item has to pass to be considered. Defaults to None.
+
+        Returns:
+            The closest matching item, None if there is none.
+        """
+        cx, cy = self.__cell__(pos)
+        best, best_distance = None, None
+
+        ring = 0
+        while True:
+            # every item in this ring is at least this far away on one axis
+            ring_distance = max(0, (ring - 1) * self.cell_size + 1)
+            if ring_distance > radius or (best is not None and ring_distance > best_distance):
+                return best
+
+            for cell in self.__ring__(cx, cy, ring):
+                bucket = self.cells.get(cell)
+                if not bucket:
+                    continue
+                for item, item_pos in bucket.items():
+                    dx, dy = abs(item_pos[0] - pos[0]), abs(item_pos[1] - pos[1])
+                    if dx > radius or dy > radius:
+                        continue
+                    distance = dx + dy
+                    if best is not None and distance >= best_distance:
+                        continue
+                    if predicate is None or predicate(item):
+                        best, best_distance = item, distance
+
+            if ring > 0 and not self.__any_beyond__(cx, cy, ring):
+                return best
+            ring += 1
+
+    def __ring__(self, cx: int, cy: int, ring: int) -> list:
+        """Returns the cells on the border of the square with the given ring distance around a cell.
+
+        Args:
+            cx (int): x coordinate of the center cell
+            cy (int): y coordinate of the center cell
+            ring (int): distance from the center cell
+
+        Returns:
+            list: cell coordinates
+        """
+        if ring == 0:
+            return [(cx, cy)]
+
+        cells = []
+        for x in range(cx - ring, cx + ring + 1):
+            cells.append((x, cy - ring))
+            cells.append((x, cy + ring))
+        for y in range(cy - ring + 1, cy + ring):
+            cells.append((cx - ring, y))
+            cells.append((cx + ring, y))
+        return cells
+
+    def __any_beyond__(self, cx: int, cy: int, ring: int) -> bool:
+        """Checks if occupied cells exist outside the square with the given ring distance, so sparse indices stop early.
+
+        Args:
+            cx (int): x coordinate of the center cell
+            cy (int): y coordinate of the center cell
+            ring (int): distance from the center cell
+
+        Returns:
+            bool: True if there are cells further away
+        """
+        if len(self.cells) > (2 * ring + 1) ** 2:
+            return True
+        return any(
+            max(abs(x - cx), abs(y - cy)) > ring for x, y in self.cells
+        )
@@ -1,11 +1,22 @@
 from World.tile import Tile
-from settings import *
+from World.terrain import Terrain, UP, RIGHT, DOWN, LEFT
+from config import SimulationConfig
+from seeding import RandomStreams
 import pygame as pg
 import random as rnd
 import numpy as np
 import Algorithms.astar as ast
+import Algorithms.hpa as hpa
 from Algorithms.genetic_algorithm import GeneticAlgorithm
 
+# random movement directions -> bit of the neighbor mask and offset in tiles
+__MOVES__ = {
+    1: (UP, (0, -1)),
+    2: (RIGHT, (1, 0)),
+    3: (DOWN, (0, 1)),
+    4: (LEFT, (-1, 0)),
+}
+
 
 class Animal(Tile):
     def __init__(
@@ -13,10 +24,14 @@ class Animal(Tile):
         pos: tuple,
         genomes: dict,
         population: dict,
-        map: list,
+        terrain: Terrain,
         key: int,
-        sprite: str,
+        sprite: pg.Surface,
         group,
+        spatial: dict = None,
+        fields: dict = None,
+        streams: RandomStreams = None,
+        config: SimulationConfig = None,
     ) -> None:
         """Initializes an Animal object with specific characteristics.
 
@@ -24,19 +39,28 @@ class Animal(Tile):
             pos (tuple): The position of the Animal.
             genomes (dict): Dictionary of genetic information.
             population (dict): Dictionary of population data.
-            map (list): The map configuration.
+            terrain (Terrain): The terrain of the world.
             key (int): Key value for the Animal.
-            sprite (str): The sprite representing the Animal.
+            sprite (pg.Surface): The shared surface representing the Animal, None for headless worlds.
             group: The group the Animal belongs to.
+            spatial (dict, optional): Spatial indices of the World per animal type, used for prey and mate searches. Defaults to None.
+            fields (dict, optional): Distance fields of the World towards "water" and "berry" tiles. Defaults to None.
+            streams (RandomStreams, optional): Random number streams of the World. Defaults to None so that the random module is used.
+            config (SimulationConfig, optional): The configuration of the World. Defaults to None so that the settings are used.
 
         """
-        super().__init__(pos, sprite, group)
+        self.config = SimulationConfig() if config is None else config
+        self.tilesize = self.config.TILESIZE
+        super().__init__(pos, sprite, group, self.tilesize)
 
         self.pos = pos
         self.genomes = genomes
-        self.map = map
+        self.terrain = terrain
         self.population = population
         self.key = key
+        self.spatial = spatial
+        self.fields = fields
+        self.rng = rnd if streams is None else streams.python["movement"]
 
         self.age = 0
         self.type = self.genomes["animal_type"]
@@ -63,7 +87,7 @@ class Animal(Tile):
         self.cooldown = None  # mating cooldown
 
         # Initialize Genetic Algorithm
-        self.genetic_algorithm = GeneticAlgorithm()
+        self.genetic_algorithm = GeneticAlgorithm(None if streams is None else streams.python["genetics"])
 
     def __direct_movement__(self) -> None:
         if not self.queued_movements:
@@ -71,7 +95,7 @@ class Animal(Tile):
             return
 
         new_pos = self.queued_movements.pop(0)
-        new_pos = new_pos[0] * TILESIZE, new_pos[1] * TILESIZE
+        new_pos = new_pos[0] * self.tilesize, new_pos[1] * self.tilesize
         direction = tuple(np.subtract(self.pos, new_pos))
         self.rect.center -= pg.math.Vector2(direction[0], direction[1])
         self.pos = new_pos
@@ -104,8 +128,7 @@ class Animal(Tile):
                     and len(self.queued_movements) <= self.path_length / 2
                     and self.path_length > 4
                 ):
-                    self.queued_movements = ast.find_path(
-                        self.map,
+                    self.queued_movements = self.__find_path__(
                         self.__convert_pos__(self.pos),
                         self.queued_movements[-1]
                     )
@@ -141,58 +164,29 @@ class Animal(Tile):
 
         return self.hunger < 1000 and self.thirst < 1000 and self.age < self.max_age
 
-    def __inside_range__(self, start: tuple, end: tuple, point: tuple) -> bool:
-        return (
-            (point[0] >= start[0])
-            and (point[0] <= end[1])
-            and (point[1] >= start[1])
-            and (point[1] <= end[1])
-        )
-
-    def __water_tile__(self, pos: tuple) -> bool:
-        coords = self.__convert_pos__(pos)
-        return self.map[coords[1]][coords[0]] == 5.0
-
-    def __check_bounds__(self, direction: int) -> bool:
-        if direction == 1 and self.pos[1] != 0:
-            return True
-        elif direction == 2 and self.pos[0] != (MAPSIZE - 1) * TILESIZE:
-            return True
-        elif direction == 3 and self.pos[1] != (MAPSIZE - 1) * TILESIZE:
-            return True
-        elif direction == 4 and self.pos[0] != 0:
-            return True
-        else:
-            return False
-
     def __convert_pos__(self, pos: tuple) -> tuple:
-        x = int(pos[0] / TILESIZE)
-        y = int(pos[1] / TILESIZE)
+        x = int(pos[0] / self.tilesize)
+        y = int(pos[1] / self.tilesize)
         return x, y
 
+    def __find_path__(self, start: tuple, end: tuple) -> list:
+        # both pathfinders share the same interface, the configuration picks one
+        pathfinder = hpa if self.config.PATHFINDER == "hpa" else ast
+        return pathfinder.find_path(self.terrain, start, end)
+
     def __normal_movement__(self) -> None:
-        direction = rnd.randint(1, 4)
-
-        if direction == 1 and self.__check_bounds__(direction):  # Move Up
-            if not self.__water_tile__((self.pos[0], self.pos[1] - TILESIZE)):
-                self.rect.center -= pg.math.Vector2(0, TILESIZE)
-                self.pos = tuple(np.subtract(self.pos, (0, TILESIZE)))
-        elif direction == 2 and self.__check_bounds__(direction):  # Move Right
-            if not self.__water_tile__((self.pos[0] + TILESIZE, self.pos[1])):
-                self.rect.center += pg.math.Vector2(TILESIZE, 0)
-                self.pos = tuple(np.add(self.pos, (TILESIZE, 0)))
-        elif direction == 3 and self.__check_bounds__(direction):  # Move Down
-            if not self.__water_tile__((self.pos[0], self.pos[1] + TILESIZE)):
-                self.rect.center += pg.math.Vector2(0, TILESIZE)
-                self.pos = tuple(np.add(self.pos, (0, TILESIZE)))
-        elif direction == 4 and self.__check_bounds__(direction):  # Move Left
-            if not self.__water_tile__((self.pos[0] - TILESIZE, self.pos[1])):
-                self.rect.center -= pg.math.Vector2(TILESIZE, 0)
-                self.pos = tuple(np.subtract(self.pos, (TILESIZE, 0)))
+        bit, (dx, dy) = __MOVES__[self.rng.randint(1, 4)]
+        dx, dy = dx * self.tilesize, dy * self.tilesize
+
+        # one lookup covers both the map border and water
+        x, y = self.__convert_pos__(self.pos)
+        if self.terrain.neighbors[y, x] & bit:
+            self.rect.center += pg.math.Vector2(dx, dy)
+            self.pos = (self.pos[0] + dx, self.pos[1] + dy)
 
     def __direct_movement__(self) -> None:
         new_pos = self.queued_movements.pop(0)
-        new_pos = new_pos[0] * TILESIZE, new_pos[1] * TILESIZE
+        new_pos = new_pos[0] * self.tilesize, new_pos[1] * self.tilesize
         direction = tuple(np.subtract(self.pos, new_pos))
         self.rect.center -= pg.math.Vector2(direction[0], direction[1])
         self.pos = new_pos
@@ -206,146 +200,58 @@ class Animal(Tile):
             self.__find_mate__()
 
     def __find_prey__(self) -> None:
-        start_point = self.__convert_pos__(self.pos)
-        end_point = self.__convert_pos__(self.pos)
-
-        for _ in range(41):
-            if start_point[0] > 0:
-                start_point = (start_point[0] - 1, start_point[1])
-            if start_point[1] > 0:
-                start_point = (start_point[0], start_point[1] - 1)
-            if end_point[0] < (MAPSIZE - 1):
-                end_point = (end_point[0] + 1, end_point[1])
-            if end_point[1] < (MAPSIZE - 1):
-                end_point = (end_point[0], end_point[1] + 1)
-
-            for entry in self.huntable:
-                prey_pos_conv = self.__convert_pos__(self.huntable[entry].pos)
-                if (
-                    self.__inside_range__(start_point, end_point, prey_pos_conv)
-                    and not self.huntable[entry].hunted
-                ):
-                    self.huntable[entry].hunted = True
-                    self.huntable[entry].hunter = self
-                    self.food_point = prey_pos_conv
-                    self.food_found = True
-                    self.prey = self.huntable[entry]
-                    break
-
-            if self.food_found:
-                break
-
-        if self.food_found:
-            self.queued_movements = ast.find_path(
-                self.map, self.__convert_pos__(self.pos), self.food_point
+        position = self.__convert_pos__(self.pos)
+        prey = self.spatial[self.prey_type].nearest(
+            position, 41, lambda candidate: not candidate.hunted
+        )
+
+        if prey:
+            prey.hunted = True
+            prey.hunter = self
+            self.food_point = self.__convert_pos__(prey.pos)
+            self.food_found = True
+            self.prey = prey
+            self.queued_movements = self.__find_path__(
+                position, self.food_point
             )
             self.path_length = len(self.queued_movements)
 
     def __find_berry__(self) -> None:
-        start_point = self.__convert_pos__(self.pos)
-        end_point = self.__convert_pos__(self.pos)
-        for _ in range(31):
-            if start_point[0] > 0:
-                start_point = (start_point[0] - 1, start_point[1])
-            if start_point[1] > 0:
-                start_point = (start_point[0], start_point[1] - 1)
-            if end_point[0] < (MAPSIZE - 1):
-                end_point = (end_point[0] + 1, end_point[1])
-            if end_point[1] < (MAPSIZE - 1):
-                end_point = (end_point[0], end_point[1] + 1)
-
-            for y in range(start_point[1], end_point[1]):
-                for x in range(start_point[0], end_point[0]):
-                    if self.map[y][x] == 0:
-                        self.food_found = True
-                        self.food_point = (x, y)
-                        break
-                if self.food_found:
-                    break
-
-            if self.food_found:
-                break
-
-        if self.food_found:
-            self.queued_movements = ast.find_path(
-                self.map, self.__convert_pos__(self.pos), self.food_point
-            )
+        position = self.__convert_pos__(self.pos)
+        field = self.fields["berry"]
+        if field.distance(position) is None:
+            return
 
-    def __find_water__(self) -> None:
-        start_point = self.__convert_pos__(self.pos)
-        end_point = self.__convert_pos__(self.pos)
-        for _ in range(31):
-            if start_point[0] > 0:
-                start_point = (start_point[0] - 1, start_point[1])
-            if start_point[1] > 0:
-                start_point = (start_point[0], start_point[1] - 1)
-            if end_point[0] < (MAPSIZE - 1):
-                end_point = (end_point[0] + 1, end_point[1])
-            if end_point[1] < (MAPSIZE - 1):
-                end_point = (end_point[0], end_point[1] + 1)
-
-            for y in range(start_point[1], end_point[1]):
-                for x in range(start_point[0], end_point[0]):
-                    if self.map[y][x] == 5 and self.__valid_tile__(x, y):
-                        self.water_found = True
-                        self.water_point = (x, y)
-                        break
-                if self.water_found:
-                    break
-
-            if self.water_found:
-                break
-
-        if self.water_found:
-            self.queued_movements = ast.find_path(
-                self.map, self.__convert_pos__(self.pos), self.water_point
-            )
+        self.queued_movements = field.path(position)
+        self.food_point = self.queued_movements[-1]
+        self.food_found = True
 
-    def __valid_tile__(self, x: int, y: int) -> bool:
-        c = 0
-        if y == 0 or self.map[y - 1][x] == 5.0:
-            c += 1
-        if y == (MAPSIZE - 1) or self.map[y + 1][x] == 5.0:
-            c += 1
-        if x == 0 or self.map[y][x - 1] == 5.0:
-            c += 1
-        if x == (MAPSIZE - 1) or self.map[y][x + 1] == 5.0:
-            c += 1
+    def __find_water__(self) -> None:
+        position = self.__convert_pos__(self.pos)
+        field = self.fields["water"]
+        if field.distance(position) is None:
+            return
 
-        return c != 4
+        self.queued_movements = field.path(position)
+        self.water_point = self.queued_movements[-1]
+        self.water_found = True
 
     def __find_mate__(self) -> None:
-        start_point = self.__convert_pos__(self.pos)
-        end_point = self.__convert_pos__(self.pos)
-        for _ in range(31):
-            if start_point[0] > 0:
-                start_point = (start_point[0] - 1, start_point[1])
-            if start_point[1] > 0:
-                start_point = (start_point[0], start_point[1] - 1)
-            if end_point[0] < (MAPSIZE - 1):
-                end_point = (end_point[0] + 1, end_point[1])
-            if end_point[1] < (MAPSIZE - 1):
-                end_point = (end_point[0], end_point[1] + 1)
-
-            for entry in self.population:
-                mate_pos_conv = self.__convert_pos__(self.population[entry].pos)
-                if (
-                    self.__inside_range__(start_point, end_point, mate_pos_conv)
-                    and not self.population[entry].mate
-                    and self.population[entry].key != self.key
-                    and self.population[entry].type == self.type
-                ):
-                    self.mate = self.population[entry]
-                    self.mate.mate = self
-                    self.mate_pos = mate_pos_conv
-                    self.queued_movements = ast.find_path(
-                        self.map, self.__convert_pos__(self.pos), self.mate_pos
-                    )
-                    self.path_length = len(self.queued_movements)
-                    break
+        position = self.__convert_pos__(self.pos)
+        mate = self.spatial[self.type].nearest(
+            position,
+            31,
+            lambda candidate: not candidate.mate and candidate.key != self.key,
+        )
 
-            if self.mate:
-                break
+        if mate:
+            self.mate = mate
+            self.mate.mate = self
+            self.mate_pos = self.__convert_pos__(mate.pos)
+            self.queued_movements = self.__find_path__(
+                position, self.mate_pos
+            )
+            self.path_length = len(self.queued_movements)
 
     def __mating_process__(self, genomes1: dict, genomes2: dict) -> list:
         new_genomes = self.genetic_algorithm.generate_genomes(genomes1, genomes2)
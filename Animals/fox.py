@@ -1,4 +1,8 @@
+import pygame as pg
 from .animal import Animal
+from World.terrain import Terrain
+from seeding import RandomStreams
+from config import SimulationConfig
 from Algorithms.game_theory import GameTheory
 
 class Carnivore(Animal):
@@ -8,13 +12,18 @@ class Carnivore(Animal):
         preys: dict,
         genoms: dict,
         population: dict,
-        map: list,
+        terrain: Terrain,
         key: int,
-        sprite: str,
+        sprite: pg.Surface,
         group,
+        spatial: dict = None,
+        fields: dict = None,
+        streams: RandomStreams = None,
+        config: SimulationConfig = None,
     ) -> None:
-        super().__init__(pos, genoms, population, map, key, sprite, group)
+        super().__init__(pos, genoms, population, terrain, key, sprite, group, spatial, fields, streams, config)
         self.huntable = preys
+        self.prey_type = "rabbit"
         self.prey = None
         self.prey_pos = None
         self.game_theory = GameTheory()
@@ -1,10 +1,15 @@
+import pygame as pg
 from .animal import Animal
+from World.terrain import Terrain
+from seeding import RandomStreams
+from config import SimulationConfig
 
 
 class Omnivore(Animal):
-    def __init__(self, pos: tuple, preys: dict, genoms: dict, population: dict, map: list, key: int, sprite: str, group) -> None:
-        super().__init__(pos, genoms, population, map, key, sprite, group)
+    def __init__(self, pos: tuple, preys: dict, genoms: dict, population: dict, terrain: Terrain, key: int, sprite: pg.Surface, group, spatial: dict = None, fields: dict = None, streams: RandomStreams = None, config: SimulationConfig = None) -> None:
+        super().__init__(pos, genoms, population, terrain, key, sprite, group, spatial, fields, streams, config)
         self.huntable = preys
+        self.prey_type = "rabbit"
         self.prey = None
         self.prey_pos = None
         self.last_hunt_success = 0  # Track successful hunts
@@ -1,4 +1,8 @@
+import pygame as pg
 from .animal import Animal
+from World.terrain import Terrain
+from seeding import RandomStreams
+from config import SimulationConfig
 from Algorithms.game_theory import GameTheory
 
 class Herbivore(Animal):
@@ -7,10 +11,14 @@ class Herbivore(Animal):
         pos: tuple,
         genoms: dict,
         population: dict,
-        map: list,
+        terrain: Terrain,
         key: int,
-        sprite: str,
+        sprite: pg.Surface,
         group,
+        spatial: dict = None,
+        fields: dict = None,
+        streams: RandomStreams = None,
+        config: SimulationConfig = None,
     ) -> None:
         """Initializes a Herbivore object with specific characteristics.
 
@@ -18,12 +26,16 @@ class Herbivore(Animal):
             pos (tuple): The position of the Herbivore.
             genoms (dict): Dictionary of genetic information.
             population (dict): Dictionary of population data.
-            map (list): The map configuration.
+            terrain (Terrain): The terrain of the world.
             key (int): Key value for the Herbivore.
-            sprite (str): The sprite representing the Herbivore.
+            sprite (pg.Surface): The shared surface representing the Herbivore, None for headless worlds.
             group: The group the Herbivore belongs to.
+            spatial (dict, optional): Spatial indices of the World per animal type. Defaults to None.
+            fields (dict, optional): Distance fields of the World towards water and berries. Defaults to None.
+            streams (RandomStreams, optional): Random number streams of the World. Defaults to None.
+            config (SimulationConfig, optional): The configuration of the World. Defaults to None.
         """
-        super().__init__(pos, genoms, population, map, key, sprite, group)
+        super().__init__(pos, genoms, population, terrain, key, sprite, group, spatial, fields, streams, config)
 
         self.hunted = False
         self.hunter = None
@@ -0,0 +1,809 @@
+import numpy as np
+from config import SimulationConfig
+from World.terrain import Terrain, UP, RIGHT, DOWN, LEFT
+
+# columns of the genome array, dominant and recessive value of every trait
+GENOME_FIELDS = (
+    "max_age_d",
+    "max_age_r",
+    "hunger_rate_d",
+    "hunger_rate_r",
+    "thirst_rate_d",
+    "thirst_rate_r",
+)
+
+# every per animal array
+COLUMNS = (
+    "id",
+    "x",
+    "y",
+    "age",
+    "hunger",
+    "thirst",
+    "cooldown",
+    "set_timer",
+    "goal",
+    "dest",
+    "found",
+    "water_point",
+    "food_point",
+    "partner",
+    "mate_pos",
+    "follow",
+    "cursor",
+    "length",
+    "target",
+    "hunted",
+    "grave",
+    "hunt_cooldown",
+    "hunt_success",
+    "trail",
+    "genomes",
+)
+
+# what the queued path of an animal leads to, the counterpart of the path at the front of the queued movements of a sprite
+NONE, WATER, GRAZE, HUNT, MATE = range(5)
+
+# bits of the found column, the water_found and food_found flags of a sprite
+FOUND_WATER = 1
+FOUND_FOOD = 2
+
+# search radii of Animal.__find_mate__ and Animal.__find_prey__, maximum distance on each axis in tiles
+MATE_RADIUS = 31
+PREY_RADIUS = 41
+
+# ticks of positions every animal remembers, the most an animal can walk behind the one it follows
+TRAIL = 128
+
+# bit of the neighbor mask and offset of the directions up, right, down, left
+__BITS__ = np.array([UP, RIGHT, DOWN, LEFT], dtype=np.uint8)
+__DX__ = np.array([0, 1, 0, -1], dtype=np.int32)
+__DY__ = np.array([-1, 0, 1, 0], dtype=np.int32)
+
+
+def __nearest__(x: np.ndarray, y: np.ndarray, tx: np.ndarray, ty: np.ndarray, radius: int, own: np.ndarray = None) -> np.ndarray:
+    """Finds the closest target (manhatten distance) within a square of the given radius around every seeker, the
+    whole-array counterpart of SpatialHash.nearest. Targets get sorted into grid cells as large as the radius, so only
+    the targets in the 3x3 cells around a seeker get compared.
+
+    Args:
+        x (np.ndarray): x tile coordinates of the seekers.
+        y (np.ndarray): y tile coordinates of the seekers.
+        tx (np.ndarray): x tile coordinates of the targets.
+        ty (np.ndarray): y tile coordinates of the targets.
+        radius (int): Maximum distance on each axis.
+        own (np.ndarray, optional): Index into the targets of every seeker itself, it doesn't pick itself. Defaults to None.
+
+    Returns:
+        np.ndarray: index of the target of every seeker, -1 if there is none within the radius
+    """
+    best = np.full(len(x), -1, dtype=np.int64)
+    if len(x) == 0 or len(tx) == 0:
+        return best
+
+    x, y, tx, ty = (np.asarray(array, dtype=np.int64) for array in (x, y, tx, ty))
+    # cells are shifted by one, so the cells around a seeker at the border have keys as well
+    columns = int(max(x.max(), tx.max())) // radius + 3
+    keys = (ty // radius + 1) * columns + tx // radius + 1
+    order = np.argsort(keys, kind="stable")
+    keys = keys[order]
+
+    around = (np.arange(-1, 2)[:, None] * columns + np.arange(-1, 2)).ravel()
+    query = (((y // radius + 1) * columns + x // radius + 1)[:, None] + around).ravel()
+    low = np.searchsorted(keys, query, "left")
+    counts = np.searchsorted(keys, query, "right") - low
+    total = int(counts.sum())
+    if total == 0:
+        return best
+
+    # one row per seeker and target in the cells around it
+    seekers = np.repeat(np.arange(len(query)) // len(around), counts)
+    candidates = order[np.repeat(low - (np.cumsum(counts) - counts), counts) + np.arange(total)]
+    dx, dy = np.abs(tx[candidates] - x[seekers]), np.abs(ty[candidates] - y[seekers])
+    valid = (dx <= radius) & (dy <= radius)
+    if own is not None:
+        valid &= candidates != own[seekers]
+    seekers, candidates, distance = seekers[valid], candidates[valid], (dx + dy)[valid]
+
+    # the closest target of a seeker comes first, equally close ones by their index
+    first = np.lexsort((candidates, distance, seekers))
+    seekers, candidates = seekers[first], candidates[first]
+    leading = np.r_[True, seekers[1:] != seekers[:-1]][: len(seekers)]
+    best[seekers[leading]] = candidates[leading]
+    return best
+
+
+def __first__(picks: np.ndarray) -> np.ndarray:
+    """Keeps the first seeker of every picked target, so no target gets claimed twice.
+
+    Args:
+        picks (np.ndarray): target of every seeker in the order of the seekers
+
+    Returns:
+        np.ndarray: boolean mask of the seekers that keep their target
+    """
+    keep = np.zeros(len(picks), dtype=bool)
+    keep[np.unique(picks, return_index=True)[1]] = True
+    return keep
+
+
+class SpeciesArrays:
+    """Struct-of-arrays state of every animal of one species. Used by the array engine of the World instead of one sprite per animal.
+
+    The arrays mirror the state of a sprite: its mate and mate_pos, the water and food points it found and its queued
+    movements. Those are a path to where the animal is headed (goal and dest) followed by the positions another
+    animal appended to them, which are read from the trail of that animal (follow or target, from tick cursor on).
+    """
+
+    def __init__(self, animal_type: str, terrain: Terrain, movement: np.random.Generator, genetics: np.random.Generator, capacity: int = 64, config: SimulationConfig = None, fields: dict = None) -> None:
+        """Initializes empty arrays for one species.
+
+        Args:
+            animal_type (str): The type of animal stored in the arrays.
+            terrain (Terrain): The terrain of the world.
+            movement (np.random.Generator): Generator used for movement.
+            genetics (np.random.Generator): Generator used for genomes and mating.
+            capacity (int, optional): Initial size of the arrays, they grow when needed. Defaults to 64.
+            config (SimulationConfig, optional): The configuration of the world. Defaults to None so that the settings are used.
+            fields (dict, optional): Distance fields of the World towards "water" and "berry" tiles. Defaults to None so that thirsty and hungry animals only walk randomly.
+        """
+        self.type = animal_type
+        self.fields = fields
+        self.terrain = terrain
+        self.movement = movement
+        self.genetics = genetics
+        self.config = SimulationConfig() if config is None else config
+        self.count = 0
+        self.next_id = 0
+        self.clock = 0  # ticks stepped, indexes the trails
+
+        self.id = np.zeros(capacity, dtype=np.int64)  # unique per species and increasing, animals refer to each other by it
+        self.x = np.zeros(capacity, dtype=np.int32)  # tile coordinates
+        self.y = np.zeros(capacity, dtype=np.int32)
+        self.age = np.zeros(capacity, dtype=np.int32)
+        self.hunger = np.zeros(capacity, dtype=np.float64)
+        self.thirst = np.zeros(capacity, dtype=np.float64)
+        self.cooldown = np.zeros(capacity, dtype=np.float64)  # 0 means no mating cooldown
+        self.set_timer = np.zeros(capacity, dtype=np.int32)
+        self.goal = np.zeros(capacity, dtype=np.int8)
+        self.dest = np.zeros(capacity, dtype=np.int64)  # flat tile index a hunt or mate path leads to, -1 for none
+        self.found = np.zeros(capacity, dtype=np.uint8)  # FOUND_WATER and FOUND_FOOD bits
+        self.water_point = np.zeros(capacity, dtype=np.int64)  # flat tile index, -1 while the path still leads there
+        self.food_point = np.zeros(capacity, dtype=np.int64)
+        self.partner = np.zeros(capacity, dtype=np.int64)  # id of the mate, -1 for none
+        self.mate_pos = np.zeros(capacity, dtype=np.int64)  # flat tile index, -1 for none
+        self.follow = np.zeros(capacity, dtype=np.int64)  # id of the animal whose positions are queued, -1 for none
+        self.cursor = np.zeros(capacity, dtype=np.int64)  # tick of the next queued position on that trail
+        self.length = np.zeros(capacity, dtype=np.int32)  # path_length of a sprite, queued movements at the last search
+        self.target = np.zeros(capacity, dtype=np.int64)  # id of the hunted prey, -1 for none
+        self.hunted = np.zeros(capacity, dtype=bool)
+        self.grave = np.zeros(capacity, dtype=np.int64)  # flat tile index where the hunter of a hunted animal died, -1 while it lives
+        self.hunt_cooldown = np.zeros(capacity, dtype=np.int32)  # ticks until a pig hunts again
+        self.hunt_success = np.zeros(capacity, dtype=np.int32)  # food searches a pig prefers berries for after a hunt
+        # flat tile index at the end of the last ticks, a ring over the clock, -1 - index for ticks spent resting
+        self.trail = np.zeros((capacity, TRAIL), dtype=np.int32)
+        self.genomes = np.zeros((capacity, len(GENOME_FIELDS)), dtype=np.float64)
+        # running sums of the genome values and of their squares, kept up to date on every birth and death
+        self.genome_sums = np.zeros((2, len(GENOME_FIELDS)), dtype=np.float64)
+
+    def __len__(self) -> int:
+        return self.count
+
+    # the expressed traits are always the dominant genome values
+    @property
+    def max_age(self) -> np.ndarray:
+        return self.genomes[: self.count, 0]
+
+    @property
+    def hunger_rate(self) -> np.ndarray:
+        return self.genomes[: self.count, 2]
+
+    @property
+    def thirst_rate(self) -> np.ndarray:
+        return self.genomes[: self.count, 4]
+
+    def __grow__(self, needed: int) -> None:
+        """Grows all arrays so that at least the needed amount of animals fit.
+
+        Args:
+            needed (int): The amount of animals that has to fit.
+        """
+        capacity = len(self.x)
+        if needed <= capacity:
+            return
+
+        while capacity < needed:
+            capacity *= 2
+
+        for name in COLUMNS:
+            old = getattr(self, name)
+            new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+            new[: self.count] = old[: self.count]
+            setattr(self, name, new)
+
+    def random_genomes(self, amount: int) -> np.ndarray:
+        """Draws random genomes within the ranges of the species.
+
+        Args:
+            amount (int): The amount of genome sets.
+
+        Returns:
+            np.ndarray: array of shape (amount, 6) ordered like GENOME_FIELDS
+        """
+        ranges = self.config.GENOME_RANGES[self.type]
+        genomes = np.empty((amount, len(GENOME_FIELDS)), dtype=np.float64)
+        low, high = ranges["max_age"]
+        genomes[:, 0:2] = self.genetics.integers(low, high, size=(amount, 2), endpoint=True)
+        for column, trait in ((2, "hunger_rate"), (4, "thirst_rate")):
+            low, high = ranges[trait]
+            genomes[:, column : column + 2] = np.round(self.genetics.uniform(low, high, size=(amount, 2)), 2)
+        return genomes
+
+    def find(self, ids: np.ndarray) -> np.ndarray:
+        """Looks up animals by their id. Ids are handed out in increasing order and removing animals keeps the order,
+        so the id column is always sorted.
+
+        Args:
+            ids (np.ndarray): ids of animals
+
+        Returns:
+            np.ndarray: index of every animal, -1 for animals that aren't alive anymore
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        if self.count == 0:
+            return np.full(len(ids), -1, dtype=np.int64)
+        index = np.minimum(np.searchsorted(self.id[: self.count], ids), self.count - 1)
+        return np.where(self.id[index] == ids, index, -1)
+
+    def spawn(self, x: np.ndarray, y: np.ndarray, genomes: np.ndarray = None) -> None:
+        """Appends new animals at the given tile coordinates.
+
+        Args:
+            x (np.ndarray): x tile coordinates.
+            y (np.ndarray): y tile coordinates.
+            genomes (np.ndarray, optional): Genomes ordered like GENOME_FIELDS. Defaults to None so that random ones get drawn.
+        """
+        amount = len(x)
+        if amount == 0:
+            return
+        if genomes is None:
+            genomes = self.random_genomes(amount)
+
+        self.__grow__(self.count + amount)
+        new = slice(self.count, self.count + amount)
+        for name in COLUMNS:
+            getattr(self, name)[new] = 0
+        self.id[new] = np.arange(self.next_id, self.next_id + amount)
+        self.next_id += amount
+        self.x[new] = x
+        self.y[new] = y
+        for name in ("dest", "water_point", "food_point", "partner", "mate_pos", "follow", "target", "grave"):
+            getattr(self, name)[new] = -1
+        self.trail[new] = (self.y[new] * self.terrain.width + self.x[new])[:, None]
+        self.genomes[new] = genomes
+        self.genome_sums[0] += self.genomes[new].sum(axis=0)
+        self.genome_sums[1] += np.square(self.genomes[new]).sum(axis=0)
+        self.count += amount
+
+    def remove(self, dead: np.ndarray) -> None:
+        """Removes the masked animals by compacting all arrays. Like Animal.__cleanup_on_death__, the mate of a dying
+        animal forgets it and its queued movements.
+
+        Args:
+            dead (np.ndarray): boolean mask over the alive animals
+        """
+        keep = ~dead
+        alive = int(keep.sum())
+        if alive == self.count:
+            return
+
+        mates = self.find(self.partner[np.flatnonzero(dead)])
+        mates = mates[mates >= 0]
+        self.partner[mates] = -1
+        self.mate_pos[mates] = -1
+        self.clear(mates)
+
+        if alive:
+            removed = self.genomes[: self.count][dead]
+            self.genome_sums[0] -= removed.sum(axis=0)
+            self.genome_sums[1] -= np.square(removed).sum(axis=0)
+        else:
+            self.genome_sums[:] = 0  # drops the rounding errors that added up
+
+        for name in COLUMNS:
+            array = getattr(self, name)
+            array[:alive] = array[: self.count][keep]
+        self.count = alive
+
+    def clear(self, animals: np.ndarray) -> None:
+        """Empties the queued movements of some animals. Like a sprite, an animal that was on its way to water or
+        food keeps it as found and only drinks or eats if it happens to pass the point, while a hunter keeps following
+        the positions its prey appends from now on.
+
+        Args:
+            animals (np.ndarray): indices of the animals
+        """
+        if self.fields is not None:
+            for state, field, arrived, point in ((WATER, "water", 1, self.water_point), (GRAZE, "berry", 0, self.food_point)):
+                lost = animals[self.goal[animals] == state]
+                point[lost] = self.__path_end__(self.fields[field], lost, arrived)
+        self.goal[animals] = NONE
+        self.dest[animals] = -1
+        self.follow[animals] = -1
+        self.cursor[animals] = self.clock + 1
+
+    def __sum_genomes__(self) -> None:
+        """Recomputes the running genome sums from the genomes, e.g. after the arrays got restored."""
+        genomes = self.genomes[: self.count]
+        self.genome_sums = np.stack((genomes.sum(axis=0), np.square(genomes).sum(axis=0)))
+
+    def step(self, season_effects: dict, prey: "SpeciesArrays" = None) -> np.ndarray:
+        """Advances every animal of the species by one tick, the whole-array counterpart of Animal.alive.
+
+        Args:
+            season_effects (dict): The season modifiers of the World.
+            prey (SpeciesArrays, optional): The animals this species hunts, they have to be stepped first. Defaults to None.
+
+        Returns:
+            np.ndarray: boolean mask of the animals that are active this tick (not resting)
+        """
+        n = self.count
+        self.clock += 1
+        self.age[:n] += 1
+        # like Omnivore.alive, the hunting cooldown runs down every tick, resting or not
+        hunt_cooldown = self.hunt_cooldown[:n]
+        hunt_cooldown[hunt_cooldown > 0] -= 1
+
+        # resting animals (after eating, drinking or mating) only count down their timer
+        resting = self.set_timer[:n] > 0
+        self.set_timer[:n][resting] -= 1
+        active = ~resting
+
+        # mating cooldown, the season effect gets applied the same way the World does it for sprites
+        cooldown = self.cooldown[:n]
+        cooldown[cooldown > 0] *= season_effects["breeding_mult"]
+        over = active & (cooldown >= 100)
+        cooldown[over] = 0
+        cooldown[active & (cooldown > 0)] += 1
+
+        idle = self.__move__(active, prey)
+
+        # animals eat and drink where their path ended or when they pass the point they found
+        cells = self.cells()
+        found = self.found[:n]
+        eating = active & (found & FOUND_FOOD != 0) & (cells == self.food_point[:n])
+        drinking = active & ~eating & (found & FOUND_WATER != 0) & (cells == self.water_point[:n])
+        # with the season effects applied, like the rates of a sprite during its update
+        self.hunger[:n][eating] -= 350 * (20 - self.hunger_rate[eating] * season_effects["hunger_mult"])
+        self.thirst[:n][drinking] -= 350 * (20 - self.thirst_rate[drinking] * season_effects["thirst_mult"])
+        found[eating] &= ~np.uint8(FOUND_FOOD)
+        found[drinking] &= ~np.uint8(FOUND_WATER)
+        self.food_point[:n][eating] = -1
+        self.water_point[:n][drinking] = -1
+        self.set_timer[:n][eating | drinking] = 10
+
+        self.trail[:n, self.clock % TRAIL] = np.where(resting, -1 - cells, cells)
+        self.__append__(active)
+
+        # need accumulation with season effects
+        self.hunger[:n][active] += self.hunger_rate[active] * season_effects["hunger_mult"]
+        self.thirst[:n][active] += self.thirst_rate[active] * season_effects["thirst_mult"]
+
+        self.__resolve_needs__(idle, prey)
+        return active
+
+    def __move__(self, moving: np.ndarray, prey: "SpeciesArrays" = None) -> np.ndarray:
+        """Moves the masked animals one tile, like Animal.__direct_movement__: first along their path, then to the
+        next queued position on the trail they follow. Animals without queued movements walk in a random direction.
+
+        Args:
+            moving (np.ndarray): boolean mask of the animals that move
+            prey (SpeciesArrays, optional): The animals this species hunts. Defaults to None.
+
+        Returns:
+            np.ndarray: boolean mask of the moving animals without queued movements left, they resolve their needs
+        """
+        n = self.count
+        self.__refind__(moving, prey)
+        x, y, goal = self.x[:n], self.y[:n], self.goal[:n]
+        on_path = moving & (goal != NONE)
+        walked = on_path.copy()
+
+        if self.fields is not None:
+            # drinking happens next to the water, eating on the berry
+            for state, field, arrived, point in ((WATER, "water", 1, self.water_point), (GRAZE, "berry", 0, self.food_point)):
+                walking = np.flatnonzero(on_path & (goal == state))
+                distances, parents = self.__lookup__(self.fields[field], walking)
+                lost = distances < 0
+                self.found[walking[lost]] &= ~np.uint8(FOUND_WATER if state == WATER else FOUND_FOOD)
+                stepping = distances > arrived
+                x[walking[stepping]] = parents[stepping] % self.terrain.width
+                y[walking[stepping]] = parents[stepping] // self.terrain.width
+                ended = walking[~lost & (distances <= arrived + 1)]
+                point[ended] = y[ended] * self.terrain.width + x[ended]
+                goal[walking[lost]] = NONE
+                goal[ended] = NONE
+
+        for state in (HUNT, MATE):
+            walking = np.flatnonzero(on_path & (goal == state))
+            dest = self.dest[walking]
+            self.__approach__(walking, dest % self.terrain.width, dest // self.terrain.width)
+            ended = walking[y[walking] * self.terrain.width + x[walking] == dest]
+            goal[ended] = NONE
+            self.dest[ended] = -1
+
+        # the rest of the queue are the positions a prey or a partner appended
+        queued = np.zeros(n, dtype=bool)
+        hunting = moving & ~walked & (self.target[:n] >= 0)
+        if prey is not None:
+            walked |= self.__pop__(np.flatnonzero(hunting), prey, self.target, prey.clock, False, queued)
+        following = np.flatnonzero(moving & ~walked & ~hunting & (self.follow[:n] >= 0))
+        leaders = self.find(self.follow[following])
+        writing = leaders >= 0
+        writing[writing] = (self.partner[leaders[writing]] == self.id[following[writing]]) & (self.mate_pos[leaders[writing]] < 0)
+        self.follow[following[~writing]] = -1
+        walked |= self.__pop__(following[writing], self, self.follow, self.clock - 1, True, queued)
+
+        wandering = moving & ~walked
+        direction = self.movement.integers(0, 4, size=n)
+        # the neighbor mask already excludes the map border and water
+        valid = wandering & (self.terrain.neighbors[y, x] & __BITS__[direction] != 0)
+        x[valid] += __DX__[direction][valid]
+        y[valid] += __DY__[direction][valid]
+
+        return moving & (goal == NONE) & ~queued
+
+    def __refind__(self, moving: np.ndarray, prey: "SpeciesArrays" = None) -> None:
+        """Like a sprite that walked half of its queued movements, hunters and animals following their mate search a
+        new path straight to the last queued position instead of walking the rest of the trail.
+
+        Args:
+            moving (np.ndarray): boolean mask of the animals that move
+            prey (SpeciesArrays, optional): The animals this species hunts. Defaults to None.
+        """
+        n = self.count
+        hunting = moving & (self.target[:n] >= 0)
+        for animals, herd, column, latest, state in (
+            (np.flatnonzero(hunting), prey, self.target, None if prey is None else prey.clock, HUNT),
+            (np.flatnonzero(moving & ~hunting & (self.follow[:n] >= 0)), self, self.follow, self.clock - 1, MATE),
+        ):
+            if herd is None or len(animals) == 0:
+                continue
+            leaders = herd.find(column[animals])
+            animals, leaders = animals[leaders >= 0], leaders[leaders >= 0]
+
+            # queued movements left: the rest of the path plus the positions appended since
+            pending = latest - np.maximum(self.cursor[animals], latest - TRAIL + 1) + 1
+            dest = self.dest[animals]
+            on_path = (self.goal[animals] == state) & (dest >= 0)
+            rest = np.where(on_path, np.abs(dest % self.terrain.width - self.x[animals]) + np.abs(dest // self.terrain.width - self.y[animals]), 0)
+            length = self.length[animals]
+            refind = (pending > 0) & (length > 4) & (rest + pending <= length / 2)
+            animals, leaders = animals[refind], leaders[refind]
+
+            cells = herd.trail[leaders, latest % TRAIL]
+            cells = np.where(cells < 0, -1 - cells, cells)
+            self.goal[animals] = state
+            self.dest[animals] = cells
+            self.cursor[animals] = latest + 1
+            self.length[animals] = np.abs(cells % self.terrain.width - self.x[animals]) + np.abs(cells // self.terrain.width - self.y[animals])
+
+    def __pop__(self, animals: np.ndarray, herd: "SpeciesArrays", column: np.ndarray, latest: int, skip: bool, queued: np.ndarray) -> np.ndarray:
+        """Moves animals to the next position queued from the trail of the animal they follow.
+
+        Args:
+            animals (np.ndarray): indices of the followers
+            herd (SpeciesArrays): The arrays of the followed animals.
+            column (np.ndarray): Column with the ids of the followed animals.
+            latest (int): Last tick of the trails that is written already.
+            skip (bool): Whether ticks the followed animal spent resting are skipped, a resting mate appends nothing while a hunted rabbit keeps appending.
+            queued (np.ndarray): boolean mask that gets set for the followers with queued positions left.
+
+        Returns:
+            np.ndarray: boolean mask of the animals that moved
+        """
+        moved = np.zeros(self.count, dtype=bool)
+        leaders = herd.find(column[animals])
+        animals, leaders = animals[leaders >= 0], leaders[leaders >= 0]
+        # positions older than the trail got lost
+        cursor = np.maximum(self.cursor[animals], latest - TRAIL + 1)
+
+        for pop in (True, False):
+            if skip:
+                pending = np.flatnonzero(cursor <= latest)
+                while len(pending):
+                    rested = herd.trail[leaders[pending], cursor[pending] % TRAIL] < 0
+                    pending = pending[rested]
+                    cursor[pending] += 1
+                    pending = pending[cursor[pending] <= latest]
+            if pop:
+                ready = cursor <= latest
+                cells = herd.trail[leaders[ready], cursor[ready] % TRAIL]
+                cells = np.where(cells < 0, -1 - cells, cells)
+                self.x[animals[ready]] = cells % self.terrain.width
+                self.y[animals[ready]] = cells // self.terrain.width
+                cursor[ready] += 1
+                moved[animals[ready]] = True
+
+        self.cursor[animals] = cursor
+        queued[animals[cursor <= latest]] = True
+        return moved
+
+    def __append__(self, active: np.ndarray) -> None:
+        """Like a sprite whose mate didn't set a mate_pos for it, animals append their position to the queued
+        movements of their mate and make it the mate_pos of their mate.
+
+        Args:
+            active (np.ndarray): boolean mask of the animals that are active this tick
+        """
+        n = self.count
+        writers = np.flatnonzero(active & (self.partner[:n] >= 0) & (self.mate_pos[:n] < 0))
+        mates = self.find(self.partner[writers])
+        writers, mates = writers[mates >= 0], mates[mates >= 0]
+
+        # a sprite stepped after its mate wrote its position of the last tick when the mate checks it
+        cells = np.where(writers > mates, self.trail[writers, (self.clock - 1) % TRAIL], self.cells()[writers])
+        self.mate_pos[mates] = np.where(cells < 0, -1 - cells, cells)
+        before = self.follow[mates]
+        self.follow[mates] = self.id[writers]
+        switched = mates[self.follow[mates] != before]
+        self.cursor[switched] = self.clock
+
+    def __resolve_needs__(self, idle: np.ndarray, prey: "SpeciesArrays" = None) -> None:
+        """Like Animal.__resolve_needs__, animals without queued movements look for water, then food and then a mate.
+
+        Args:
+            idle (np.ndarray): boolean mask of the animals that resolve their needs
+            prey (SpeciesArrays, optional): The animals this species hunts. Defaults to None.
+        """
+        n = self.count
+        found = self.found[:n]
+        thirsty = idle & (self.thirst[:n] > 500) & (found & FOUND_WATER == 0)
+        hungry = idle & ~thirsty & (self.hunger[:n] > 350) & (found & FOUND_FOOD == 0)
+        self.__find_field__(thirsty, WATER)
+        if prey is None:
+            self.__find_field__(hungry, GRAZE)
+        elif self.type == "pig":
+            self.__find_food__(hungry, prey)
+        else:
+            self.__find_prey__(hungry, prey)
+        self.__find_mates__(idle & ~thirsty & ~hungry & (self.partner[:n] < 0) & (self.age[:n] > 100) & (self.cooldown[:n] == 0))
+
+    def __find_field__(self, searching: np.ndarray, state: int) -> np.ndarray:
+        """Sends the masked animals down the water or berry field, like Animal.__find_water__ and __find_berry__.
+
+        Args:
+            searching (np.ndarray): boolean mask of the animals looking for water or berries
+            state (int): WATER or GRAZE
+
+        Returns:
+            np.ndarray: boolean mask of the animals that found some
+        """
+        success = np.zeros(self.count, dtype=bool)
+        if self.fields is None:
+            return success
+
+        animals = np.flatnonzero(searching)
+        distances, _ = self.__lookup__(self.fields["water" if state == WATER else "berry"], animals)
+        animals = animals[distances >= 0]
+        self.goal[animals] = state
+        self.found[animals] |= np.uint8(FOUND_WATER if state == WATER else FOUND_FOOD)
+        (self.water_point if state == WATER else self.food_point)[animals] = -1
+        success[animals] = True
+        return success
+
+    def __find_food__(self, hungry: np.ndarray, prey: "SpeciesArrays") -> None:
+        """Omnivore.__find_food__: after a hunt pigs prefer berries a few times, they only hunt when very hungry and
+        the hunting cooldown ran out and otherwise look for berries.
+
+        Args:
+            hungry (np.ndarray): boolean mask of the animals looking for food
+            prey (SpeciesArrays): The animals this species hunts.
+        """
+        n = self.count
+        grazing = self.__find_field__(hungry & (self.hunt_success[:n] > 0), GRAZE)
+        self.hunt_success[:n][grazing] -= 1
+
+        rest = hungry & ~grazing
+        hunting = self.__find_prey__(rest & (self.hunger[:n] > 500) & (self.hunt_cooldown[:n] <= 0), prey)
+        self.hunt_success[:n][hunting] = 5
+        self.hunt_cooldown[:n][hunting] = 60
+        self.__find_field__(rest & ~hunting, GRAZE)
+
+    def __find_prey__(self, hunting: np.ndarray, prey: "SpeciesArrays") -> np.ndarray:
+        """Lets the masked animals hunt the nearest prey nobody hunts yet, like Animal.__find_prey__. A prey stays
+        hunted even if its hunter dies, the same way a sprite keeps its hunted flag.
+
+        Args:
+            hunting (np.ndarray): boolean mask of the animals looking for prey
+            prey (SpeciesArrays): The animals this species hunts.
+
+        Returns:
+            np.ndarray: boolean mask of the animals that found prey
+        """
+        success = np.zeros(self.count, dtype=bool)
+        hunters = np.flatnonzero(hunting)
+        free = np.flatnonzero(~prey.hunted[: prey.count])
+        picks = __nearest__(self.x[hunters], self.y[hunters], prey.x[free], prey.y[free], PREY_RADIUS)
+        hunters, picks = hunters[picks >= 0], free[picks[picks >= 0]]
+        keep = __first__(picks)
+        hunters, picks = hunters[keep], picks[keep]
+
+        prey.hunted[picks] = True
+        self.target[hunters] = prey.id[picks]
+        self.found[hunters] |= np.uint8(FOUND_FOOD)
+        self.goal[hunters] = HUNT
+        self.dest[hunters] = prey.cells()[picks]
+        self.cursor[hunters] = prey.clock + 1
+        self.length[hunters] = np.abs(prey.x[picks] - self.x[hunters]) + np.abs(prey.y[picks] - self.y[hunters])
+        success[hunters] = True
+        return success
+
+    def __find_mates__(self, seeking: np.ndarray) -> None:
+        """Bonds the masked animals with the nearest animal of their species without a mate, of any age, like
+        Animal.__find_mate__.
+
+        Args:
+            seeking (np.ndarray): boolean mask of the animals looking for a mate
+        """
+        seekers = np.flatnonzero(seeking)
+        if len(seekers) == 0:
+            return
+
+        unbonded = np.flatnonzero(self.partner[: self.count] < 0)
+        picks = __nearest__(
+            self.x[seekers], self.y[seekers], self.x[unbonded], self.y[unbonded], MATE_RADIUS,
+            np.searchsorted(unbonded, seekers),
+        )
+        seekers, partners = seekers[picks >= 0], unbonded[picks[picks >= 0]]
+        keep = __first__(partners)
+        seekers, partners = seekers[keep], partners[keep]
+
+        # an animal can't seek and get found at once, of two seekers picking each other the first one seeks
+        choice = np.full(self.count, -1, dtype=np.int64)
+        choice[seekers] = partners
+        keep = (choice[partners] < 0) | ((choice[partners] == seekers) & (seekers < partners))
+        seekers, partners = seekers[keep], partners[keep]
+
+        cells = self.cells()
+        self.partner[seekers] = self.id[partners]
+        self.partner[partners] = self.id[seekers]
+        self.mate_pos[seekers] = cells[partners]
+        self.goal[seekers] = MATE
+        self.dest[seekers] = cells[partners]
+        self.follow[seekers] = self.id[partners]
+        self.cursor[seekers] = self.clock + 1
+        self.length[seekers] = np.abs(self.x[partners] - self.x[seekers]) + np.abs(self.y[partners] - self.y[seekers])
+
+    def __lookup__(self, field, animals: np.ndarray) -> tuple:
+        """Reads a distance field at the tiles of some animals.
+
+        Args:
+            field (DistanceField): The field.
+            animals (np.ndarray): indices of the animals
+
+        Returns:
+            tuple: distance to the nearest source (-1 if there is no way to one) and next tile on the way of every animal
+        """
+        cells = (self.y[animals] * self.terrain.width + self.x[animals]).tolist()
+        distances = np.fromiter(map(field.distances.__getitem__, cells), dtype=np.int64, count=len(cells))
+        parents = np.fromiter(map(field.parents.__getitem__, cells), dtype=np.int64, count=len(cells))
+        return distances, parents
+
+    def __path_end__(self, field, animals: np.ndarray, arrived: int) -> np.ndarray:
+        """Follows a distance field from the tiles of some animals to where their path ends.
+
+        Args:
+            field (DistanceField): The field.
+            animals (np.ndarray): indices of the animals
+            arrived (int): Distance at which the path ends.
+
+        Returns:
+            np.ndarray: flat tile index of every path end, -1 if there is no way to a source
+        """
+        cells = self.y[animals].astype(np.int64) * self.terrain.width + self.x[animals]
+        distances = np.fromiter(map(field.distances.__getitem__, cells.tolist()), dtype=np.int64, count=len(cells))
+        walking = np.flatnonzero(distances > arrived)
+        while len(walking):
+            cells[walking] = np.fromiter(map(field.parents.__getitem__, cells[walking].tolist()), dtype=np.int64, count=len(walking))
+            distances[walking] -= 1
+            walking = walking[distances[walking] > arrived]
+        return np.where(distances >= 0, cells, -1)
+
+    def __approach__(self, animals: np.ndarray, tx: np.ndarray, ty: np.ndarray) -> None:
+        """Moves animals one step towards their targets, along the axis with the larger distance first and along the
+        other one if that way is blocked.
+
+        Args:
+            animals (np.ndarray): indices of the animals
+            tx (np.ndarray): x tile coordinates of their targets
+            ty (np.ndarray): y tile coordinates of their targets
+        """
+        x, y = self.x[animals], self.y[animals]
+        dx, dy = tx - x, ty - y
+
+        neighbors = self.terrain.neighbors[y, x]
+        horizontal = (dx != 0) & (neighbors & np.where(dx > 0, RIGHT, LEFT) != 0)
+        vertical = (dy != 0) & (neighbors & np.where(dy > 0, DOWN, UP) != 0)
+        along_x = horizontal & ((np.abs(dx) >= np.abs(dy)) | ~vertical)
+        along_y = ~along_x & vertical
+
+        self.x[animals] = x + np.sign(dx) * along_x
+        self.y[animals] = y + np.sign(dy) * along_y
+
+    def dead(self) -> np.ndarray:
+        """Death check of all animals.
+
+        Returns:
+            np.ndarray: boolean mask of the animals that died of hunger, thirst or age
+        """
+        n = self.count
+        return (self.hunger[:n] >= 1000) | (self.thirst[:n] >= 1000) | (self.age[:n] >= self.max_age)
+
+    def cells(self) -> np.ndarray:
+        """Flat tile index of every animal.
+
+        Returns:
+            np.ndarray: y * width + x per animal
+        """
+        return self.y[: self.count].astype(np.int64) * self.terrain.width + self.x[: self.count]
+
+    def mate(self, candidates: np.ndarray) -> None:
+        """Animals standing on their mate_pos mate and spawn one child there, like Animal.__mating_process__. Both
+        parents get a mating cooldown, while only the one that mated forgets its mate and rests.
+
+        Args:
+            candidates (np.ndarray): boolean mask of the animals that are able to mate
+        """
+        n = self.count
+        cells = self.cells()
+        seekers = np.flatnonzero(candidates & (self.partner[:n] >= 0) & (cells == self.mate_pos[:n]))
+        if len(seekers) == 0:
+            return
+
+        # a mate that died without being bonded back leaves nothing to inherit from
+        partners = self.find(self.partner[seekers])
+        parents, partners = seekers[partners >= 0], partners[partners >= 0]
+        children = self.__inherit__(self.genomes[parents], self.genomes[partners])
+        self.cooldown[seekers] = 1
+        self.cooldown[partners] = 1
+        self.set_timer[seekers] = 10
+        self.partner[seekers] = -1
+        self.mate_pos[seekers] = -1
+        self.clear(seekers)
+        self.spawn(self.x[parents].copy(), self.y[parents].copy(), children)
+
+    def __inherit__(self, genomes_f: np.ndarray, genomes_m: np.ndarray) -> np.ndarray:
+        """Vectorized counterpart of GeneticAlgorithm.generate_genomes.
+
+        Args:
+            genomes_f (np.ndarray): genomes of the female parents
+            genomes_m (np.ndarray): genomes of the male parents
+
+        Returns:
+            np.ndarray: genomes of the children
+        """
+        amount = len(genomes_f)
+        children = np.empty_like(genomes_f)
+        for d in (0, 2, 4):
+            r = d + 1
+            male_dominant = self.genetics.integers(0, 2, size=amount) == 0
+            stays = self.genetics.integers(0, 4, size=amount) >= 1
+
+            dominant = np.where(male_dominant, genomes_m[:, d], genomes_f[:, d])
+            recessive = np.where(male_dominant, genomes_f[:, r], genomes_m[:, r])
+            children[:, d] = np.where(stays, dominant, recessive)
+            children[:, r] = np.where(stays, recessive, dominant)
+
+        # mutation with a chance of 1 in 20
+        mutating = self.genetics.integers(1, 21, size=amount) == 1
+        if mutating.any():
+            for d in (0, 2, 4):
+                low = np.minimum(children[mutating, d], children[mutating, d + 1])
+                high = np.maximum(children[mutating, d], children[mutating, d + 1])
+                mut = np.round(self.genetics.uniform(low, high) / 4, 2)
+                sign = np.where(self.genetics.integers(0, 2, size=len(mut)) == 0, 1, -1)
+                children[mutating, d] += sign * mut
+                children[mutating, d + 1] += sign * mut
+
+        return children
@@ -0,0 +1,159 @@
+import os
+import json
+import random as rnd
+import numpy as np
+from config import SimulationConfig
+from generator import generate_chunk
+
+
+class ChunkedTerrain:
+    """Terrain stored as uint8 map values in square chunks. Chunks get generated on first access, so a map can be
+    larger than what could be generated at once.
+
+    With a path the terrain lives in a directory on disk and is accessed through np.memmap, so the map doesn't need to
+    fit into memory and a saved map opens instantly. A World still holds its whole map in memory, so only areas of
+    such a map that fit can be simulated.
+    """
+
+    def __init__(self, size: int = None, gseed: int = None, chunk_size: int = 256, path: str = None,
+                 config: SimulationConfig = None) -> None:
+        """Initializes an empty terrain, nothing gets generated yet.
+
+        Args:
+            size (int, optional): Width and height of the map in tiles. Defaults to None so that MAPSIZE of the configuration is used.
+            gseed (int, optional): The random seed of the terrain. Defaults to None so that a random one gets drawn.
+            chunk_size (int, optional): Width and height of one chunk in tiles. Defaults to 256.
+            path (str, optional): Directory the terrain gets stored in. Defaults to None so that it stays in memory.
+            config (SimulationConfig, optional): The configuration the chunks get generated with. Defaults to None so that the settings are used.
+        """
+        self.config = SimulationConfig() if config is None else config
+        size = self.config.MAPSIZE if size is None else size
+        self.size = size
+        self.gseed = rnd.randint(0, 999999999) if gseed is None else gseed
+        self.chunk_size = chunk_size
+        self.path = path
+
+        chunks = -(-size // chunk_size)
+        if path is None:
+            self.tiles = np.zeros((size, size), dtype=np.uint8)
+            self.generated = np.zeros((chunks, chunks), dtype=bool)
+            return
+
+        os.makedirs(path, exist_ok=True)
+        with open(os.path.join(path, "meta.json"), "w") as file:
+            json.dump({"size": size, "gseed": self.gseed, "chunk_size": chunk_size, "config": self.config.overrides()}, file)
+        self.tiles = np.lib.format.open_memmap(
+            os.path.join(path, "terrain.npy"), mode="w+", dtype=np.uint8, shape=(size, size)
+        )
+        self.generated = np.lib.format.open_memmap(
+            os.path.join(path, "chunks.npy"), mode="w+", dtype=bool, shape=(chunks, chunks)
+        )
+
+    @classmethod
+    def open(cls, path: str, mode: str = "r+") -> "ChunkedTerrain":
+        """Opens a terrain stored on disk without reading or generating anything.
+
+        Args:
+            path (str): Directory of the terrain.
+            mode (str, optional): np.memmap mode, "c" keeps changes in memory only. Defaults to "r+".
+
+        Returns:
+            ChunkedTerrain: the opened terrain
+        """
+        with open(os.path.join(path, "meta.json")) as file:
+            meta = json.load(file)
+
+        terrain = cls.__new__(cls)
+        terrain.size = meta["size"]
+        terrain.gseed = meta["gseed"]
+        terrain.chunk_size = meta["chunk_size"]
+        terrain.config = SimulationConfig(**meta.get("config", {}))
+        terrain.path = path
+        terrain.tiles = np.load(os.path.join(path, "terrain.npy"), mmap_mode=mode)
+        terrain.generated = np.load(os.path.join(path, "chunks.npy"), mmap_mode=mode)
+        return terrain
+
+    def save(self, path: str) -> "ChunkedTerrain":
+        """Copies the terrain into a directory on disk, chunks that weren't generated yet stay that way.
+
+        Args:
+            path (str): Directory the terrain gets stored in.
+
+        Returns:
+            ChunkedTerrain: the terrain backed by the new directory
+        """
+        terrain = ChunkedTerrain(self.size, self.gseed, self.chunk_size, path, self.config)
+        terrain.tiles[:] = self.tiles
+        terrain.generated[:] = self.generated
+        terrain.flush()
+        return terrain
+
+    def flush(self) -> None:
+        """Writes changes of a terrain on disk through to the files."""
+        for array in (self.tiles, self.generated):
+            if isinstance(array, np.memmap) and array.mode != "c":
+                array.flush()
+
+    def chunk(self, cx: int, cy: int) -> np.ndarray:
+        """Returns one chunk, it gets generated if it is accessed for the first time.
+
+        Args:
+            cx (int): x chunk coordinate
+            cy (int): y chunk coordinate
+
+        Returns:
+            np.ndarray: view of the tiles of the chunk
+        """
+        x, y = cx * self.chunk_size, cy * self.chunk_size
+        width = min(self.chunk_size, self.size - x)
+        height = min(self.chunk_size, self.size - y)
+        tiles = self.tiles[y : y + height, x : x + width]
+
+        if not self.generated[cy, cx]:
+            tiles[:] = generate_chunk(self.gseed, self.size, x, y, width, height, self.config)
+            self.generated[cy, cx] = True
+        return tiles
+
+    def __ensure__(self, x0: int, y0: int, x1: int, y1: int) -> None:
+        """Generates every missing chunk overlapping a tile area.
+
+        Args:
+            x0 (int): left edge
+            y0 (int): top edge
+            x1 (int): right edge, exclusive
+            y1 (int): bottom edge, exclusive
+        """
+        for cy in range(y0 // self.chunk_size, -(-y1 // self.chunk_size)):
+            for cx in range(x0 // self.chunk_size, -(-x1 // self.chunk_size)):
+                if not self.generated[cy, cx]:
+                    self.chunk(cx, cy)
+
+    def __getitem__(self, key):
+        """Reads tiles as terrain[y, x] or terrain[y0:y1, x0:x1], generating the chunks they lie in.
+
+        Args:
+            key: a tile position or a pair of slices in (y, x) order
+
+        Returns:
+            the map value or a view of the area. An area narrower than the map isn't contiguous, a World or Terrain
+            given one works on its own copy, so changes of the simulation don't reach the chunked terrain.
+        """
+        rows, cols = key
+        rows = rows if isinstance(rows, slice) else slice(rows % self.size, rows % self.size + 1)
+        cols = cols if isinstance(cols, slice) else slice(cols % self.size, cols % self.size + 1)
+        y0, y1, _ = rows.indices(self.size)
+        x0, x1, _ = cols.indices(self.size)
+        if y1 > y0 and x1 > x0:
+            self.__ensure__(x0, y0, x1, y1)
+        return self.tiles[key]
+
+    @property
+    def array(self) -> np.ndarray:
+        """The whole terrain, every missing chunk gets generated. Passed to a World as its map, the World builds its
+        masks and distance fields over all of it in memory, so this is only meant for maps that fit.
+
+        Returns:
+            np.ndarray: the tiles, a memmap if the terrain is stored on disk
+        """
+        self.__ensure__(0, 0, self.size, self.size)
+        return self.tiles
@@ -0,0 +1,208 @@
+import pygame as pg
+from World.textures import textures
+from World.terrain import BERRY, WATER
+
+
+class AnimalSprite(pg.sprite.DirtySprite):
+    """Screen representation of one animal. Only gets redrawn when the animal moved."""
+
+    def __init__(self, image: pg.Surface, pos: tuple) -> None:
+        """Initializes the sprite at the given pixel position.
+
+        Args:
+            image (pg.Surface): The shared surface of the animal type.
+            pos (tuple): The pixel position of the animal.
+        """
+        super().__init__()
+        self.image = image
+        self.rect = image.get_rect(topleft=pos)
+
+
+class Renderer:
+    """Draws a World onto the pygame display. Gets attached to a World as an observer, so worlds without one stay headless.
+
+    The terrain is baked into one background surface and only changed tiles get re-composited. Animals are drawn
+    with dirty rects, so the cost of a frame depends on what moved and not on the size of the map.
+    """
+
+    def __init__(self, world) -> None:
+        """Initializes the Renderer and bakes the terrain of the given world.
+
+        Args:
+            world: The World to be drawn.
+        """
+        self.display_surface = pg.display.get_surface()
+        self.font = pg.font.SysFont("arial", 20, True)
+
+        # every surface is shared through the texture registry, animals get drawn with the surface of their type
+        self.textures = textures
+        self.tilesize = world.config.TILESIZE
+
+        height, width = len(world.map), len(world.map[0])
+        self.background = pg.Surface((width * self.tilesize, height * self.tilesize)).convert()
+        for y in range(height):
+            for x in range(width):
+                self.__draw_tile__(world, x, y)
+
+        self.animal_sprites = pg.sprite.LayeredDirty()
+        self.animal_sprites.clear(self.display_surface, self.background)
+        self.sprites = {}  # animal (or type and index for the array engine) -> AnimalSprite
+
+        self.texts = {}  # position -> ((text, color), rendered surface)
+        self.dirty_rects = []
+        self.full_redraw = True
+
+    def __draw_tile__(self, world, x: int, y: int) -> pg.Rect:
+        """Composites one tile of the map onto the background.
+
+        Args:
+            world: The World the tile belongs to.
+            x (int): x tile coordinate
+            y (int): y tile coordinate
+
+        Returns:
+            pg.Rect: the area of the tile in pixels
+        """
+        pos = (x * self.tilesize, y * self.tilesize)
+        value = world.map[y][x]
+        if value == WATER:
+            rect = self.background.blit(self.textures.get("water"), pos)
+        else:  # everything else stands on grass
+            rect = self.background.blit(self.textures.get("grass"), pos)
+            if value == BERRY:
+                self.background.blit(self.textures.get("berry"), pos)
+        return rect
+
+    def map_updated(self, world, tiles: list) -> None:
+        """Gets called by the world whenever tiles of its map changed, only those get re-composited.
+
+        Args:
+            world: The World whose map changed.
+            tiles (list): tile positions (x, y) that changed
+        """
+        for x, y in tiles:
+            self.animal_sprites.repaint_rect(self.__draw_tile__(world, x, y))
+
+    def ticked(self, world) -> None:
+        """Gets called by the world after every tick. The renderer only draws once per frame, so nothing happens here.
+
+        Args:
+            world: The World that advanced.
+        """
+
+    def set_text(self, pos: tuple, text: str, color: tuple) -> None:
+        """Shows a text over the map, e.g. a counter. It only gets rendered again when it changed.
+
+        Args:
+            pos (tuple): The top left position on the screen.
+            text (str): The text.
+            color (tuple): The color of the text.
+        """
+        old = self.texts.get(pos)
+        if old is not None and old[0] == (text, color):
+            return
+
+        if old is not None:
+            # the area of the old text gets repainted from the background and the animals
+            self.animal_sprites.repaint_rect(old[1].get_rect(topleft=pos))
+        self.texts[pos] = ((text, color), self.font.render(text, True, color))
+
+    def remove_text(self, pos: tuple) -> None:
+        """Removes a text shown with set_text.
+
+        Args:
+            pos (tuple): The top left position of the text.
+        """
+        old = self.texts.pop(pos, None)
+        if old is not None:
+            self.animal_sprites.repaint_rect(old[1].get_rect(topleft=pos))
+
+    def __sync_sprites__(self, world) -> None:
+        """Matches the animal sprites to the animals of the world, only moved animals get marked as dirty.
+
+        Args:
+            world: The World whose animals get drawn.
+        """
+        seen = set()
+        for animal in world.alive_sprites:
+            self.__place__(animal, animal.type, animal.rect.topleft)
+            seen.add(animal)
+        for animal_type, herd in world.herds.items():
+            for index in range(herd.count):
+                key = (animal_type, index)
+                self.__place__(key, animal_type, (int(herd.x[index]) * self.tilesize, int(herd.y[index]) * self.tilesize))
+                seen.add(key)
+
+        for key in [key for key in self.sprites if key not in seen]:
+            self.sprites.pop(key).kill()
+
+    def __place__(self, key, animal_type: str, pos: tuple) -> None:
+        """Creates or moves the sprite of one animal.
+
+        Args:
+            key: identifies the animal across frames
+            animal_type (str): The type of the animal.
+            pos (tuple): The pixel position of the animal.
+        """
+        sprite = self.sprites.get(key)
+        image = self.textures.get(animal_type)
+        if sprite is None:
+            sprite = AnimalSprite(image, pos)
+            self.sprites[key] = sprite
+            self.animal_sprites.add(sprite)
+        elif sprite.rect.topleft != pos or sprite.image is not image:
+            sprite.image = image
+            sprite.rect.topleft = pos
+            sprite.dirty = 1
+
+    def draw(self, world) -> list:
+        """Updates the moved animals on screen and the animal counters.
+
+        Args:
+            world: The World to be drawn.
+
+        Returns:
+            list: the areas of the display that changed, also kept in dirty_rects
+        """
+        self.dirty_rects = []
+        if self.full_redraw:
+            self.display_surface.fill("black")
+            self.display_surface.blit(self.background, (0, 0))
+            self.animal_sprites.repaint_rect(self.display_surface.get_rect())
+            self.dirty_rects.append(self.display_surface.get_rect())
+            self.full_redraw = False
+
+        # Season info with color coding
+        season = world.config.SEASONS[world.current_season]
+        season_colors = {
+            "Winter": (200, 200, 255),  # Light blue
+            "Spring": (144, 238, 144),  # Light green
+            "Summer": (255, 255, 153),  # Light yellow
+            "Fall": (255, 165, 0)       # Orange
+        }
+
+        # Population counts
+        population = world.population()
+        texts = (
+            (f"Season: {season} (Day {world.current_tick}/{world.config.SEASON_LENGTH})", season_colors[season]),
+            (f"Rabbits: {population['rabbit']}", (255, 255, 255)),
+            (f"Foxes: {population['fox']}", (255, 255, 255)),
+            (f"Pigs: {population['pig']}", (255, 255, 255)),
+        )
+
+        for i, (text, color) in enumerate(texts):
+            self.set_text((10, 990 + i * 25), text, color)
+
+        # the areas under the texts get repainted from the background and the animals first, otherwise the
+        # antialiased edges would be blended onto the text of the last frame again and again
+        for pos, (_, surface) in self.texts.items():
+            self.animal_sprites.repaint_rect(surface.get_rect(topleft=pos))
+
+        self.__sync_sprites__(world)
+        self.dirty_rects.extend(self.animal_sprites.draw(self.display_surface))
+
+        # texts are drawn over the animals every frame, they are already rendered
+        for pos, (_, surface) in self.texts.items():
+            self.dirty_rects.append(self.display_surface.blit(surface, pos))
+
+        return self.dirty_rects
@@ -0,0 +1,93 @@
+import numpy as np
+from collections import deque
+from config import SimulationConfig
+from World.terrain import Terrain, BERRY, GRASS
+
+
+class ResourceLayer:
+    """Per tile berry state of the map. Berries grow and wither a few at a time every tick instead of all at once when a season changes.
+
+    Every berry lives for one season. New ones grow at a rate that keeps B_PERCENT of the land covered, scaled by the
+    food multiplier of the current season, so the amount of berries follows the seasons smoothly.
+    """
+
+    def __init__(self, terrain: Terrain, rng: np.random.Generator = None, config: SimulationConfig = None) -> None:
+        """Initializes the layer from the berries the generator placed.
+
+        Args:
+            terrain (Terrain): The terrain of the world, berries get written into it.
+            rng (np.random.Generator, optional): Generator used for placing berries. Defaults to None so that a fresh one gets created.
+            config (SimulationConfig, optional): The configuration of the world. Defaults to None so that the settings are used.
+        """
+        self.terrain = terrain
+        self.config = SimulationConfig() if config is None else config
+        self.width = terrain.width
+        self.rng = np.random.default_rng() if rng is None else rng
+
+        # tiles berries can grow on, the spawn tiles of the animals stay as they are like before
+        tiles = terrain.tiles.reshape(-1)
+        self.land = np.flatnonzero((tiles == GRASS) | (tiles == BERRY))
+        self.berry = terrain.berry.reshape(-1)  # view of the berry mask of the terrain
+
+        # berries grouped by the tick they grew in, the oldest group withers every tick
+        self.generations = deque(maxlen=self.config.SEASON_LENGTH)
+        ages = self.rng.integers(0, self.config.SEASON_LENGTH, size=np.count_nonzero(self.berry))
+        initial = np.flatnonzero(self.berry)
+        for age in range(self.config.SEASON_LENGTH):
+            self.generations.append(initial[ages == age])
+
+        self.credit = 0.0  # fraction of a berry carried over to the next tick
+
+    def __len__(self) -> int:
+        return sum(len(generation) for generation in self.generations)
+
+    def __positions__(self, indices: np.ndarray) -> list:
+        """Converts flat tile indices into tile positions.
+
+        Args:
+            indices (np.ndarray): flat indices
+
+        Returns:
+            list: tile positions (x, y)
+        """
+        return [(index % self.width, index // self.width) for index in indices.tolist()]
+
+    def __pick_grass__(self, amount: int) -> np.ndarray:
+        """Draws distinct land tiles that currently carry no berry.
+
+        Args:
+            amount (int): The amount of tiles needed.
+
+        Returns:
+            np.ndarray: flat indices, fewer than requested if the land is nearly full
+        """
+        picked = np.empty(0, dtype=np.intp)
+        for _ in range(4):  # berries only cover a small part of the land, so few draws get rejected
+            candidates = self.rng.choice(self.land, size=min(2 * amount, len(self.land)))
+            candidates = np.unique(candidates[~self.berry[candidates]])
+            picked = np.union1d(picked, candidates)
+            if len(picked) >= amount:
+                return self.rng.permutation(picked)[:amount]
+        return picked
+
+    def step(self, berry_mult: float) -> tuple:
+        """Withers the berries that lived for a whole season and grows this tick's share of new ones.
+
+        Args:
+            berry_mult (float): The food multiplier of the current season.
+
+        Returns:
+            tuple: lists of the tile positions (x, y) where berries grew and where they withered
+        """
+        withered = self.generations.popleft()
+        self.terrain.set(withered, GRASS)
+
+        self.credit += len(self.land) * self.config.B_PERCENT * berry_mult / self.config.SEASON_LENGTH
+        amount = int(self.credit)
+        self.credit -= amount
+
+        grown = self.__pick_grass__(amount) if amount else np.empty(0, dtype=np.intp)
+        self.terrain.set(grown, BERRY)
+        self.generations.append(grown)
+
+        return self.__positions__(grown), self.__positions__(withered)
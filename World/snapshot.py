@@ -0,0 +1,364 @@
+import os
+import json
+import threading
+from ast import literal_eval
+from collections import deque
+import numpy as np
+import Algorithms.astar as ast
+import Algorithms.hpa as hpa
+from config import SimulationConfig
+from World.world import World
+from Animals.rabbit import Herbivore
+from Animals.fox import Carnivore
+from Animals.pig import Omnivore
+from Animals.species_arrays import COLUMNS
+
+SNAPSHOT_VERSION = 4
+
+TYPES = ("rabbit", "fox", "pig")
+
+# per animal values stored as one column each, None is stored as NaN or -1
+__FLOATS__ = ("max_age", "hunger", "hunger_rate", "thirst", "thirst_rate", "cooldown")
+__INTEGERS__ = ("age", "set_timer", "path_length", "last_hunt_success", "hunting_cooldown")
+__FLAGS__ = ("food_found", "water_found", "hunted")
+__POINTS__ = ("food_point", "water_point", "mate_pos", "prey_pos")
+__LINKS__ = ("mate", "hunter", "prey")
+
+__GENOMES__ = ("max_age_d", "max_age_r", "hunger_rate_d", "hunger_rate_r", "thirst_rate_d", "thirst_rate_r")
+
+
+def __path_data__(world: World, create: bool = False):
+    """Returns the pathfinding data of the world's terrain which identifies its paths in the shared path cache.
+
+    Args:
+        world (World): The world.
+        create (bool, optional): Whether the data gets built if no search ran on the terrain yet. Defaults to False.
+
+    Returns:
+        NavGrid or HierarchicalPathfinder, None if there is none
+    """
+    if world.config.PATHFINDER == "hpa":
+        registry, factory = hpa.__pathfinders__, hpa.HierarchicalPathfinder
+    else:
+        registry, factory = ast.__nav_grids__, ast.NavGrid
+
+    if create:
+        return ast.__grid_data__(registry, world.terrain, factory)
+    entry = registry.get(id(world.terrain))
+    if entry is not None and entry[0]() is world.terrain:
+        return entry[1]
+    return None
+
+
+def __ragged__(lists: list, width: int) -> tuple:
+    """Packs lists of tuples into one array and the offsets of every list.
+
+    Args:
+        lists (list): the lists
+        width (int): length of the tuples
+
+    Returns:
+        tuple: the values of shape (total, width) and the offsets of shape (len(lists) + 1,)
+    """
+    offsets = np.zeros(len(lists) + 1, dtype=np.int64)
+    offsets[1:] = np.cumsum([len(values) for values in lists])
+    values = np.array([value for values in lists for value in values], dtype=np.int64).reshape(-1, width)
+    return values, offsets
+
+
+def __unpack__(values: np.ndarray, offsets: np.ndarray) -> list:
+    """Inverse of __ragged__.
+
+    Args:
+        values (np.ndarray): the packed values
+        offsets (np.ndarray): the offsets of every list
+
+    Returns:
+        list: lists of tuples
+    """
+    values = [tuple(value) for value in values.tolist()]
+    offsets = offsets.tolist()
+    return [values[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
+
+
+def __animal_rows__(world: World) -> list:
+    """Collects the animals of the sprite engine in the order they get updated. Dead animals that are still linked
+    to living ones (e.g. the hunter of a rabbit that starved) follow at the end, as they still affect the run.
+
+    Args:
+        world (World): The world.
+
+    Returns:
+        list: the animals
+    """
+    rows = list(world.alive_sprites)
+    known = set(rows)
+    index = 0
+    while index < len(rows):
+        for name in __LINKS__:
+            other = getattr(rows[index], name, None)
+            if other is not None and other not in known:
+                known.add(other)
+                rows.append(other)
+        index += 1
+    return rows
+
+
+def __capture__(world: World) -> dict:
+    """Copies the complete state of a world into arrays.
+
+    Args:
+        world (World): The world.
+
+    Returns:
+        dict: array name mapped to the array
+    """
+    streams = {
+        name: {
+            "numpy": world.streams.numpy[name].bit_generator.state,
+            "python": list(world.streams.python[name].getstate()),
+        }
+        for name in world.streams.numpy
+    }
+    meta = {
+        "version": SNAPSHOT_VERSION,
+        "engine": world.engine,
+        "seed": world.seed,
+        "config": repr(world.config.overrides()),
+        "ticks": world.ticks,
+        "current_tick": world.current_tick,
+        "current_season": world.current_season,
+        "keys": [world.rabbit_key, world.fox_key, world.pig_key],
+        "births": world.births,
+        "deaths": world.deaths,
+        "credit": world.resources.credit,
+        "herds": {animal_type: [herd.next_id, herd.clock] for animal_type, herd in world.herds.items()},
+        "streams": streams,
+    }
+
+    arrays = {"meta": np.array(json.dumps(meta)), "tiles": world.terrain.tiles.copy()}
+    arrays["generations"], arrays["generation_offsets"] = __ragged__(
+        [[(index,) for index in generation.tolist()] for generation in world.resources.generations], 1
+    )
+
+    rows = __animal_rows__(world)
+    numbers = {animal: number for number, animal in enumerate(rows)}
+    arrays["type"] = np.array([TYPES.index(animal.type) for animal in rows], dtype=np.uint8)
+    arrays["key"] = np.array([animal.key for animal in rows], dtype=np.int64)
+    arrays["alive"] = np.array([world.alive_sprites.has(animal) for animal in rows], dtype=bool)
+    arrays["pos"] = np.array([animal.pos for animal in rows], dtype=np.int64).reshape(-1, 2)
+    arrays["rect"] = np.array([animal.rect.topleft for animal in rows], dtype=np.int64).reshape(-1, 2)
+    arrays["genomes"] = np.array(
+        [[animal.genomes[name] for name in __GENOMES__] for animal in rows], dtype=np.float64
+    ).reshape(-1, len(__GENOMES__))
+
+    for name in __FLOATS__:
+        values = [getattr(animal, name, None) for animal in rows]
+        arrays[name] = np.array([np.nan if value is None else value for value in values], dtype=np.float64)
+    for name in __INTEGERS__:
+        values = [getattr(animal, name, None) for animal in rows]
+        arrays[name] = np.array([-1 if value is None else value for value in values], dtype=np.int64)
+    for name in __FLAGS__:
+        arrays[name] = np.array([bool(getattr(animal, name, False)) for animal in rows], dtype=bool)
+    for name in __POINTS__:
+        values = [getattr(animal, name, None) for animal in rows]
+        arrays[name] = np.array([(-1, -1) if value is None else value for value in values], dtype=np.int64).reshape(-1, 2)
+    for name in __LINKS__:
+        values = [getattr(animal, name, None) for animal in rows]
+        arrays[name] = np.array([-1 if value is None else numbers[value] for value in values], dtype=np.int64)
+
+    arrays["queues"], arrays["queue_offsets"] = __ragged__([animal.queued_movements for animal in rows], 2)
+
+    # the order inside the cells of the spatial hashes decides between equally near animals
+    for animal_type, spatial in world.spatial.items():
+        arrays[f"spatial_{animal_type}"] = np.array(
+            [(numbers[item], *pos) for bucket in spatial.cells.values() for item, pos in bucket.items()], dtype=np.int64
+        ).reshape(-1, 3)
+
+    # the parents of an incrementally updated field can differ from a rebuilt one between equally near sources
+    for name, field in world.fields.items():
+        arrays[f"field_{name}_distances"] = np.array(field.distances, dtype=np.int32)
+        arrays[f"field_{name}_parents"] = np.array(field.parents, dtype=np.int32)
+
+    for animal_type, herd in world.herds.items():
+        for name in COLUMNS:
+            arrays[f"herd_{animal_type}_{name}"] = getattr(herd, name)[: herd.count].copy()
+
+    # cached paths get served in parts to later searches, so they are part of the state as well
+    paths = []
+    data = __path_data__(world)
+    if data is not None:
+        paths = ast.path_cache.export(data.serial)
+    arrays["cache_ends"] = np.array([(*start, *end) for start, end, _ in paths], dtype=np.int64).reshape(-1, 4)
+    arrays["cache_paths"], arrays["cache_offsets"] = __ragged__([path for _, _, path in paths], 2)
+
+    return arrays
+
+
+def __write__(path: str, arrays: dict, compress: bool) -> None:
+    """Writes the arrays of a snapshot, under a temporary name first so an interrupted write never leaves a broken file behind.
+
+    Args:
+        path (str): The snapshot file.
+        arrays (dict): array name mapped to the array
+        compress (bool): Whether the file gets compressed.
+    """
+    temporary = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(temporary, "wb") as file:
+        (np.savez_compressed if compress else np.savez)(file, **arrays)
+    os.replace(temporary, path)
+
+
+def save_snapshot(world: World, path: str, background: bool = False, compress: bool = False):
+    """Saves the complete state of a world into one .npz file of columnar arrays.
+
+    The state gets copied right away, so the world can keep running while a background write is going on.
+
+    Args:
+        world (World): The world.
+        path (str): The snapshot file.
+        background (bool, optional): Whether the file gets written by a background thread. Defaults to False.
+        compress (bool, optional): Whether the file gets compressed, smaller but slower. Defaults to False.
+
+    Returns:
+        threading.Thread: the thread writing the file when written in the background, None otherwise
+    """
+    arrays = __capture__(world)
+    if not background:
+        __write__(path, arrays, compress)
+        return None
+
+    thread = threading.Thread(target=__write__, args=(path, arrays, compress))
+    thread.start()
+    return thread
+
+
+def __restore_animals__(world: World, data) -> None:
+    """Recreates the animals of the sprite engine with all of their links.
+
+    Args:
+        world (World): The restored world.
+        data: The arrays of the snapshot.
+    """
+    count = len(data["type"])
+    columns = {name: data[name].tolist() for name in __FLOATS__ + __INTEGERS__ + __FLAGS__ + __LINKS__}
+    points = {name: [tuple(point) for point in data[name].tolist()] for name in __POINTS__}
+    queues = __unpack__(data["queues"], data["queue_offsets"])
+    types, keys, alive = data["type"].tolist(), data["key"].tolist(), data["alive"].tolist()
+    positions, rects, genomes = data["pos"].tolist(), data["rect"].tolist(), data["genomes"].tolist()
+
+    populations = {"rabbit": world.rabbits, "fox": world.foxes, "pig": world.pigs}
+    rows = []
+    for number in range(count):
+        animal_type = TYPES[types[number]]
+        genome = {"animal_type": animal_type, **dict(zip(__GENOMES__, genomes[number]))}
+        arguments = (
+            genome,
+            populations[animal_type],
+            world.terrain,
+            keys[number],
+            None,
+            [world.alive_sprites] if alive[number] else [],
+            world.spatial,
+            world.fields,
+            world.streams,
+            world.config,
+        )
+        pos = tuple(positions[number])
+        if animal_type == "rabbit":
+            animal = Herbivore(pos, *arguments)
+        elif animal_type == "fox":
+            animal = Carnivore(pos, world.rabbits, *arguments)
+        else:
+            animal = Omnivore(pos, world.rabbits, *arguments)
+
+        animal.rect.topleft = tuple(rects[number])
+        for name in __FLOATS__:
+            value = columns[name][number]
+            setattr(animal, name, None if np.isnan(value) else value)
+        for name in __INTEGERS__:
+            value = columns[name][number]
+            if hasattr(animal, name):
+                setattr(animal, name, None if value == -1 else value)
+        for name in __FLAGS__:
+            if hasattr(animal, name):
+                setattr(animal, name, columns[name][number])
+        for name in __POINTS__:
+            if hasattr(animal, name):
+                setattr(animal, name, None if points[name][number] == (-1, -1) else points[name][number])
+        animal.queued_movements = list(queues[number])
+
+        if alive[number]:
+            populations[animal_type][animal.key] = animal
+        rows.append(animal)
+
+    for name in __LINKS__:
+        for animal, link in zip(rows, columns[name]):
+            if hasattr(animal, name):
+                setattr(animal, name, None if link == -1 else rows[link])
+
+    for animal_type, spatial in world.spatial.items():
+        for number, x, y in data[f"spatial_{animal_type}"].tolist():
+            spatial.insert(rows[number], (x, y))
+
+
+def load_snapshot(path: str, seed: int = None) -> World:
+    """Restores a world from a snapshot. It continues exactly like the saved world would have.
+
+    Args:
+        path (str): The snapshot file.
+        seed (int, optional): A new run seed. Defaults to None so that the random number streams continue where the snapshot left off, a different seed forks the run.
+
+    Returns:
+        World: the restored world
+    """
+    with np.load(path) as file:
+        data = {name: file[name] for name in file.files}
+
+    meta = json.loads(str(data["meta"]))
+    if meta["version"] != SNAPSHOT_VERSION:
+        raise ValueError(f"Unknown snapshot version: {meta['version']}")
+
+    config = SimulationConfig(**literal_eval(meta["config"]))
+    world = World(data["tiles"], meta["engine"], meta["seed"] if seed is None else seed, config, spawn=False)
+    world.ticks = meta["ticks"]
+    world.current_tick = meta["current_tick"]
+    world.current_season = meta["current_season"]
+    world.rabbit_key, world.fox_key, world.pig_key = meta["keys"]
+    world.births, world.deaths = meta["births"], meta["deaths"]
+
+    if seed is None:
+        for name, state in meta["streams"].items():
+            world.streams.numpy[name].bit_generator.state = state["numpy"]
+            version, internal, gauss = state["python"]
+            world.streams.python[name].setstate((version, tuple(internal), gauss))
+
+    resources = world.resources
+    resources.credit = meta["credit"]
+    resources.generations = deque(
+        (np.array(generation, dtype=np.intp).reshape(-1) for generation in __unpack__(data["generations"], data["generation_offsets"])),
+        maxlen=config.SEASON_LENGTH,
+    )
+
+    for name, field in world.fields.items():
+        field.distances = data[f"field_{name}_distances"].tolist()
+        field.parents = data[f"field_{name}_parents"].tolist()
+
+    __restore_animals__(world, data)
+
+    for animal_type, herd in world.herds.items():
+        count = len(data[f"herd_{animal_type}_x"])
+        herd.__grow__(count)
+        herd.count = count
+        herd.next_id, herd.clock = meta["herds"][animal_type]
+        for name in COLUMNS:
+            getattr(herd, name)[:count] = data[f"herd_{animal_type}_{name}"]
+
+    world.__sum_genomes__()
+
+    if len(data["cache_ends"]):
+        ends = [((a, b), (c, d)) for a, b, c, d in data["cache_ends"].tolist()]
+        paths = [(start, end, path) for (start, end), path in zip(ends, __unpack__(data["cache_paths"], data["cache_offsets"]))]
+        ast.path_cache.restore(__path_data__(world, create=True).serial, paths)
+
+    return world
@@ -0,0 +1,115 @@
+import numpy as np
+
+# values of the map tiles
+BERRY, FOX, GRASS, RABBIT, PIG, WATER = range(6)
+
+# bits of the neighbor mask, set if the adjacent tile in that direction can be walked on
+UP, RIGHT, DOWN, LEFT = 1, 2, 4, 8
+
+
+class Terrain:
+    """The map as a uint8 grid together with masks derived from it. Every terrain test of the simulation is a single lookup
+    into one of the masks and they are kept up to date whenever tiles get changed through set().
+
+    It can be indexed like the map itself (terrain[y][x] or terrain[y, x]).
+    """
+
+    def __init__(self, map: np.ndarray) -> None:
+        """Initializes the grid and computes all masks.
+
+        Args:
+            map (np.ndarray): The map configuration. A contiguous uint8 array gets shared, anything else gets copied, so
+                that set() can write through a flat view of the tiles.
+        """
+        self.tiles = np.ascontiguousarray(map, dtype=np.uint8)
+        self.height, self.width = self.tiles.shape
+
+        # passability gets padded with a border of water, so neighbor lookups need no bounds checks
+        self.__padded__ = np.zeros((self.height + 2, self.width + 2), dtype=bool)
+        self.passable = self.__padded__[1:-1, 1:-1]  # tiles that can be walked on
+        self.drinkable = np.zeros((self.height, self.width), dtype=bool)  # water reachable from at least one side
+        self.__water__ = np.zeros((self.height + 2, self.width + 2), dtype=bool)  # padded with land, the border has no water
+        self.shore = np.zeros((self.height, self.width), dtype=bool)  # land next to water, animals drink there
+        self.berry = np.zeros((self.height, self.width), dtype=bool)  # tiles with a berry
+        self.neighbors = np.zeros((self.height, self.width), dtype=np.uint8)  # walkable adjacent tiles as UP | RIGHT | DOWN | LEFT
+
+        self.__refresh__(0, 0, self.width, self.height)
+
+    def __len__(self) -> int:
+        return self.height
+
+    def __getitem__(self, key):
+        return self.tiles[key]
+
+    @property
+    def shape(self) -> tuple:
+        return self.tiles.shape
+
+    def __refresh__(self, x0: int, y0: int, x1: int, y1: int) -> None:
+        """Recomputes the masks for an area whose tiles changed. The neighbor mask and the shoreline of the tiles around
+        the area depend on it as well and get recomputed too.
+
+        Args:
+            x0 (int): left edge
+            y0 (int): top edge
+            x1 (int): right edge, exclusive
+            y1 (int): bottom edge, exclusive
+        """
+        tiles = self.tiles[y0:y1, x0:x1]
+        self.passable[y0:y1, x0:x1] = tiles != WATER
+        self.__water__[y0 + 1 : y1 + 1, x0 + 1 : x1 + 1] = tiles == WATER
+        self.berry[y0:y1, x0:x1] = tiles == BERRY
+
+        x0, y0 = max(x0 - 1, 0), max(y0 - 1, 0)
+        x1, y1 = min(x1 + 1, self.width), min(y1 + 1, self.height)
+        padded = self.__padded__
+        rows, cols = slice(y0 + 1, y1 + 1), slice(x0 + 1, x1 + 1)
+        neighbors = (
+            padded[y0:y1, cols] * np.uint8(UP)
+            | padded[rows, x0 + 2 : x1 + 2] * np.uint8(RIGHT)
+            | padded[y0 + 2 : y1 + 2, cols] * np.uint8(DOWN)
+            | padded[rows, x0:x1] * np.uint8(LEFT)
+        )
+        self.neighbors[y0:y1, x0:x1] = neighbors
+        self.drinkable[y0:y1, x0:x1] = ~self.passable[y0:y1, x0:x1] & (neighbors != 0)
+
+        water = self.__water__
+        self.shore[y0:y1, x0:x1] = self.passable[y0:y1, x0:x1] & (
+            water[y0:y1, cols] | water[rows, x0 + 2 : x1 + 2] | water[y0 + 2 : y1 + 2, cols] | water[rows, x0:x1]
+        )
+
+    def set(self, indices: np.ndarray, value: int) -> None:
+        """Changes tiles and updates the masks. Only tiles that changed between water and land touch their surroundings.
+
+        Args:
+            indices (np.ndarray): flat indices of the tiles
+            value (int): the new map value
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        flat = self.tiles.reshape(-1)
+        flipped = indices[(flat[indices] == WATER) != (value == WATER)]
+
+        flat[indices] = value
+        self.berry.reshape(-1)[indices] = value == BERRY
+
+        for index in flipped.tolist():
+            x, y = index % self.width, index // self.width
+            self.__refresh__(x, y, x + 1, y + 1)
+
+    def water_sources(self) -> list:
+        """Returns all drinkable water tiles.
+
+        Returns:
+            list: tile positions (x, y)
+        """
+        y, x = np.nonzero(self.drinkable)
+        return list(zip(x.tolist(), y.tolist()))
+
+    def berries(self) -> list:
+        """Returns all berry tiles.
+
+        Returns:
+            list: tile positions (x, y)
+        """
+        y, x = np.nonzero(self.berry)
+        return list(zip(x.tolist(), y.tolist()))
@@ -0,0 +1,86 @@
+import pygame as pg
+
+# paths to all the sprites
+TEXTURE_PATHS = {
+    "grass": "World/tileset/grass.png",
+    "berry": "World/tileset/berry.png",
+    "water": "World/tileset/water.png",
+    "rabbit": "World/tileset/rabbit.png",
+    "fox": "World/tileset/fox.png",
+    "pig": "World/tileset/pig.png",
+}
+
+
+class TextureRegistry:
+    """Loads every texture only once and hands out the shared surface to every tile and animal."""
+
+    def __init__(self, paths: dict = None) -> None:
+        """Initializes an empty registry, textures get loaded on first use.
+
+        Args:
+            paths (dict, optional): texture name -> image path. Defaults to None so that TEXTURE_PATHS gets used.
+        """
+        self.paths = TEXTURE_PATHS if paths is None else paths
+        self.surfaces = {}
+        self.atlas = None
+
+    def __len__(self) -> int:
+        return len(self.surfaces)
+
+    def get(self, name: str) -> pg.Surface:
+        """Returns the shared surface of a texture. Needs an initialized display the first time a texture is loaded.
+
+        Args:
+            name (str): name of the texture, e.g. "grass"
+
+        Returns:
+            pg.Surface: the shared surface, must not be drawn on
+        """
+        surface = self.surfaces.get(name)
+        if surface is None:
+            surface = pg.image.load(self.paths[name]).convert_alpha()
+            self.surfaces[name] = surface
+        return surface
+
+    def load_atlas(self, path: str, names: list, tilesize: int) -> None:
+        """Loads all textures from a single atlas image with one square cell per texture, laid out left to right.
+
+        Args:
+            path (str): path to the atlas image
+            names (list): texture names in the order of the cells
+            tilesize (int): width and height of a cell, the TILESIZE of the configuration
+        """
+        self.atlas = pg.image.load(path).convert_alpha()
+        self.__cut_atlas__(names, tilesize)
+
+    def pack_atlas(self, tilesize: int) -> pg.Surface:
+        """Packs the individual texture files into one atlas surface, all handed out surfaces become views into it.
+
+        Args:
+            tilesize (int): width and height of a cell, the TILESIZE of the configuration
+
+        Returns:
+            pg.Surface: the atlas
+        """
+        names = list(self.paths)
+        self.atlas = pg.Surface((tilesize * len(names), tilesize), pg.SRCALPHA).convert_alpha()
+        for index, name in enumerate(names):
+            self.atlas.blit(pg.image.load(self.paths[name]), (index * tilesize, 0))
+        self.__cut_atlas__(names, tilesize)
+        return self.atlas
+
+    def __cut_atlas__(self, names: list, tilesize: int) -> None:
+        """Replaces the surfaces by subsurfaces of the atlas.
+
+        Args:
+            names (list): texture names in the order of the cells
+            tilesize (int): width and height of a cell
+        """
+        for index, name in enumerate(names):
+            self.surfaces[name] = self.atlas.subsurface(
+                pg.Rect(index * tilesize, 0, tilesize, tilesize)
+            )
+
+
+# shared by every renderer
+textures = TextureRegistry()
@@ -4,14 +4,18 @@ from settings import *
 
 class Tile(pg.sprite.Sprite):
 
-    def __init__(self, pos: tuple, path: str, groups) -> None:
+    def __init__(self, pos: tuple, image: pg.Surface, groups, size: int = TILESIZE) -> None:
         """Initializes a Tile object with a specific image at a given position.
 
         Args:
             pos (tuple): The position of the Tile.
-            path (str): The path to the image file.
+            image (pg.Surface): The shared surface from the texture registry. None for headless worlds.
             groups: The sprite groups the Tile belongs to.
+            size (int, optional): Width and height of the Tile in pixels when it has no image. Defaults to TILESIZE.
         """
         super().__init__(groups)
-        self.image = pg.image.load(path).convert_alpha()
-        self.rect = self.image.get_rect(topleft=pos)
+        self.image = image
+        if image is None:
+            self.rect = pg.Rect(pos, (size, size))
+        else:
+            self.rect = image.get_rect(topleft=pos)
@@ -1,30 +1,61 @@
+import operator
 import pygame as pg
-import random as rnd
-from settings import *
-from World.tile import Tile
+import numpy as np
+from config import SimulationConfig
 from Animals.rabbit import Herbivore
 from Animals.fox import Carnivore
 from Animals.pig import Omnivore
+from Animals.species_arrays import SpeciesArrays, GENOME_FIELDS, FOUND_FOOD
 from generator import generate_map
+from seeding import RandomStreams
+from World.resources import ResourceLayer
+from World.terrain import Terrain, BERRY, FOX, GRASS, RABBIT, PIG, WATER
 from Algorithms.game_theory import GameTheory
+from Algorithms.spatial_hash import SpatialHash
+from Algorithms.distance_field import DistanceField
+
+# why animals die, in the order they get attributed if several apply
+DEATH_CAUSES = ("predation", "hunger", "thirst", "age")
+
+# reads the genome values of an animal in the order of GENOME_FIELDS
+__genome_values__ = operator.itemgetter(*GENOME_FIELDS)
 
 
 class World:
     """Handles the actual simulated world"""
 
-    def __init__(self, map: list = None) -> None:
-        self.display_surface = pg.display.get_surface()
-        self.font = pg.font.SysFont("arial", 20, True)
+    def __init__(self, map: list = None, engine: str = "sprites", seed: int = None, config: SimulationConfig = None, spawn: bool = True) -> None:
+        """Initializes the world without touching the display. Rendering is optional and gets attached as an observer.
+
+        Args:
+            map (list, optional): A pregenerated map, e.g. the array of a ChunkedTerrain. Defaults to None so that a new one gets generated.
+            engine (str, optional): "sprites" simulates one object per animal, "arrays" keeps every species in NumPy arrays and updates them as a whole. Defaults to "sprites".
+            seed (int, optional): The run seed, the same seed repeats the same run. Defaults to None so that SEED of the configuration is used.
+            config (SimulationConfig, optional): The configuration, it gets passed on to the animals, the generator and the resources. Defaults to None so that the settings are used.
+            spawn (bool, optional): Whether the animals marked on the map get spawned. Defaults to True, restoring a snapshot turns it off.
+        """
+        if engine not in ("sprites", "arrays"):
+            raise ValueError(f"Unknown engine: {engine}")
+        self.engine = engine
+        self.config = SimulationConfig() if config is None else config
+
+        # independent random number streams for terrain, movement, genetics and regrowth
+        self.streams = RandomStreams(self.config.SEED if seed is None else seed)
+        self.seed = self.streams.seed
 
-        self.world_sprites = pg.sprite.Group()
         self.alive_sprites = pg.sprite.Group()
         self.dead_sprites = pg.sprite.Group()
 
         # Season tracking
+        self.ticks = 0  # ticks since the start of the run
         self.current_tick = 0
         self.current_season = 0  # Index into SEASONS list
         
-        self.map = generate_map() if map is None else map
+        # typed terrain grid with the masks every terrain test uses, the map is its uint8 array
+        if map is None:
+            map = generate_map(self.streams.integer("terrain"), self.config.MAPSIZE, self.config)
+        self.terrain = Terrain(map)
+        self.map = self.terrain.tiles
 
         # dictionaries containing all alive instances of their respective animal type
         self.rabbits = {}
@@ -36,24 +67,80 @@ class World:
         self.fox_key = 1
         self.pig_key = 1
 
-        # paths to all the sprites
-        self.images = {
-            "grass": "World/tileset/grass.png",
-            "berry": "World/tileset/berry.png",
-            "water": "World/tileset/water.png",
-            "rabbit": "World/tileset/rabbit.png",
-            "fox": "World/tileset/fox.png",
-            "pig": "World/tileset/pig.png",
+        # running totals of births and deaths by cause per animal type, e.g. for telemetry
+        self.births = {animal_type: 0 for animal_type in ("rabbit", "fox", "pig")}
+        self.deaths = {animal_type: dict.fromkeys(DEATH_CAUSES, 0) for animal_type in ("rabbit", "fox", "pig")}
+
+        # running sums of the genome values and of their squares per animal type of the sprite engine, the array
+        # engine keeps them in its SpeciesArrays
+        self.sprite_genome_sums = {
+            animal_type: np.zeros((2, len(GENOME_FIELDS)), dtype=np.float64) for animal_type in ("rabbit", "fox", "pig")
+        }
+
+        # spatial indices over the tile positions of the animals, used for prey and mate searches
+        self.spatial = {
+            "rabbit": SpatialHash(),
+            "fox": SpatialHash(),
+            "pig": SpatialHash(),
+        }
+
+        # berry state of every tile, berries grow and wither a few at a time
+        self.resources = ResourceLayer(self.terrain, self.streams.numpy["regrowth"], self.config)
+
+        # distance fields towards the nearest drinkable water and berry tile
+        self.fields = {
+            "water": DistanceField(self.terrain, self.terrain.water_sources()),
+            "berry": DistanceField(self.terrain, self.terrain.berries()),
         }
 
+        # struct-of-arrays state per species, only used by the "arrays" engine
+        self.herds = {}
+        if self.engine == "arrays":
+            self.herds = {
+                animal_type: SpeciesArrays(
+                    animal_type,
+                    self.terrain,
+                    self.streams.numpy["movement"],
+                    self.streams.numpy["genetics"],
+                    config=self.config,
+                    fields=self.fields,
+                )
+                for animal_type in ("rabbit", "fox", "pig")
+            }
+
+        # observers get notified about drawing and map changes (e.g. the Renderer)
+        self.observers = []
+
         # map setup
-        self.__create_map__()
+        if spawn:
+            self.__create_map__()
 
         # Initialize Game Theory
         self.game_theory = GameTheory()
 
     # MAKE ANIMAL SECTION
 
+    def __random_genomes__(self, animal_type: str) -> dict:
+        """Draws a random set of genomes within the ranges of the given animal type.
+
+        Args:
+            animal_type (str): The type of animal the genomes are for.
+
+        Returns:
+            dict: contains the genome values
+        """
+        ranges = self.config.GENOME_RANGES[animal_type]
+        rng = self.streams.python["genetics"]
+        return {
+            "animal_type": animal_type,
+            "max_age_d": rng.randint(*ranges["max_age"]),
+            "max_age_r": rng.randint(*ranges["max_age"]),
+            "hunger_rate_d": round(rng.uniform(*ranges["hunger_rate"]), 2),
+            "hunger_rate_r": round(rng.uniform(*ranges["hunger_rate"]), 2),
+            "thirst_rate_d": round(rng.uniform(*ranges["thirst_rate"]), 2),
+            "thirst_rate_r": round(rng.uniform(*ranges["thirst_rate"]), 2),
+        }
+
     def __make_fox__(self, pos: tuple, passed_genomes: dict = None) -> None:
         """Creates a new fox with either a random or a passed set of genomes.
 
@@ -67,33 +154,34 @@ class World:
                 self.rabbits,
                 passed_genomes,
                 self.foxes,
-                self.map,
+                self.terrain,
                 self.fox_key,
-                self.images["fox"],
+                None,
                 [self.alive_sprites],
+                self.spatial,
+                self.fields,
+                self.streams,
+                self.config,
             )
         else:
-            genomes = {
-                "animal_type": "fox",
-                "max_age_d": rnd.randint(700, 800),
-                "max_age_r": rnd.randint(700, 800),
-                "hunger_rate_d": round(rnd.uniform(8, 14), 2),
-                "hunger_rate_r": round(rnd.uniform(8, 14), 2),
-                "thirst_rate_d": round(rnd.uniform(8, 14), 2),
-                "thirst_rate_r": round(rnd.uniform(8, 14), 2),
-            }
+            genomes = self.__random_genomes__("fox")
 
             self.foxes[self.fox_key] = Carnivore(
                 pos,
                 self.rabbits,
                 genomes,
                 self.foxes,
-                self.map,
+                self.terrain,
                 self.fox_key,
-                self.images["fox"],
+                None,
                 [self.alive_sprites],
+                self.spatial,
+                self.fields,
+                self.streams,
+                self.config,
             )
 
+        self.__index_animal__(self.foxes[self.fox_key])
         self.fox_key += 1
 
     def __make_rabbit__(self, pos: tuple, passed_genomes: dict = None) -> None:
@@ -108,32 +196,33 @@ class World:
                 pos,
                 passed_genomes,
                 self.rabbits,
-                self.map,
+                self.terrain,
                 self.rabbit_key,
-                self.images["rabbit"],
+                None,
                 [self.alive_sprites],
+                self.spatial,
+                self.fields,
+                self.streams,
+                self.config,
             )
         else:
-            genomes = {
-                "animal_type": "rabbit",
-                "max_age_d": rnd.randint(500, 600),
-                "max_age_r": rnd.randint(500, 600),
-                "hunger_rate_d": round(rnd.uniform(5, 10), 2),
-                "hunger_rate_r": round(rnd.uniform(5, 10), 2),
-                "thirst_rate_d": round(rnd.uniform(5, 10), 2),
-                "thirst_rate_r": round(rnd.uniform(5, 10), 2),
-            }
+            genomes = self.__random_genomes__("rabbit")
 
             self.rabbits[self.rabbit_key] = Herbivore(
                 pos,
                 genomes,
                 self.rabbits,
-                self.map,
+                self.terrain,
                 self.rabbit_key,
-                self.images["rabbit"],
+                None,
                 [self.alive_sprites],
+                self.spatial,
+                self.fields,
+                self.streams,
+                self.config,
             )
 
+        self.__index_animal__(self.rabbits[self.rabbit_key])
         self.rabbit_key += 1
 
     def __make_pig__(self, pos: tuple, passed_genomes: dict = None) -> None:
@@ -144,64 +233,71 @@ class World:
                 self.rabbits,
                 passed_genomes,
                 self.pigs,
-                self.map,
+                self.terrain,
                 self.pig_key,
-                self.images["pig"],
+                None,
                 [self.alive_sprites],
+                self.spatial,
+                self.fields,
+                self.streams,
+                self.config,
             )
         else:
             # Adjusted values for more balanced pig characteristics
-            genomes = {
-                "animal_type": "pig",
-                "max_age_d": rnd.randint(600, 750),  # Reduced max age
-                "max_age_r": rnd.randint(600, 750),
-                "hunger_rate_d": round(rnd.uniform(10, 15), 2),  # Increased hunger rate
-                "hunger_rate_r": round(rnd.uniform(10, 15), 2),
-                "thirst_rate_d": round(rnd.uniform(8, 14), 2),
-                "thirst_rate_r": round(rnd.uniform(8, 14), 2),
-            }
+            genomes = self.__random_genomes__("pig")
             
             self.pigs[self.pig_key] = Omnivore(
                 pos,
                 self.rabbits,
                 genomes,
                 self.pigs,
-                self.map,
+                self.terrain,
                 self.pig_key,
-                self.images["pig"],
+                None,
                 [self.alive_sprites],
+                self.spatial,
+                self.fields,
+                self.streams,
+                self.config,
             )
 
+        self.__index_animal__(self.pigs[self.pig_key])
         self.pig_key += 1
 
+    def __index_animal__(self, animal) -> None:
+        """Adds a freshly created animal to the spatial index of its type.
+
+        Args:
+            animal: The new animal.
+        """
+        self.spatial[animal.type].insert(animal, animal.__convert_pos__(animal.pos))
+        values = np.array(__genome_values__(animal.genomes), dtype=np.float64)
+        sums = self.sprite_genome_sums[animal.type]
+        sums[0] += values
+        sums[1] += values * values
+
     # END OF MAKE ANIMAL SECTION
 
     def __create_map__(self) -> None:
-        """Creates the map from the array the generator module created."""
+        """Spawns the animals from the array the generator module created. Terrain is left to the observers."""
+        if self.engine == "arrays":
+            for animal_type, value in (("fox", FOX), ("rabbit", RABBIT), ("pig", PIG)):
+                y, x = np.nonzero(self.map == value)
+                self.herds[animal_type].spawn(x, y)
+            return
 
-        # converts array to positions and draws the corresponding tile
+        # converts array to positions and spawns the corresponding animal
         for row_index, row in enumerate(self.map):
             for col_index, col in enumerate(row):
-                x = col_index * TILESIZE
-                y = row_index * TILESIZE
-                if col == 2.0:  # grass tiles
-                    Tile((x, y), self.images["grass"], [self.world_sprites])
-                elif col == 0.0:  # berry tiles
-                    # there needs to be a grass tile placed under the berry bush
-                    Tile((x, y), self.images["grass"], [self.world_sprites])
-                    Tile((x, y), self.images["berry"], [self.world_sprites])
-                elif col == 5.0:  # water tiles
-                    Tile((x, y), self.images["water"], [self.world_sprites])
-                elif col == 1.0:  # fox
-                    # there needs to be a grass tile placed under the animal
-                    Tile((x, y), self.images["grass"], [self.world_sprites])
+                x = col_index * self.config.TILESIZE
+                y = row_index * self.config.TILESIZE
+                if col in (BERRY, GRASS, WATER):
+                    continue
+                elif col == FOX:
                     self.__make_fox__((x, y))
-                elif col == 3.0:  # rabbit
-                    # see above
-                    Tile((x, y), self.images["grass"], [self.world_sprites])
+                elif col == RABBIT:
                     self.__make_rabbit__((x, y))
-                elif col == 4.0:  # pig
-                    Tile((x, y), self.images["grass"], [self.world_sprites])
+                elif col == PIG:
                     self.__make_pig__((x, y))
                 else:  # this shouldn't happen
                     print(
@@ -209,42 +305,52 @@ class World:
                     )
                     exit(1)
 
-    def __update_graphics__(self):
-        """Updates the sprites on screen and the animal counters."""
-        self.world_sprites.draw(self.display_surface)
-        self.alive_sprites.draw(self.display_surface)
-
-        # Season info with color coding
-        season = SEASONS[self.current_season]
-        season_colors = {
-            "Winter": (200, 200, 255),  # Light blue
-            "Spring": (144, 238, 144),  # Light green
-            "Summer": (255, 255, 153),  # Light yellow
-            "Fall": (255, 165, 0)       # Orange
-        }
-        
-        season_text = self.font.render(
-            f"Season: {season} (Day {self.current_tick}/{SEASON_LENGTH})", 
-            True, 
-            season_colors[season]
-        )
-        
-        # Population counts
-        live_rabbits = self.font.render(
-            f"Rabbits: {len(self.rabbits)}", True, (255, 255, 255)
-        )
-        live_foxes = self.font.render(
-            f"Foxes: {len(self.foxes)}", True, (255, 255, 255)
-        )
-        live_pigs = self.font.render(
-            f"Pigs: {len(self.pigs)}", True, (255, 255, 255)
-        )
-        
-        # Draw all text
-        self.display_surface.blit(season_text, (10, 990))
-        self.display_surface.blit(live_rabbits, (10, 1015))
-        self.display_surface.blit(live_foxes, (10, 1040))
-        self.display_surface.blit(live_pigs, (10, 1065))
+    def population(self) -> dict:
+        """Returns the amount of living animals per animal type, regardless of the engine.
+
+        Returns:
+            dict: animal type mapped to its population
+        """
+        if self.engine == "arrays":
+            return {animal_type: len(herd) for animal_type, herd in self.herds.items()}
+        return {"rabbit": len(self.rabbits), "fox": len(self.foxes), "pig": len(self.pigs)}
+
+    def genome_sums(self) -> dict:
+        """Returns the running sums of the genome values and of their squares of the living animals, regardless of the
+        engine. Together with the population they give mean and variance of every genome field without a pass over the
+        animals.
+
+        Returns:
+            dict: animal type mapped to an array of shape (2, 6), the sums and the sums of squares ordered like GENOME_FIELDS
+        """
+        if self.engine == "arrays":
+            return {animal_type: herd.genome_sums for animal_type, herd in self.herds.items()}
+        return self.sprite_genome_sums
+
+    def __sum_genomes__(self) -> None:
+        """Recomputes the running genome sums from the living animals, e.g. after they got restored."""
+        for animal_type, population in (("rabbit", self.rabbits), ("fox", self.foxes), ("pig", self.pigs)):
+            genomes = np.array([__genome_values__(animal.genomes) for animal in population.values()], dtype=np.float64)
+            genomes = genomes.reshape(-1, len(GENOME_FIELDS))
+            self.sprite_genome_sums[animal_type] = np.stack((genomes.sum(axis=0), np.square(genomes).sum(axis=0)))
+        for herd in self.herds.values():
+            herd.__sum_genomes__()
+
+    def attach(self, observer) -> None:
+        """Attaches an observer which gets drawn every frame and notified about map changes.
+
+        Args:
+            observer: Object providing draw(world), map_updated(world, tiles) and ticked(world), e.g. the Renderer.
+        """
+        self.observers.append(observer)
+
+    def detach(self, observer) -> None:
+        """Detaches a previously attached observer.
+
+        Args:
+            observer: The observer to be removed.
+        """
+        self.observers.remove(observer)
 
     def __remove_animal(self, animal) -> None:
         """Removes the specified animal from the corresponding animal type dictionary and kills the animal.
@@ -253,30 +359,43 @@ class World:
             animal: The animal to be removed.
         """
         if animal.type == "rabbit":
-            self.rabbits.pop(animal.key)
+            population = self.rabbits
         elif animal.type == "fox":
-            self.foxes.pop(animal.key)
+            population = self.foxes
         elif animal.type == "pig":
-            self.pigs.pop(animal.key)
+            population = self.pigs
         else:  # this shouldn't happen
             print(
                 "Error: Animal of unknown type encountered during removal process. Exiting program."
             )
             exit(1)
+        population.pop(animal.key)
+        self.spatial[animal.type].remove(animal)
         animal.kill()  # removes sprite from all groups
 
+        sums = self.sprite_genome_sums[animal.type]
+        if population:
+            values = np.array(__genome_values__(animal.genomes), dtype=np.float64)
+            sums[0] -= values
+            sums[1] -= values * values
+        else:
+            sums[:] = 0  # drops the rounding errors that added up
+
     def __handle_mating__(self, genomes: list) -> None:
         """Handles the mating process based on the given genomes to create specific types of animals.
 
         Args:
             genomes (list): List containing genetic information for mating.
         """
+        # the position of the parent is passed as tile coordinates
+        pos = (genomes[1][0] * self.config.TILESIZE, genomes[1][1] * self.config.TILESIZE)
+        self.births[genomes[0]] += 1
         if genomes[0] == "rabbit":
-            self.__make_rabbit__(genomes[1], genomes[2])
+            self.__make_rabbit__(pos, genomes[2])
         elif genomes[0] == "fox":
-            self.__make_fox__(genomes[1], genomes[2])
+            self.__make_fox__(pos, genomes[2])
         elif genomes[0] == "pig":
-            self.__make_pig__(genomes[1], genomes[2])
+            self.__make_pig__(pos, genomes[2])
         else:  # this shouldn't happen
             print(
                 "Error: Animal of unknown type encountered during creation process. Exiting program."
@@ -285,7 +404,8 @@ class World:
     
     def get_season_effects(self):
         """Returns current season modifiers for animal behavior"""
-        season = SEASONS[self.current_season]
+        config = self.config
+        season = config.SEASONS[self.current_season]
         effects = {
             "hunger_mult": 1.0,
             "thirst_mult": 1.0,
@@ -294,86 +414,103 @@ class World:
         }
         
         if season == "Winter":
-            effects["hunger_mult"] = WINTER_HUNGER_MULTIPLIER
-            effects["thirst_mult"] = WINTER_THIRST_MULTIPLIER
-            effects["berry_mult"] = WINTER_FOOD_MULTIPLIER
-            effects["breeding_mult"] = WINTER_BREEDING_MULTIPLIER
+            effects["hunger_mult"] = config.WINTER_HUNGER_MULTIPLIER
+            effects["thirst_mult"] = config.WINTER_THIRST_MULTIPLIER
+            effects["berry_mult"] = config.WINTER_FOOD_MULTIPLIER
+            effects["breeding_mult"] = config.WINTER_BREEDING_MULTIPLIER
         elif season == "Spring":
-            effects["breeding_mult"] = SPRING_BREEDING_MULTIPLIER
-            effects["berry_mult"] = SPRING_FOOD_MULTIPLIER
-            effects["thirst_mult"] = SPRING_THIRST_MULTIPLIER
+            effects["breeding_mult"] = config.SPRING_BREEDING_MULTIPLIER
+            effects["berry_mult"] = config.SPRING_FOOD_MULTIPLIER
+            effects["thirst_mult"] = config.SPRING_THIRST_MULTIPLIER
         elif season == "Summer":
-            effects["thirst_mult"] = SUMMER_THIRST_MULTIPLIER
-            effects["berry_mult"] = SUMMER_FOOD_MULTIPLIER
-            effects["breeding_mult"] = SUMMER_BREEDING_MULTIPLIER
+            effects["thirst_mult"] = config.SUMMER_THIRST_MULTIPLIER
+            effects["berry_mult"] = config.SUMMER_FOOD_MULTIPLIER
+            effects["breeding_mult"] = config.SUMMER_BREEDING_MULTIPLIER
         elif season == "Fall":
-            effects["berry_mult"] = FALL_FOOD_MULTIPLIER
-            effects["breeding_mult"] = FALL_BREEDING_MULTIPLIER
-            effects["thirst_mult"] = FALL_THIRST_MULTIPLIER
+            effects["berry_mult"] = config.FALL_FOOD_MULTIPLIER
+            effects["breeding_mult"] = config.FALL_BREEDING_MULTIPLIER
+            effects["thirst_mult"] = config.FALL_THIRST_MULTIPLIER
         
         return effects
     
     def update_season(self):
         """Updates the current season based on tick count"""
         self.current_tick += 1
-        if self.current_tick >= SEASON_LENGTH:
+        if self.current_tick >= self.config.SEASON_LENGTH:
             self.current_tick = 0
-            self.current_season = (self.current_season + 1) % len(SEASONS)
-            self.__seasonal_map_update__()
+            self.current_season = (self.current_season + 1) % len(self.config.SEASONS)
 
-    def __seasonal_map_update__(self):
-        """Updates map elements based on season"""
-        season = SEASONS[self.current_season]
-        
-        # Clear existing berry tiles and update sprites
-        berry_positions = []
-        for y in range(MAPSIZE):
-            for x in range(MAPSIZE):
-                if self.map[y][x] == 0.0:  # Berry tile
-                    self.map[y][x] = 2.0  # Convert to grass
-                    berry_positions.append((x, y))
-        
-        # Get season multiplier
-        berry_mult = 1.0
-        if season == "Winter":
-            berry_mult = WINTER_FOOD_MULTIPLIER
-        elif season == "Spring":
-            berry_mult = SPRING_FOOD_MULTIPLIER
-        elif season == "Summer":
-            berry_mult = SUMMER_FOOD_MULTIPLIER
-        elif season == "Fall":
-            berry_mult = FALL_FOOD_MULTIPLIER
-        
-        # Find valid grass tiles for new berries
-        land_tiles = [(y,x) for y in range(MAPSIZE) for x in range(MAPSIZE) 
-                    if self.map[y][x] == 2.0]
-        
-        # Calculate new berry count
-        berries_to_spawn = int(len(land_tiles) * B_PERCENT * berry_mult)
-        
-        # Spawn new berries
-        for _ in range(berries_to_spawn):
-            if not land_tiles:
-                break
-            coord = rnd.choice(land_tiles)
-            land_tiles.remove(coord)
-            self.map[coord[0]][coord[1]] = 0.0
-            x, y = coord[1] * TILESIZE, coord[0] * TILESIZE
-            
-            # Update sprites
-            Tile((x, y), self.images["grass"], [self.world_sprites])
-            Tile((x, y), self.images["berry"], [self.world_sprites])
+    def __regrow__(self, berry_mult: float) -> None:
+        """Lets this tick's share of berries grow and wither. Only the berry field and the observers get told about the changed tiles.
+
+        Args:
+            berry_mult (float): The food multiplier of the current season.
+        """
+        grown, withered = self.resources.step(berry_mult)
+        if not grown and not withered:
+            return
+
+        # berries don't block movement, so the cached paths stay valid
+        self.fields["berry"].remove_sources(withered)
+        self.fields["berry"].add_sources(grown)
+
+        for observer in self.observers:
+            observer.map_updated(self, withered + grown)
 
     def run(self, r_state: bool, t_state: bool) -> None:
-        """Runs the simulation with season updates"""
-        self.__update_graphics__()
+        """Draws the attached observers and advances the simulation by one tick if both states allow it.
+
+        Args:
+            r_state (bool): Whether the simulation is running (not paused).
+            t_state (bool): Whether an animal tick is due.
+        """
+        for observer in self.observers:
+            observer.draw(self)
 
         if not (r_state and t_state):
             return
-            
+
+        self.step()
+
+    def step(self) -> None:
+        """Advances the simulation by one tick with season updates. Needs no display."""
+        self.ticks += 1
         self.update_season()
         season_effects = self.get_season_effects()
-        
+        self.__regrow__(season_effects["berry_mult"])
+
+        if self.engine == "arrays":
+            self.__step_herds__(season_effects)
+        else:
+            self.__step_sprites__(season_effects)
+
+        for observer in self.observers:
+            observer.ticked(self)
+
+    def __death_cause__(self, animal) -> str:
+        """Finds out why an animal died.
+
+        Args:
+            animal: The animal whose alive check failed.
+
+        Returns:
+            str: one of DEATH_CAUSES
+        """
+        hunter = getattr(animal, "hunter", None)
+        if getattr(animal, "hunted", False) and hunter is not None and hunter.pos == animal.pos:
+            return "predation"
+        if animal.hunger >= 1000:
+            return "hunger"
+        if animal.thirst >= 1000:
+            return "thirst"
+        return "age"
+
+    def __step_sprites__(self, season_effects: dict) -> None:
+        """Advances every animal of the sprite engine by one tick.
+
+        Args:
+            season_effects (dict): The current season modifiers.
+        """
         for animal in self.alive_sprites:
             # Apply season effects
             animal.hunger_rate *= season_effects["hunger_mult"]
@@ -381,13 +518,91 @@ class World:
             if animal.cooldown:
                 animal.cooldown *= season_effects["breeding_mult"]
                 
+            pos = animal.pos
             value = animal.alive()
             if type(value) == bool:
                 if not value:
+                    self.deaths[animal.type][self.__death_cause__(animal)] += 1
                     self.__remove_animal(animal)
+                    continue
             else:
                 self.__handle_mating__(value)
+
+            if animal.pos != pos:
+                self.spatial[animal.type].move(animal, animal.__convert_pos__(animal.pos))
                 
             # Reset rates after applying effects
             animal.hunger_rate /= season_effects["hunger_mult"]
-            animal.thirst_rate /= season_effects["thirst_mult"]
\ No newline at end of file
+            animal.thirst_rate /= season_effects["thirst_mult"]
+
+    def __step_herds__(self, season_effects: dict) -> None:
+        """Advances all species of the array engine by one tick.
+
+        Args:
+            season_effects (dict): The current season modifiers.
+        """
+        rabbits = self.herds["rabbit"]
+        active = {
+            animal_type: herd.step(season_effects, None if animal_type == "rabbit" else rabbits)
+            for animal_type, herd in self.herds.items()
+        }
+
+        # a hunter reaches its food point on the tile of its prey and the prey feeds it once more when it dies there,
+        # every rabbit feeds one hunter at most
+        eaten = np.zeros(rabbits.count, dtype=bool)
+        for animal_type in ("fox", "pig"):
+            herd = self.herds[animal_type]
+            hunters = np.flatnonzero(herd.target[: herd.count] >= 0)
+            prey = rabbits.find(herd.target[hunters])
+            caught = prey >= 0
+            caught[caught] = (herd.cells()[hunters[caught]] == rabbits.cells()[prey[caught]]) & ~eaten[prey[caught]]
+            hunters, prey = hunters[caught], prey[caught]
+            eaten[prey] = True
+            rate = herd.hunger_rate[hunters]
+            herd.hunger[hunters] -= 350 * (20 - rate * season_effects["hunger_mult"]) + 350 * (20 - rate)
+            herd.set_timer[hunters] = 10
+        # a rabbit keeps checking the tile its dead hunter lies on, like a sprite it dies when it steps there
+        eaten |= rabbits.cells() == rabbits.grave[: rabbits.count]
+
+        gone = np.empty(0, dtype=np.int64)
+        for animal_type, herd in self.herds.items():
+            dead = herd.dead()
+            if animal_type == "rabbit":
+                dead |= eaten
+                gone = herd.id[: herd.count][dead]
+            else:
+                # like Herbivore.__cleanup_on_death__, the hunters of dead rabbits give up
+                hunters = np.flatnonzero(np.isin(herd.target[: herd.count], gone))
+                herd.target[hunters] = -1
+                herd.found[hunters] &= ~np.uint8(FOUND_FOOD)
+                herd.clear(hunters)
+                hunters = np.flatnonzero(dead & (herd.target[: herd.count] >= 0))
+                prey = rabbits.find(herd.target[hunters])
+                rabbits.grave[prey[prey >= 0]] = herd.cells()[hunters[prey >= 0]]
+            self.__count_deaths__(animal_type, herd, dead, eaten if animal_type == "rabbit" else None)
+            herd.remove(dead)
+            count = herd.count
+            herd.mate(active[animal_type][~dead])
+            self.births[animal_type] += herd.count - count
+
+    def __count_deaths__(self, animal_type: str, herd: SpeciesArrays, dead: np.ndarray, eaten: np.ndarray = None) -> None:
+        """Adds the deaths of one species of the array engine to the totals, by cause.
+
+        Args:
+            animal_type (str): The animal type.
+            herd (SpeciesArrays): The arrays of the species.
+            dead (np.ndarray): boolean mask of the animals that died this tick
+            eaten (np.ndarray, optional): boolean mask of the animals that got eaten. Defaults to None.
+        """
+        n = herd.count
+        causes = {
+            "predation": np.zeros(n, dtype=bool) if eaten is None else eaten,
+            "hunger": herd.hunger[:n] >= 1000,
+            "thirst": herd.thirst[:n] >= 1000,
+            "age": herd.age[:n] >= herd.max_age,
+        }
+        remaining = dead.copy()
+        for cause in DEATH_CAUSES:
+            hit = remaining & causes[cause]
+            self.deaths[animal_type][cause] += int(np.count_nonzero(hit))
+            remaining &= ~hit
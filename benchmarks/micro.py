@@ -0,0 +1,271 @@
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import gc
+import sys
+import json
+import time
+import random as rnd
+import argparse
+import platform
+import statistics
+import subprocess
+from datetime import datetime, timezone
+import numpy as np
+import Algorithms.astar as ast
+from Algorithms.genetic_algorithm import GeneticAlgorithm
+from config import SimulationConfig
+from generator import generate_map, generate_plot
+from World.terrain import Terrain
+from World.world import World
+
+SEED = 1234  # every benchmark derives its input from this seed, so runs of different commits do the same work
+
+
+def __path_pairs__(terrain: Terrain, count: int, low: int, high: int) -> list:
+    """Picks start and end points on land whose manhatten distance lies in a range.
+
+    Args:
+        terrain (Terrain): The map.
+        count (int): Amount of pairs.
+        low (int): Minimum distance.
+        high (int): Maximum distance.
+
+    Returns:
+        list: (start, end) pairs of (x, y) tuples
+    """
+    rng = np.random.default_rng([SEED, low, high])
+    ys, xs = np.nonzero(terrain.passable)
+    pairs = []
+    while len(pairs) < count:
+        a, b = rng.integers(len(xs), size=2)
+        distance = abs(int(xs[a]) - int(xs[b])) + abs(int(ys[a]) - int(ys[b]))
+        if low <= distance <= high:
+            pairs.append(((int(xs[a]), int(ys[a])), (int(xs[b]), int(ys[b]))))
+    return pairs
+
+
+def __find_paths__(size: int, low: int, high: int, cached: bool):
+    """Builds the pathfinding benchmark: 32 searches between points in a distance range.
+
+    Args:
+        size (int): Width and height of the map.
+        low (int): Minimum distance of the points.
+        high (int): Maximum distance of the points.
+        cached (bool): Whether the paths are already cached, otherwise the cache gets cleared before every run.
+
+    Returns:
+        the function to time
+    """
+    terrain = Terrain(generate_map(SEED, size))
+    pairs = __path_pairs__(terrain, 32, low, high)
+
+    def run():
+        if not cached:
+            ast.path_cache.bump_version()
+        for start, end in pairs:
+            ast.find_path(terrain, start, end)
+
+    ast.path_cache.bump_version()
+    run()  # builds the NavGrid and fills the cache
+    return run
+
+
+def __world__(density: float = 1.0, engine: str = "sprites") -> World:
+    """Builds a headless world with the benchmark seed.
+
+    Args:
+        density (float, optional): Factor of the default animal densities. Defaults to 1.0.
+        engine (str, optional): The engine of the world. Defaults to "sprites".
+
+    Returns:
+        World: the world
+    """
+    defaults = SimulationConfig()
+    config = SimulationConfig(
+        H_PERCENT=defaults.H_PERCENT * density,
+        C_PERCENT=defaults.C_PERCENT * density,
+        O_PERCENT=defaults.O_PERCENT * density,
+    )
+    return World(engine=engine, seed=SEED, config=config)
+
+
+def __generate_plot__(size: int):
+    """Builds the benchmark of the noise of a map."""
+    return lambda: generate_plot(SEED, size)
+
+
+def __generate_map__(size: int):
+    """Builds the benchmark of a whole map."""
+    return lambda: generate_map(SEED, size)
+
+
+def __regrow__():
+    """Builds the benchmark of the berry regrowth of one tick, which replaced the seasonal map update."""
+    world = __world__()
+    return lambda: world.__regrow__(1.0)
+
+
+def __generate_genomes__():
+    """Builds the benchmark of the inheritance of one birth."""
+    world = __world__()
+    genetics = GeneticAlgorithm(rnd.Random(SEED))
+    parents = (world.__random_genomes__("rabbit"), world.__random_genomes__("rabbit"))
+    return lambda: genetics.generate_genomes(*parents)
+
+
+def __tick__(density: float, engine: str):
+    """Builds the benchmark of the ticks of a headless world."""
+    world = __world__(density, engine)
+    ast.path_cache.bump_version()
+    ast.__nav_grid__(world.terrain)
+    return lambda: world.run(True, True)
+
+
+def __benchmarks__() -> list:
+    """Lists every benchmark. The setup gets called before every repeat, so benchmarks that change their state, like
+    ticks of a world, start from the same state each time.
+
+    Returns:
+        list: (name, setup returning the function to time, arguments of the setup, amount of calls per repeat)
+    """
+    benchmarks = []
+    for size in (50, 200):
+        for band, (low, high) in (("short", (2, 10)), ("long", (size // 2, 2 * size))):
+            benchmarks.append((f"astar.find_path/{size}/{band}", __find_paths__, (size, low, high, False), 1))
+            benchmarks.append((f"astar.find_path/{size}/{band}/cached", __find_paths__, (size, low, high, True), 10))
+
+    for size in (50, 200, 1000):
+        benchmarks.append((f"generator.generate_plot/{size}", __generate_plot__, (size,), 5))
+        benchmarks.append((f"generator.generate_map/{size}", __generate_map__, (size,), 5))
+
+    benchmarks.append(("world.__regrow__", __regrow__, (), 200))
+    benchmarks.append(("genetic_algorithm.generate_genomes", __generate_genomes__, (), 2000))
+
+    for engine in ("sprites", "arrays"):
+        for density in (0.5, 1, 4):
+            benchmarks.append((f"world.run/{engine}/x{density}", __tick__, (density, engine), 50))
+    return benchmarks
+
+
+def __measure__(setup, args: tuple, number: int, repeat: int) -> dict:
+    """Times a benchmark.
+
+    Args:
+        setup: Builds the function to time.
+        args (tuple): Arguments of the setup.
+        number (int): Calls per repeat.
+        repeat (int): Amount of repeats.
+
+    Returns:
+        dict: seconds per call of every repeat and their minimum, median, mean and standard deviation
+    """
+    times = []
+    for _ in range(repeat):
+        function = setup(*args)
+        # like timeit, the garbage collector doesn't get to interrupt the measurement
+        gc.collect()
+        gc.disable()
+        try:
+            start = time.perf_counter()
+            for _ in range(number):
+                function()
+            times.append((time.perf_counter() - start) / number)
+        finally:
+            gc.enable()
+
+    return {
+        "number": number,
+        "repeat": repeat,
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.fmean(times),
+        "stdev": statistics.stdev(times) if repeat > 1 else 0.0,
+        "times": times,
+    }
+
+
+def __commit__() -> str:
+    """Returns the current git commit, marked with "+dirty" if there are uncommitted changes, None outside of git."""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True).stdout
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return commit + ("+dirty" if dirty.strip() else "")
+
+
+def run_benchmarks(pattern: str = None, repeat: int = 5) -> dict:
+    """Runs the benchmark suite.
+
+    Args:
+        pattern (str, optional): Only benchmarks whose name contains it get run. Defaults to None so that all do.
+        repeat (int, optional): Repeats per benchmark. Defaults to 5.
+
+    Returns:
+        dict: "meta" describing the machine and commit, and "results" mapping every benchmark to its timings
+    """
+    results = {}
+    for name, setup, args, number in __benchmarks__():
+        if pattern and pattern not in name:
+            continue
+        results[name] = __measure__(setup, args, number, repeat)
+        print(f"{name:<45} {results[name]['median'] * 1000:10.4f} ms", flush=True)
+
+    meta = {
+        "commit": __commit__(),
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "numpy": np.__version__,
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "seed": SEED,
+    }
+    return {"meta": meta, "results": results}
+
+
+def compare(old: dict, new: dict, threshold: float = 0.1) -> list:
+    """Compares the medians of two result files.
+
+    Args:
+        old (dict): The results of the baseline.
+        new (dict): The results to compare against it.
+        threshold (float, optional): Relative change from which on a benchmark counts as faster or slower. Defaults to 0.1.
+
+    Returns:
+        list: (name, old median, new median, new / old, "faster", "slower" or "") of every benchmark in both
+    """
+    rows = []
+    for name, result in new["results"].items():
+        if name not in old["results"]:
+            continue
+        before, after = old["results"][name]["median"], result["median"]
+        ratio = after / before
+        verdict = "faster" if ratio < 1 - threshold else "slower" if ratio > 1 + threshold else ""
+        rows.append((name, before, after, ratio, verdict))
+    return rows
+
+
+def main() -> None:
+    """Runs the suite from the command line, writes the results as JSON and compares them to earlier ones."""
+    parser = argparse.ArgumentParser(description="Runs the micro benchmarks.")
+    parser.add_argument("--out", default="benchmarks/results.json", help="JSON file the results get written to")
+    parser.add_argument("--compare", help="results of an earlier run, e.g. of another commit")
+    parser.add_argument("--filter", help="only runs the benchmarks whose name contains this")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    results = run_benchmarks(args.filter, args.repeat)
+    with open(args.out, "w") as file:
+        json.dump(results, file, indent=2)
+
+    if args.compare:
+        with open(args.compare) as file:
+            old = json.load(file)
+        print(f"\ncompared to {old['meta']['commit']}:")
+        for name, before, after, ratio, verdict in compare(old, results):
+            print(f"{name:<45} {before * 1000:10.4f} -> {after * 1000:10.4f} ms  x{ratio:5.2f} {verdict}")
+
+
+if __name__ == "__main__":
+    main()
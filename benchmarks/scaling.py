@@ -0,0 +1,202 @@
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # every worker would greet otherwise
+
+import sys
+import json
+import math
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import Algorithms.astar as ast
+from config import SimulationConfig
+from World.world import World
+
+try:  # peak memory is only available on unix
+    import resource
+except ImportError:
+    resource = None
+
+SIZES = (50, 100, 200, 500, 1000, 2000)
+DENSITIES = (0.5, 1, 2, 4)
+
+
+def __peak_rss__() -> float:
+    """Returns the peak resident memory of the process in MiB, None if the platform can't tell."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10  # bytes on macOS, KiB elsewhere
+
+
+def __run_cell__(size: int, density: float, ticks: int, budget: float, engine: str, seed: int) -> dict:
+    """Worker of the harness. Builds one world and runs it until the ticks are done or the time budget is used up.
+
+    Args:
+        size (int): Width and height of the map.
+        density (float): Factor of the default animal densities.
+        ticks (int): Amount of ticks to simulate.
+        budget (float): Seconds after which the run stops early, ticks per second are measured on the ticks done.
+        engine (str): The engine of the world.
+        seed (int): The run seed.
+
+    Returns:
+        dict: the measurements of the cell
+    """
+    defaults = SimulationConfig()
+    config = SimulationConfig(
+        MAPSIZE=size,
+        H_PERCENT=defaults.H_PERCENT * density,
+        C_PERCENT=defaults.C_PERCENT * density,
+        O_PERCENT=defaults.O_PERCENT * density,
+    )
+
+    start = time.perf_counter()
+    world = World(engine=engine, seed=seed, config=config)
+    build = time.perf_counter() - start
+    animals = sum(world.population().values())
+
+    done = 0
+    start = time.perf_counter()
+    while done < ticks and time.perf_counter() - start < budget:
+        world.step()
+        done += 1
+    seconds = time.perf_counter() - start
+
+    requests = ast.path_cache.hits + ast.path_cache.misses
+    return {
+        "size": size,
+        "density": density,
+        "engine": engine,
+        "animals": animals,
+        "build_s": build,
+        "ticks": done,
+        "seconds": seconds,
+        "ticks_per_s": done / seconds,
+        "ms_per_tick": seconds * 1000 / done,
+        "peak_rss_mb": __peak_rss__(),
+        "path_calls": requests,
+        "path_searches": ast.path_cache.misses,
+        "path_calls_per_tick": requests / done,
+        "population": world.population(),
+    }
+
+
+def run_scaling(sizes: tuple = SIZES, densities: tuple = DENSITIES, ticks: int = 200, budget: float = 60.0,
+                engine: str = "sprites", seed: int = 0) -> list:
+    """Measures every combination of map size and density. Every cell runs alone in a new process, so the peak memory
+    belongs to that cell and cells don't slow each other down. A cell that fails, e.g. runs out of memory, gets
+    recorded with its error and the remaining cells still run.
+
+    Args:
+        sizes (tuple, optional): Map sizes. Defaults to SIZES.
+        densities (tuple, optional): Factors of the default animal densities. Defaults to DENSITIES.
+        ticks (int, optional): Ticks per cell. Defaults to 200.
+        budget (float, optional): Maximum seconds of ticks per cell. Defaults to 60.0.
+        engine (str, optional): The engine of the worlds. Defaults to "sprites".
+        seed (int, optional): The run seed of every world. Defaults to 0.
+
+    Returns:
+        list: one dict of measurements per cell
+    """
+    rows = []
+    for density in densities:
+        for size in sizes:
+            with ProcessPoolExecutor(max_workers=1) as pool:
+                try:
+                    row = pool.submit(__run_cell__, size, density, ticks, budget, engine, seed).result()
+                except Exception as error:
+                    row = {"size": size, "density": density, "engine": engine, "error": repr(error)}
+            rows.append(row)
+            if "error" in row:
+                print(f"{engine} x{density} {size:>5}: {row['error']}", flush=True)
+            else:
+                print(f"{engine} x{density} {size:>5}: {row['animals']:>8} animals {row['ticks_per_s']:10.2f} ticks/s "
+                      f"{row['peak_rss_mb']:8.1f} MiB {row['path_calls_per_tick']:8.1f} paths/tick", flush=True)
+    return rows
+
+
+def exponents(rows: list) -> list:
+    """Estimates how the tick time grows with the amount of animals between neighboring sizes of a density. An exponent
+    around 1 means linear scaling, clearly above 1 hints at work that grows faster than the population, like searches
+    over all animals.
+
+    Args:
+        rows (list): Measurements as returned by run_scaling.
+
+    Returns:
+        list: (engine, density, smaller size, larger size, exponent)
+    """
+    result = []
+    cells = {}
+    for row in rows:
+        if "error" not in row and row["animals"]:
+            cells.setdefault((row["engine"], row["density"]), []).append(row)
+
+    for (engine, density), group in cells.items():
+        group.sort(key=lambda row: row["size"])
+        for small, large in zip(group, group[1:]):
+            if large["animals"] == small["animals"]:
+                continue
+            exponent = math.log(large["ms_per_tick"] / small["ms_per_tick"]) / math.log(large["animals"] / small["animals"])
+            result.append((engine, density, small["size"], large["size"], exponent))
+    return result
+
+
+def plot(rows: list, path: str) -> None:
+    """Draws the scaling curves, ticks per second and peak memory over the map size with one line per density.
+
+    Args:
+        rows (list): Measurements as returned by run_scaling.
+        path (str): The image file.
+    """
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    figure, (speed, memory) = plt.subplots(1, 2, figsize=(12, 5))
+    for density in sorted({row["density"] for row in rows}):
+        cells = sorted((row for row in rows if row["density"] == density and "error" not in row), key=lambda row: row["size"])
+        sizes = [row["size"] for row in cells]
+        speed.plot(sizes, [row["ticks_per_s"] for row in cells], marker="o", label=f"density x{density}")
+        memory.plot(sizes, [row["peak_rss_mb"] for row in cells], marker="o", label=f"density x{density}")
+
+    for axis, label in ((speed, "ticks per second"), (memory, "peak RSS (MiB)")):
+        axis.set_xscale("log")
+        axis.set_yscale("log")
+        axis.set_xlabel("map size (tiles)")
+        axis.set_ylabel(label)
+        axis.grid(True, which="both", alpha=0.3)
+        axis.legend()
+    figure.tight_layout()
+    figure.savefig(path)
+    plt.close(figure)
+
+
+def main() -> None:
+    """Runs the harness from the command line and writes the measurements as JSON."""
+    parser = argparse.ArgumentParser(description="Measures ticks per second, memory and pathfinding over map size and density.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--densities", type=float, nargs="+", default=DENSITIES)
+    parser.add_argument("--ticks", type=int, default=200)
+    parser.add_argument("--budget", type=float, default=60.0, help="maximum seconds of ticks per cell")
+    parser.add_argument("--engine", choices=("sprites", "arrays"), default="sprites")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="benchmarks/scaling.json", help="JSON file the measurements get written to")
+    parser.add_argument("--plot", help="also draws the scaling curves into this image")
+    args = parser.parse_args()
+
+    rows = run_scaling(args.sizes, args.densities, args.ticks, args.budget, args.engine, args.seed)
+    slopes = exponents(rows)
+    with open(args.out, "w") as file:
+        json.dump({"cells": rows, "exponents": slopes}, file, indent=2)
+
+    print("\ngrowth of the tick time with the animals (1 = linear):")
+    for engine, density, small, large, exponent in slopes:
+        print(f"{engine} x{density} {small:>5} -> {large:>5}: {exponent:5.2f}{'  super-linear' if exponent > 1.3 else ''}")
+
+    if args.plot:
+        plot(rows, args.plot)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+import copy
+import settings
+from World.terrain import BERRY, FOX, PIG, RABBIT
+
+# every setting a configuration holds, the constants of settings.py are their defaults
+FIELDS = tuple(name for name in vars(settings) if name.isupper())
+
+
+class SimulationConfig:
+    """Runtime configuration of a simulation. It gets passed into a World and from there to the animals, the
+    pathfinding choice and the generator, so differently configured worlds can run side by side in one process.
+
+    The values use the names of settings.py, e.g. SimulationConfig(MAPSIZE=100, B_PERCENT=0.08).
+    """
+
+    def __init__(self, **overrides) -> None:
+        """Initializes the configuration with the defaults of settings.py.
+
+        Args:
+            **overrides: settings that differ from the defaults
+        """
+        for name in FIELDS:
+            setattr(self, name, copy.deepcopy(getattr(settings, name)))
+
+        for name, value in overrides.items():
+            if name not in FIELDS:
+                raise ValueError(f"Unknown setting: {name}")
+            setattr(self, name, value)
+
+    def __repr__(self) -> str:
+        overrides = ", ".join(f"{name}={value!r}" for name, value in self.overrides().items())
+        return f"SimulationConfig({overrides})"
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, SimulationConfig) and self.to_dict() == other.to_dict()
+
+    def replace(self, **overrides) -> "SimulationConfig":
+        """Returns a copy with some settings changed.
+
+        Args:
+            **overrides: settings that get changed
+
+        Returns:
+            SimulationConfig: the new configuration
+        """
+        return SimulationConfig(**{**self.overrides(), **overrides})
+
+    def to_dict(self) -> dict:
+        """Returns every setting.
+
+        Returns:
+            dict: setting name mapped to its value
+        """
+        return {name: getattr(self, name) for name in FIELDS}
+
+    def overrides(self) -> dict:
+        """Returns the settings that differ from the defaults.
+
+        Returns:
+            dict: setting name mapped to its value
+        """
+        return {name: value for name, value in self.to_dict().items() if value != getattr(settings, name)}
+
+    def features(self) -> tuple:
+        """Returns the map values of berries, rabbits, foxes and pigs with the percentage of land they cover at the start.
+
+        Returns:
+            tuple: (map value, percent) pairs in the order the generator places them
+        """
+        return ((BERRY, self.B_PERCENT), (RABBIT, self.H_PERCENT), (FOX, self.C_PERCENT), (PIG, self.O_PERCENT))
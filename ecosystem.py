@@ -1,20 +1,27 @@
 import pygame as pg
-from settings import *
 from World.world import World
+from config import SimulationConfig
+from World.renderer import Renderer
 from real_time_plot import RealTimePlot
+from profiler import Profiler
+from tracing import TraceRecorder
 import threading
 import queue
+import time
 
 class Simulation:
-    def __init__(self):
+    def __init__(self, config: SimulationConfig = None):
+        self.config = SimulationConfig() if config is None else config
         pg.init()
         pg.font.init()
         
-        self.screen = pg.display.set_mode((WIDTH, HEIGHT))
+        self.screen = pg.display.set_mode((self.config.WIDTH, self.config.HEIGHT))
         pg.display.set_caption("Ecosystem Simulation")
         self.clock = pg.time.Clock()
         
-        self.world = World()
+        self.world = World(config=self.config)
+        self.renderer = Renderer(self.world)
+        self.world.attach(self.renderer)
         self.r_state = True
         self.is_running = True
         
@@ -22,62 +29,116 @@ class Simulation:
         self.light_color = (183, 192, 154)
         self.dark_color = (127, 133, 109)
         self.b1_texts = ["Pause", "Unpause"]
+        self.b1_surfaces = [self.font.render(text, True, (0, 0, 0)) for text in self.b1_texts]
         
         self.animal_event = pg.USEREVENT + 1
-        pg.time.set_timer(self.animal_event, int(1000 / min(SPEED, 30)))
+        pg.time.set_timer(self.animal_event, int(1000 / min(self.config.SPEED, 30)))
         
+        # F3 toggles the profiler and its overlay, F4 records a trace into trace.json
+        self.profiler = Profiler()
+        self.hud_lines = 0
+        self.recorder = TraceRecorder()
+
+        # F toggles fast forward, which ticks as often as a frame allows instead of SPEED times per second
+        self.fast_forward = False
+        self.ticks_per_frame = 0
+        self.draw_time = 0.0  # seconds the last frame took to draw, kept free of ticks in fast forward
+
         self.time = 0
         self.data_queue = queue.Queue()
         self.plot = None
 
     def game_loop(self):
         while self.is_running:
+            frame_start = time.perf_counter()
             self.handle_events()
+            if self.fast_forward and self.r_state:
+                self.__fast_forward__(frame_start)
+
+            draw_start = time.perf_counter()
             self.draw()
-            self.clock.tick(FPS)
+            self.draw_time = time.perf_counter() - draw_start
+            self.clock.tick(self.config.FPS)
+        if self.recorder.enabled:
+            self.__toggle_trace__()
         pg.quit()
 
     def handle_events(self):
         for event in pg.event.get():
             if event.type == pg.QUIT:
                 self.is_running = False
-            elif event.type == self.animal_event and self.r_state:
+            elif event.type == self.animal_event and self.r_state and not self.fast_forward:
                 self.world.run(True, True)
-                self.time += 1
-                # Send data to plot
-                data = (self.time, 
-                       len(self.world.rabbits), 
-                       len(self.world.foxes), 
-                       len(self.world.pigs))
-                self.data_queue.put(data)
+                self.__send_population__()
+            elif event.type == pg.KEYDOWN and event.key == pg.K_f:
+                self.fast_forward = not self.fast_forward
+            elif event.type == pg.KEYDOWN and event.key == pg.K_F3 and not self.recorder.enabled:
+                self.profiler.toggle()
+                self.profiler.reset()
+            elif event.type == pg.KEYDOWN and event.key == pg.K_F4 and not self.profiler.enabled:
+                self.__toggle_trace__()
             elif event.type == pg.MOUSEBUTTONDOWN:
                 mouse = pg.mouse.get_pos()
-                if WIDTH/2-100 <= mouse[0] <= WIDTH/2+100 and HEIGHT-75 <= mouse[1] <= HEIGHT-25:
+                width, height = self.config.WIDTH, self.config.HEIGHT
+                if width/2-100 <= mouse[0] <= width/2+100 and height-75 <= mouse[1] <= height-25:
                     self.r_state = not self.r_state
 
+    def __send_population__(self):
+        """Counts a tick and sends the population to the plot."""
+        self.time += 1
+        population = self.world.population()
+        data = (self.time, 
+               population["rabbit"], 
+               population["fox"], 
+               population["pig"])
+        self.data_queue.put(data)
+
+    def __fast_forward__(self, frame_start: float):
+        """Advances the world by many ticks without drawing the states in between. With FAST_FORWARD set, that many
+        ticks get run, otherwise ticks get run until the frame time left by the last draw is used up, so the window
+        holds FPS however fast the machine is.
+
+        Args:
+            frame_start (float): perf_counter time the current frame started at.
+        """
+        ticks = 0
+        if self.config.FAST_FORWARD:
+            for ticks in range(1, self.config.FAST_FORWARD + 1):
+                self.world.step()
+                self.__send_population__()
+        else:
+            deadline = frame_start + 1 / self.config.FPS - self.draw_time
+            while not ticks or time.perf_counter() < deadline:  # at least one tick, even on a slow machine
+                self.world.step()
+                self.__send_population__()
+                ticks += 1
+        self.ticks_per_frame = ticks
+
     def draw(self):
-        self.screen.fill("black")
-        self.world.run(self.r_state, False)
-        self.__buttons__()
         self.__display_population__()
-        pg.display.flip()
+        self.world.run(self.r_state, False)
+        # only the areas that changed get updated on the display
+        pg.display.update(self.renderer.dirty_rects + [self.__buttons__()])
 
     def __buttons__(self):
         mouse = pg.mouse.get_pos()
-        if WIDTH/2-100 <= mouse[0] <= WIDTH/2+100 and HEIGHT-75 <= mouse[1] <= HEIGHT-25:
-            button1 = pg.draw.rect(self.screen, self.light_color, [WIDTH/2-100, HEIGHT-75, 200, 50])
+        width, height = self.config.WIDTH, self.config.HEIGHT
+        if width/2-100 <= mouse[0] <= width/2+100 and height-75 <= mouse[1] <= height-25:
+            button1 = pg.draw.rect(self.screen, self.light_color, [width/2-100, height-75, 200, 50])
         else:
-            button1 = pg.draw.rect(self.screen, self.dark_color, [WIDTH/2-100, HEIGHT-75, 200, 50])
+            button1 = pg.draw.rect(self.screen, self.dark_color, [width/2-100, height-75, 200, 50])
         
-        b1_text = self.font.render(self.b1_texts[0] if self.r_state else self.b1_texts[1], True, (0, 0, 0))
+        b1_text = self.b1_surfaces[0] if self.r_state else self.b1_surfaces[1]
         b1_rect = b1_text.get_rect(center=(button1.centerx, button1.centery))
         self.screen.blit(b1_text, b1_rect)
+        return button1
 
     def __display_population__(self):
-        rabbits = len(self.world.rabbits)
-        foxes = len(self.world.foxes)
-        pigs = len(self.world.pigs)
-        current_season = SEASONS[self.world.current_season]
+        population = self.world.population()
+        rabbits = population["rabbit"]
+        foxes = population["fox"]
+        pigs = population["pig"]
+        current_season = self.config.SEASONS[self.world.current_season]
         
         texts = [
             f"Season: {current_season}",
@@ -86,9 +147,37 @@ class Simulation:
             f"Pigs: {pigs}"
         ]
         
+        # the renderer only renders the texts again when they changed
         for i, text in enumerate(texts):
-            surface = self.font.render(text, True, (255, 255, 255))
-            self.screen.blit(surface, (10, 10 + i*30))
+            self.renderer.set_text((10, 10 + i*30), text, (255, 255, 255))
+
+        position = (10, 10 + len(texts)*30)
+        if self.fast_forward:
+            self.renderer.set_text(position, f"Fast forward: {self.ticks_per_frame} ticks/frame", (255, 255, 0))
+        else:
+            self.renderer.remove_text(position)
+
+        self.__display_profiler__()
+
+    def __toggle_trace__(self):
+        """Starts recording a trace or stops the recording and writes it to disk."""
+        if self.recorder.enabled:
+            self.recorder.stop()
+            self.recorder.flush()
+            print(f"Trace written to {self.recorder.path}")
+        else:
+            self.recorder.start()
+
+    def __display_profiler__(self):
+        """Shows the profiler overlay in the top right corner while the profiler is enabled."""
+        lines = self.profiler.lines() if self.profiler.enabled else []
+        for i in range(max(len(lines), self.hud_lines)):
+            pos = (self.config.WIDTH - 330, 10 + i*25)
+            if i < len(lines):
+                self.renderer.set_text(pos, lines[i], (255, 255, 0))
+            else:
+                self.renderer.remove_text(pos)
+        self.hud_lines = len(lines)
 
     def run(self):
         try:
@@ -0,0 +1,124 @@
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # every worker would greet otherwise
+
+import argparse
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from config import SimulationConfig
+from World.world import World
+
+SPECIES = ("rabbit", "fox", "pig")
+
+
+def __run_world__(shm_name: str, shape: tuple, row: int, seed: int, ticks: int, engine: str, config: SimulationConfig) -> None:
+    """Worker of the ensemble. Simulates one headless world and writes its population of every tick straight into shared memory.
+
+    Args:
+        shm_name (str): Name of the shared memory block holding the counts of all runs.
+        shape (tuple): Shape of the counts array (runs, ticks, species).
+        row (int): The run this worker writes to.
+        seed (int): The run seed.
+        ticks (int): Amount of ticks to simulate.
+        engine (str): The engine of the world.
+        config (SimulationConfig): The configuration of the world.
+    """
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        counts = np.ndarray(shape, dtype=np.int32, buffer=shm.buf)[row]
+        world = World(engine=engine, seed=seed, config=config)
+        for tick in range(ticks):
+            world.step()
+            population = world.population()
+            counts[tick] = [population[species] for species in SPECIES]
+    finally:
+        shm.close()
+
+
+def run_ensemble(runs: int, ticks: int, seed: int = None, engine: str = "sprites", workers: int = None,
+                 config: SimulationConfig = None) -> tuple:
+    """Simulates many headless worlds with different seeds in a process pool.
+
+    The workers write their counts into one preallocated shared array, so nothing gets pickled per tick.
+
+    Args:
+        runs (int): Amount of worlds.
+        ticks (int): Ticks every world gets simulated for.
+        seed (int, optional): Seed of the ensemble, the run seeds get derived from it. Defaults to None so that a fresh one gets drawn.
+        engine (str, optional): The engine of the worlds. Defaults to "sprites".
+        workers (int, optional): Amount of worker processes. Defaults to None so that every core gets used.
+        config (SimulationConfig, optional): The configuration of every world. Defaults to None so that the settings are used.
+
+    Returns:
+        tuple: counts of shape (runs, ticks, 3) in the order of SPECIES, and the seed of every run
+    """
+    config = SimulationConfig() if config is None else config
+    seeds = [int(s) for s in np.random.SeedSequence(seed).generate_state(runs, np.uint64)]
+    shape = (runs, ticks, len(SPECIES))
+
+    shm = shared_memory.SharedMemory(create=True, size=max(int(np.prod(shape)) * 4, 1))
+    try:
+        counts = np.ndarray(shape, dtype=np.int32, buffer=shm.buf)
+        counts[:] = 0
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            futures = [
+                pool.submit(__run_world__, shm.name, shape, row, run_seed, ticks, engine, config)
+                for row, run_seed in enumerate(seeds)
+            ]
+            for future in futures:
+                future.result()  # raises the exception of a failed run
+        result = counts.copy()
+        del counts  # the buffer can only be released without views on it
+    finally:
+        shm.close()
+        shm.unlink()
+
+    return result, seeds
+
+
+def percentile_bands(counts: np.ndarray, percentiles: tuple = (5, 25, 50, 75, 95)) -> dict:
+    """Summarizes the runs of an ensemble as percentile bands per tick.
+
+    Args:
+        counts (np.ndarray): counts of shape (runs, ticks, 3) as returned by run_ensemble
+        percentiles (tuple, optional): The percentiles of the bands. Defaults to (5, 25, 50, 75, 95).
+
+    Returns:
+        dict: species mapped to an array of shape (len(percentiles), ticks)
+    """
+    bands = np.percentile(counts, percentiles, axis=0)
+    return {species: bands[:, :, i] for i, species in enumerate(SPECIES)}
+
+
+def main() -> None:
+    """Runs an ensemble from the command line and prints the bands at the last tick."""
+    parser = argparse.ArgumentParser(description="Runs many headless worlds in parallel.")
+    parser.add_argument("--runs", type=int, default=100)
+    parser.add_argument("--ticks", type=int, default=1000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--engine", choices=("sprites", "arrays"), default="sprites")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--out", help="stores counts, seeds and bands in this .npz file")
+    args = parser.parse_args()
+
+    counts, seeds = run_ensemble(args.runs, args.ticks, args.seed, args.engine, args.workers)
+    percentiles = (5, 25, 50, 75, 95)
+    bands = percentile_bands(counts, percentiles)
+
+    print(f"{args.runs} runs, {args.ticks} ticks, population at the last tick:")
+    print("species " + " ".join(f"{f'p{p}':>7}" for p in percentiles))
+    for species, band in bands.items():
+        print(f"{species:<7} " + " ".join(f"{value:7.1f}" for value in band[:, -1]))
+
+    if args.out:
+        np.savez_compressed(
+            args.out,
+            counts=counts,
+            seeds=np.array(seeds, dtype=np.uint64),
+            percentiles=np.array(percentiles),
+            **{f"band_{species}": band for species, band in bands.items()},
+        )
+
+
+if __name__ == "__main__":
+    main()
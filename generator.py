@@ -1,55 +1,64 @@
-import itertools
 import numpy as np
 import random as rnd
 import matplotlib.pyplot as plt
 from settings import *
+from config import SimulationConfig
 
-def __perlin__(x: np.ndarray, y: np.ndarray, seed: int = 0) -> list:
-    """Generates Perlin noise for given x and y coordinates.
+def __perlin_factors__(x: np.ndarray, y: np.ndarray, seed: int = 0) -> tuple:
+    """Generates Perlin noise for a grid of x and y coordinates in separable form.
+
+    Every corner term of the noise only depends on either x or y inside a lattice cell, so the whole grid is the
+    product rows @ cols.T. The matrices are only as wide as the amount of lattice cells the coordinates cross.
 
     Args:
-        x (numpy.ndarray): The x coordinates.
-        y (numpy.ndarray): The y coordinates.
+        x (numpy.ndarray): The x coordinates of the columns.
+        y (numpy.ndarray): The y coordinates of the rows.
         seed (int, optional): The random seed. Defaults to 0.
 
     Returns:
-        list: The generated Perlin noise values.
+        tuple: row factors of shape (len(y), k) and column factors of shape (len(x), k)
     """
-    np.random.seed(seed)
-    p = np.arange(256, dtype=int)  # permutation array
-    np.random.shuffle(p)  # shuffle shuffle permutations
+    p = np.arange(256, dtype=np.intp)  # permutation array
+    np.random.RandomState(seed).shuffle(p)  # shuffle shuffle permutations, same order as seeding the global generator
     p = np.stack(
         [p, p]
     ).flatten()  # 2d array turned 1d for easy dot product interpolations
 
-    xg, yg = x.astype(int), y.astype(int)  # grid coords
-    xv, yv = x - xg, y - yg  # distance vector coords
+    xg, yg = x.astype(np.intp), y.astype(np.intp)  # grid coords
+    xv, yv = x - xg.astype(x.dtype), y - yg.astype(y.dtype)  # distance vector coords
+    f1, f2 = __fade__(xv), __fade__(yv)  # fade function
 
-    # gradient vector coordinates top left, top right, bottom left, bottom right
-    tl = __gradient__(p[p[xg] + yg], xv, yv)
-    tr = __gradient__(p[p[xg] + yg + 1], xv, yv - 1)
-    bl = __gradient__(p[p[xg + 1] + yg + 1], xv - 1, yv - 1)
-    br = __gradient__(p[p[xg + 1] + yg], xv - 1, yv)
+    cells = np.arange(xg.min(), xg.max() + 1)  # lattice columns the x coordinates cross
+    in_cell = xg[:, np.newaxis] == cells
 
-    f1, f2 = __fade__(xv), __fade__(yv)  # fade function
+    rows, cols = [], []
+    # corners top left, bottom right, top right, bottom left as offsets of the lattice point
+    for ax, ay in ((0, 0), (1, 0), (0, 1), (1, 1)):
+        wx = f1 if ax else 1 - f1  # linear interpolation weights
+        wy = f2 if ay else 1 - f2
+        g = p[p[cells + ax][np.newaxis, :] + yg[:, np.newaxis] + ay] & 3  # gradient per row and lattice column
 
-    # linear interpolation
-    x1 = __lerp__(tl, br, f1)
-    x2 = __lerp__(tr, bl, f1)
-    return __lerp__(x1, x2, f2)
+        # dot product with the gradient, one term per component
+        rows.append(wy[:, np.newaxis] * __GRADIENT_X__[g])
+        cols.append(in_cell * (wx * (xv - ax))[:, np.newaxis])
+        rows.append((wy * (yv - ay))[:, np.newaxis] * __GRADIENT_Y__[g])
+        cols.append(in_cell * wx[:, np.newaxis])
 
-def __lerp__(a: float, b: float, x: float) -> float:
-    """Linear interpolation.
+    return np.hstack(rows), np.hstack(cols)
+
+def __perlin__(x: np.ndarray, y: np.ndarray, seed: int = 0) -> np.ndarray:
+    """Generates Perlin noise for a grid of x and y coordinates.
 
     Args:
-        a (float): The start value.
-        b (float): The end value.
-        x (float): The interpolation factor.
+        x (numpy.ndarray): The x coordinates of the columns.
+        y (numpy.ndarray): The y coordinates of the rows.
+        seed (int, optional): The random seed. Defaults to 0.
 
     Returns:
-        float: The interpolated value.
+        numpy.ndarray: The generated Perlin noise values, shape (len(y), len(x)).
     """
-    return a + x * (b - a)
+    rows, cols = __perlin_factors__(x, y, seed)
+    return rows @ cols.T
 
 def __fade__(t: float) -> float:
     """Calculates the fade value for Perlin noise.
@@ -60,90 +69,133 @@ def __fade__(t: float) -> float:
     Returns:
         float: The calculated fade value.
     """
-    return 6 * t**5 - 15 * t**4 + 10 * t**3
+    return t * t * t * (t * (t * 6 - 15) + 10)
 
-def __gradient__(h: int, x: float, y: float):
-    """Calculates the gradient vectors and the dot product.
+# x and y component of the gradient vectors (0, 1), (0, -1), (1, 0), (-1, 0)
+__GRADIENT_X__ = np.array([0, 0, 1, -1], dtype=np.float32)
+__GRADIENT_Y__ = np.array([1, -1, 0, 0], dtype=np.float32)
 
-    Args:
-        h (int): The hash value.
-        x (float): The x coordinate.
-        y (float): The y coordinate.
-    """
-    vectors = np.array([[0, 1], [0, -1], [1, 0], [-1, 0]])
-    g = vectors[h % 4]
-    return g[:, :, 0] * x + g[:, :, 1] * y
-
-def generate_plot(gseed: int = None) -> list:
-    """Generates a plot of Perlin noise.
+def generate_plot(gseed: int = None, size: int = MAPSIZE, x: int = 0, y: int = 0, width: int = None, height: int = None) -> np.ndarray:
+    """Generates a plot of Perlin noise. A window of the plot can be generated on its own and matches the same area of the whole plot.
 
     Args:
         gseed (int, optional): The random seed in case a map needs to be recreated. Defaults to none.
+        size (int, optional): Width and height of the whole plot in tiles. Defaults to MAPSIZE.
+        x (int, optional): Left edge of the window. Defaults to 0.
+        y (int, optional): Top edge of the window. Defaults to 0.
+        width (int, optional): Width of the window. Defaults to None so that it reaches the right edge.
+        height (int, optional): Height of the window. Defaults to None so that it reaches the bottom edge.
 
     Returns:
-        list: The generated plot.
+        numpy.ndarray: The generated plot.
     """
-    p = np.zeros((50, 50))
+    width = size - x if width is None else width
+    height = size - y if height is None else height
+
+    # the octaves are summed in separable form, so the whole plot is a single matrix product
+    rows, cols = [], []
     for i in range(4):
         freq = 2**i
-        lin = np.linspace(0, freq, 50, endpoint=False)
-        x, y = np.meshgrid(lin, lin)
+        step = freq / size
         seed = rnd.randint(0, 999999999) if gseed is None else gseed
-        p = __perlin__(x, y, seed=seed) / freq + p
+        octave_rows, octave_cols = __perlin_factors__(
+            (np.arange(x, x + width) * step).astype(np.float32),
+            (np.arange(y, y + height) * step).astype(np.float32),
+            seed=seed,
+        )
+        rows.append(octave_rows)
+        cols.append(octave_cols / freq)
 
-    return p
+    return np.hstack(rows) @ np.hstack(cols).T
 
-def generate_map(gseed: int = None) -> list:
+def __land__(p: np.ndarray) -> np.ndarray:
+    """Thresholds a plot into land and water.
+
+    Args:
+        p (numpy.ndarray): The plot.
+
+    Returns:
+        numpy.ndarray: True for land tiles
+    """
+    return (p > -0.05) & (p < 0.4)
+
+def __terrain__(land: np.ndarray, rng: np.random.Generator, config: SimulationConfig, dtype=np.uint8) -> np.ndarray:
+    """Turns a land mask into a map and places berries, rabbits, foxes and pigs on distinct land tiles.
+
+    Args:
+        land (numpy.ndarray): True for land tiles.
+        rng (np.random.Generator): Generator used for placing the features.
+        config (SimulationConfig): The configuration holding the percentages of the features.
+        dtype (optional): Type of the map values. Defaults to np.uint8.
+
+    Returns:
+        numpy.ndarray: The map.
+    """
+    randmap = np.where(land, dtype(2), dtype(5))
+    land_tiles = np.flatnonzero(land)
+
+    features = config.features()
+    needed = [int(len(land_tiles) * percent) for _, percent in features]
+    chosen = rng.choice(land_tiles, size=sum(needed), replace=False)
+
+    flat = randmap.reshape(-1)
+    offset = 0
+    for (value, _), count in zip(features, needed):
+        flat[chosen[offset : offset + count]] = value
+        offset += count
+
+    return randmap
+
+def generate_map(gseed: int = None, size: int = None, config: SimulationConfig = None) -> np.ndarray:
     """Generates a map using Perlin noise.
 
     Args:
         gseed (int, optional): The random seed in case a map needs to be recreated. Defaults to none.
+        size (int, optional): Width and height of the map in tiles. Defaults to None so that MAPSIZE of the configuration is used.
+        config (SimulationConfig, optional): The configuration. Defaults to None so that the settings are used.
 
     Returns:
-        list: The generated map.
+        numpy.ndarray: The generated map.
     """
+    config = SimulationConfig() if config is None else config
+    size = config.MAPSIZE if size is None else size
+
     MIN_LAND_PERCENT = 0.65  # Minimum percentage of land tiles required
 
+    # a given seed recreates the same terrain and the same animals
+    rng = np.random.default_rng(gseed)
+    seed = gseed
     while True:
-        p = generate_plot(gseed)
-        randmap = np.zeros((50, 50))
-        land_tiles = []
-        for y, x in itertools.product(range(50), range(50)):
-            if -0.05 < p[y][x] < 0.4:
-                randmap[y][x] = 2.0
-                land_tiles.append((y, x))
-            else:
-                randmap[y][x] = 5.0
-
-        land_percent = len(land_tiles) / (50 * 50)
-        if land_percent >= MIN_LAND_PERCENT:
+        p = generate_plot(seed, size)
+        land = __land__(p)
+        if np.count_nonzero(land) >= MIN_LAND_PERCENT * land.size:
             break
+        # a fixed seed would fail forever, the retries get seeds derived from it
+        seed = None if gseed is None else int(rng.integers(0, 999999999))
 
-    b_needed = int(len(land_tiles) * B_PERCENT)
-    h_needed = int(len(land_tiles) * H_PERCENT)
-    c_needed = int(len(land_tiles) * C_PERCENT)
-    o_needed = int(len(land_tiles) * O_PERCENT)
-    for _ in range(b_needed):
-        coord = rnd.choice(land_tiles)
-        land_tiles.remove(coord)
-        randmap[coord[0]][coord[1]] = 0.0
-
-    for _ in range(h_needed):
-        coord = rnd.choice(land_tiles)
-        land_tiles.remove(coord)
-        randmap[coord[0]][coord[1]] = 3.0
-
-    for _ in range(c_needed):
-        coord = rnd.choice(land_tiles)
-        land_tiles.remove(coord)
-        randmap[coord[0]][coord[1]] = 1.0
-
-    for _ in range(o_needed):
-        coord = rnd.choice(land_tiles)
-        land_tiles.remove(coord)
-        randmap[coord[0]][coord[1]] = 4.0
+    return __terrain__(land, rng, config)
 
-    return randmap
+def generate_chunk(gseed: int, size: int, x: int, y: int, width: int, height: int, config: SimulationConfig = None) -> np.ndarray:
+    """Generates one rectangular chunk of a map on its own, e.g. for worlds too large to be generated at once.
+
+    Land and water follow the same area of generate_plot with that seed. Animals and berries are placed per chunk
+    and the minimum land percentage isn't enforced.
+
+    Args:
+        gseed (int): The random seed of the whole map.
+        size (int): Width and height of the whole map in tiles.
+        x (int): Left edge of the chunk.
+        y (int): Top edge of the chunk.
+        width (int): Width of the chunk.
+        height (int): Height of the chunk.
+        config (SimulationConfig, optional): The configuration. Defaults to None so that the settings are used.
+
+    Returns:
+        numpy.ndarray: The chunk as uint8 map values.
+    """
+    land = __land__(generate_plot(gseed, size, x, y, width, height))
+    config = SimulationConfig() if config is None else config
+    return __terrain__(land, np.random.default_rng([gseed, x, y]), config)
 
 def main() -> None:
     """Main function to generate and display a plot of Perlin noise."""
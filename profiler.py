@@ -0,0 +1,265 @@
+import time
+from collections import deque
+import Algorithms.astar as ast
+import Algorithms.hpa as hpa
+from Animals.animal import Animal
+from World.world import World
+from World.renderer import Renderer
+
+# section name, owner and attribute of every instrumented function. Pathfinding gets patched in its modules, the
+# animals look the pathfinder up on every call, so the patch is seen without touching them.
+TARGETS = (
+    ("tick", World, "step"),
+    ("regrowth", World, "__regrow__"),
+    ("animals", World, "__step_sprites__"),
+    ("animals", World, "__step_herds__"),
+    ("movement", Animal, "__normal_movement__"),
+    ("movement", Animal, "__direct_movement__"),
+    ("resolve_needs", Animal, "__resolve_needs__"),
+    ("find_prey", Animal, "__find_prey__"),
+    ("find_mate", Animal, "__find_mate__"),
+    ("find_path", ast, "find_path"),
+    ("find_path", hpa, "find_path"),
+    ("render", Renderer, "draw"),
+)
+
+# the instrumentation that currently replaces the functions of TARGETS
+__active__ = None
+
+
+def instrument(owner, wrap) -> list:
+    """Replaces every function of TARGETS with a wrapped version.
+
+    Args:
+        owner: The instrumentation, only one can be active at a time.
+        wrap: Called with (section, function) for every target, returns the replacement.
+
+    Returns:
+        list: (owner, attribute, original function) of every replaced function, needed by restore
+    """
+    global __active__
+    if __active__ is not None:
+        raise RuntimeError("Another instrumentation is already active")
+    __active__ = owner
+
+    patches = []
+    for section, target, attribute in TARGETS:
+        original = getattr(target, attribute)
+        patches.append((target, attribute, original))
+        setattr(target, attribute, wrap(section, original))
+    return patches
+
+
+def restore(patches: list) -> None:
+    """Puts the original functions back, after that the instrumentation costs nothing anymore.
+
+    Args:
+        patches (list): as returned by instrument
+    """
+    global __active__
+    for target, attribute, original in reversed(patches):
+        setattr(target, attribute, original)
+    __active__ = None
+
+
+class Profiler:
+    """Timers and call counters around the hot paths of a tick, aggregated per tick.
+
+    Nothing is instrumented until enable() gets called, so a disabled profiler has no cost at all. Section times are
+    inclusive, e.g. find_path is part of resolve_needs and everything is part of tick. Rendering happens between ticks,
+    it gets recorded per frame instead and compared to the frame time.
+    """
+
+    def __init__(self, history: int = 600) -> None:
+        """Initializes a disabled profiler.
+
+        Args:
+            history (int, optional): Amount of ticks the statistics are computed over. Defaults to 600.
+        """
+        self.history = deque(maxlen=history)  # one dict per tick: section -> [calls, seconds]
+        self.current = {}  # sections of the running tick
+        self.frames = deque(maxlen=history)  # one (seconds drawing, seconds since the last frame) pair per frame
+        self.last_frame = None  # start of the last draw
+        self.patches = None
+        self.totals = {}  # id of a world -> its births and deaths at the end of the last tick
+
+    @property
+    def enabled(self) -> bool:
+        return self.patches is not None
+
+    def enable(self) -> None:
+        """Instruments the hot paths."""
+        if self.patches is None:
+            self.patches = instrument(self, self.__wrap__)
+
+    def disable(self) -> None:
+        """Removes the instrumentation again."""
+        if self.patches is not None:
+            restore(self.patches)
+            self.patches = None
+
+    def toggle(self) -> bool:
+        """Enables a disabled profiler and disables an enabled one.
+
+        Returns:
+            bool: whether it is enabled now
+        """
+        if self.enabled:
+            self.disable()
+        else:
+            self.enable()
+        return self.enabled
+
+    def reset(self) -> None:
+        """Drops the recorded ticks."""
+        self.history.clear()
+        self.current = {}
+        self.frames.clear()
+        self.last_frame = None
+
+    def __wrap__(self, section: str, function):
+        """Builds the timed replacement of a function.
+
+        Args:
+            section (str): The section the time gets added to.
+            function: The original function.
+
+        Returns:
+            the replacement
+        """
+        clock = time.perf_counter
+
+        if section == "tick":
+            def timed(world, *args, **kwargs):
+                start = clock()
+                try:
+                    return function(world, *args, **kwargs)
+                finally:
+                    self.__count__(section, clock() - start)
+                    self.__end_tick__(world)
+        elif section == "render":
+            def timed(*args, **kwargs):
+                start = clock()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.__end_frame__(start, clock() - start)
+        else:
+            def timed(*args, **kwargs):
+                start = clock()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.__count__(section, clock() - start)
+
+        timed.__wrapped__ = function
+        return timed
+
+    def __count__(self, section: str, seconds: float) -> None:
+        """Adds one call to a section of the running tick.
+
+        Args:
+            section (str): The section.
+            seconds (float): The duration of the call.
+        """
+        entry = self.current.get(section)
+        if entry is None:
+            self.current[section] = [1, seconds]
+        else:
+            entry[0] += 1
+            entry[1] += seconds
+
+    def __end_frame__(self, start: float, seconds: float) -> None:
+        """Records one drawn frame. The first frame only starts the frame clock.
+
+        Args:
+            start (float): When drawing started.
+            seconds (float): The duration of the draw.
+        """
+        if self.last_frame is not None:
+            self.frames.append((seconds, start - self.last_frame))
+        self.last_frame = start
+
+    def __end_tick__(self, world) -> None:
+        """Closes the running tick. Births and deaths are taken from the totals of the world.
+
+        Args:
+            world: The World that advanced.
+        """
+        births = sum(world.births.values())
+        deaths = sum(sum(causes.values()) for causes in world.deaths.values())
+        last = self.totals.get(id(world), (births, deaths))
+        self.totals[id(world)] = (births, deaths)
+
+        self.current["births"] = [births - last[0], 0.0]
+        self.current["deaths"] = [deaths - last[1], 0.0]
+        self.history.append(self.current)
+        self.current = {}
+
+    def last(self) -> dict:
+        """Returns the sections of the last finished tick.
+
+        Returns:
+            dict: section -> (calls, milliseconds), empty if no tick was recorded yet
+        """
+        if not self.history:
+            return {}
+        return {section: (calls, seconds * 1000) for section, (calls, seconds) in self.history[-1].items()}
+
+    def stats(self) -> dict:
+        """Aggregates the recorded ticks.
+
+        Returns:
+            dict: "ticks" the amount of recorded ticks, and per section "calls" and "ms" per tick on average, "max_ms" of the slowest tick and "share" of the tick time. "render" has the same per frame and its share of the frame time, once two frames were drawn.
+        """
+        ticks = len(self.history)
+        sections = {}
+        for record in self.history:
+            for section, (calls, seconds) in record.items():
+                entry = sections.setdefault(section, [0, 0.0, 0.0])
+                entry[0] += calls
+                entry[1] += seconds
+                entry[2] = max(entry[2], seconds)
+
+        tick_time = sections.get("tick", (0, 0.0))[1]
+        result = {"ticks": ticks}
+        for section, (calls, seconds, slowest) in sections.items():
+            result[section] = {
+                "calls": calls / ticks,
+                "ms": seconds * 1000 / ticks,
+                "max_ms": slowest * 1000,
+                "share": seconds / tick_time if tick_time else 0.0,
+            }
+
+        if self.frames:
+            drawing = sum(seconds for seconds, _ in self.frames)
+            frame_time = sum(frame for _, frame in self.frames)
+            result["render"] = {
+                "calls": 1.0,
+                "ms": drawing * 1000 / len(self.frames),
+                "max_ms": max(seconds for seconds, _ in self.frames) * 1000,
+                "share": drawing / frame_time if frame_time else 0.0,
+            }
+        return result
+
+    def lines(self) -> list:
+        """Formats the statistics as the lines of the in-window overlay.
+
+        Returns:
+            list: the lines, the slowest sections first
+        """
+        stats = self.stats()
+        if not stats["ticks"]:
+            return ["Profiler: waiting for ticks"]
+
+        tick = stats["tick"]
+        lines = [f"Tick: {tick['ms']:.2f} ms (max {tick['max_ms']:.2f})"]
+        timed = [section for section in stats if section not in ("ticks", "tick", "births", "deaths", "render")]
+        for section in sorted(timed, key=lambda section: -stats[section]["ms"]):
+            entry = stats[section]
+            lines.append(f"{section}: {entry['ms']:.2f} ms, {entry['calls']:.1f}x")
+        if "render" in stats:
+            render = stats["render"]
+            lines.append(f"Render: {render['ms']:.2f} ms per frame, {render['share']:.0%} of the frame")
+        lines.append(f"Births/deaths: {stats['births']['calls']:.2f}/{stats['deaths']['calls']:.2f}")
+        return lines
@@ -1,6 +1,6 @@
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
-import numpy as np
+from time_series import TimeSeries
 
 class RealTimePlot:
     def __init__(self, data_queue, simulation):
@@ -10,10 +10,9 @@ class RealTimePlot:
         plt.style.use('ggplot')
         self.fig, self.ax = plt.subplots(figsize=(8, 6))
         
-        self.rabbits_data = []
-        self.foxes_data = []
-        self.pigs_data = []
-        self.time_data = []
+        # population of rabbits, foxes and pigs per tick, only a bounded amount of points gets drawn
+        self.series = TimeSeries(3)
+        self.points = 1000
         
         self.line1, = self.ax.plot([], [], label='Rabbits', color='blue', linewidth=2)
         self.line2, = self.ax.plot([], [], label='Foxes', color='red', linewidth=2)
@@ -45,26 +44,27 @@ class RealTimePlot:
             return self.line1, self.line2, self.line3
 
     def update(self, frame):
+        received = False
         try:
             while not self.data_queue.empty():
                 time, rabbits, foxes, pigs = self.data_queue.get_nowait()
-                self.time_data.append(time)
-                self.rabbits_data.append(rabbits)
-                self.foxes_data.append(foxes)
-                self.pigs_data.append(pigs)
+                self.series.append(time, (rabbits, foxes, pigs))
+                received = True
         except:
             pass
 
-        if len(self.time_data) > 0:
-            self.line1.set_data(self.time_data, self.rabbits_data)
-            self.line2.set_data(self.time_data, self.foxes_data)
-            self.line3.set_data(self.time_data, self.pigs_data)
+        if received:
+            times, values = self.series.downsample(self.points)
+            self.line1.set_data(times[:, 0], values[:, 0])
+            self.line2.set_data(times[:, 1], values[:, 1])
+            self.line3.set_data(times[:, 2], values[:, 2])
             
-            # Dynamically adjust x-axis to show all data
-            self.ax.set_xlim(0, max(self.time_data) + 10)
+            # Dynamically adjust x-axis to show all kept data
+            oldest, newest = self.series.span()
+            self.ax.set_xlim(0 if len(self.series) < self.series.capacity else oldest, newest + 10)
             
             # Adjust y-axis to show all population data with 10% padding
-            max_pop = max(max(self.rabbits_data + self.foxes_data + self.pigs_data, default=0), 1)
+            max_pop = max(self.series.maximum, 1)
             self.ax.set_ylim(0, max_pop * 1.1)
         
         return self.line1, self.line2, self.line3
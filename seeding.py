@@ -0,0 +1,40 @@
+import random as rnd
+import numpy as np
+
+# subsystems with a random number stream of their own
+STREAMS = ("terrain", "movement", "genetics", "regrowth")
+
+
+class RandomStreams:
+    """Independent random number streams per subsystem, all derived from one run seed.
+
+    The same seed reproduces the same run, and a subsystem that draws more or fewer numbers (e.g. after an engine
+    change) doesn't shift the numbers any other subsystem gets.
+    """
+
+    def __init__(self, seed: int = None) -> None:
+        """Derives one stream per subsystem from the run seed.
+
+        Args:
+            seed (int, optional): The run seed. Defaults to None so that a fresh one gets drawn, it is kept in seed to repeat the run.
+        """
+        sequence = np.random.SeedSequence(seed)
+        self.seed = sequence.entropy
+
+        self.numpy = {}  # subsystem -> np.random.Generator, for the array code
+        self.python = {}  # subsystem -> random.Random, for the code using the random module interface
+        for name, child in zip(STREAMS, sequence.spawn(len(STREAMS))):
+            numpy_sequence, python_sequence = child.spawn(2)
+            self.numpy[name] = np.random.default_rng(numpy_sequence)
+            self.python[name] = rnd.Random(int(python_sequence.generate_state(1, np.uint64)[0]))
+
+    def integer(self, name: str) -> int:
+        """Draws a seed for code that takes a plain integer seed, e.g. the generator.
+
+        Args:
+            name (str): The subsystem.
+
+        Returns:
+            int: the drawn seed
+        """
+        return int(self.numpy[name].integers(0, 999999999))
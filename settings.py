@@ -1,13 +1,17 @@
+# DEFAULTS OF THE SIMULATION, A SimulationConfig (config.py) OVERRIDES THEM PER WORLD
 WIDTH = 1000 # WINDOW WIDTH
 HEIGHT = 800 # WINDOW HEIGHT
 FPS = 60 # 
 SPEED = 5 # ANIMAL EVENTS PER SECOND
+FAST_FORWARD = None # TICKS PER FRAME IN FAST FORWARD (NONE FOR AS MANY AS FIT INTO A FRAME AT FPS)
 TILESIZE = 20 # SIZE OF ONE TILE
 MAPSIZE = 50 # LENGTH/HEIGHT OF THE ENTIRE MAP
 B_PERCENT = 0.04 # PERCENT OF LANDTILES COVERED IN BERRIES
 H_PERCENT = 0.045 # PERCENT OF LANDTILES COVERED BY HERBIS
 C_PERCENT = 0.02 # PERCENT OF LANDTILES COVERED BY CARNIS
 O_PERCENT = 0.01 # PERCENT OF LANDTILES COVERED BY OMNIS
+PATHFINDER = "astar" # "astar" OR "hpa" (HIERARCHICAL, FOR LARGE MAPS)
+SEED = None # RUN SEED, THE SAME SEED REPEATS THE SAME RUN (NONE FOR A RANDOM ONE)
 # Season settings
 SEASON_LENGTH = 100  # Length of each season in ticks
 SEASONS = ["Winter","Spring", "Summer", "Fall"]
@@ -29,3 +33,10 @@ SUMMER_BREEDING_MULTIPLIER = 1.0     # Normal breeding
 FALL_FOOD_MULTIPLIER = 2.0           # Abundant food in fall
 FALL_BREEDING_MULTIPLIER = 1.2       # Slightly harder breeding
 FALL_THIRST_MULTIPLIER = 1.0         # Normal thirst
+
+# Ranges random genomes get drawn from, per animal type
+GENOME_RANGES = {
+    "rabbit": {"max_age": (500, 600), "hunger_rate": (5, 10), "thirst_rate": (5, 10)},
+    "fox": {"max_age": (700, 800), "hunger_rate": (8, 14), "thirst_rate": (8, 14)},
+    "pig": {"max_age": (600, 750), "hunger_rate": (10, 15), "thirst_rate": (8, 14)},
+}
@@ -0,0 +1,244 @@
+import os
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")  # every worker would greet otherwise
+
+from ast import literal_eval
+import csv
+import json
+import hashlib
+import argparse
+import functools
+import itertools
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from config import FIELDS, SimulationConfig
+from World.world import World
+
+SPECIES = ("rabbit", "fox", "pig")
+# sources whose changes alter the outcome of a run, cached cells of older code don't get reused
+SOURCES = ("Algorithms", "Animals", "World", "config.py", "generator.py", "seeding.py", "settings.py")
+
+
+def grid(space: dict) -> list:
+    """Builds every combination of the given setting values.
+
+    Args:
+        space (dict): setting name mapped to the list of its values
+
+    Returns:
+        list: one dict of overrides per combination
+    """
+    names = sorted(space)
+    return [dict(zip(names, values)) for values in itertools.product(*(space[name] for name in names))]
+
+
+def sample(space: dict, amount: int, seed: int = None) -> list:
+    """Draws random combinations of setting values.
+
+    Args:
+        space (dict): setting name mapped to a (low, high) range or a list of values to choose from
+        amount (int): Amount of combinations.
+        seed (int, optional): Seed of the sampling. Defaults to None.
+
+    Returns:
+        list: one dict of overrides per combination
+    """
+    rng = np.random.default_rng(seed)
+    configs = []
+    for _ in range(amount):
+        config = {}
+        for name in sorted(space):
+            values = space[name]
+            if isinstance(values, tuple):
+                low, high = values
+                if isinstance(low, int) and isinstance(high, int):
+                    config[name] = int(rng.integers(low, high, endpoint=True))
+                else:
+                    config[name] = float(rng.uniform(low, high))
+            else:
+                config[name] = values[int(rng.integers(len(values)))]
+        configs.append(config)
+    return configs
+
+
+@functools.lru_cache(maxsize=None)
+def __code_version__() -> str:
+    """Hashes the sources of the simulation.
+
+    Returns:
+        str: the hash, it changes with every edit of a file in SOURCES
+    """
+    root = os.path.dirname(os.path.abspath(__file__))
+    files = []
+    for source in SOURCES:
+        path = os.path.join(root, source)
+        if os.path.isdir(path):
+            files.extend(sorted(os.path.join(path, name) for name in os.listdir(path) if name.endswith(".py")))
+        elif os.path.exists(path):
+            files.append(path)
+
+    digest = hashlib.sha256()
+    for path in files:
+        digest.update(os.path.relpath(path, root).encode())
+        with open(path, "rb") as file:
+            digest.update(file.read())
+    return digest.hexdigest()
+
+
+def cache_key(config: dict, seed: int, ticks: int, engine: str) -> str:
+    """Hashes everything a sweep cell depends on: every setting including the defaults, the run and the simulation code.
+
+    Args:
+        config (dict): The setting overrides.
+        seed (int): The run seed.
+        ticks (int): Amount of ticks.
+        engine (str): The engine of the world.
+
+    Returns:
+        str: the key of the cell in the cache
+    """
+    description = json.dumps({
+        "config": SimulationConfig(**config).to_dict(),
+        "seed": seed,
+        "ticks": ticks,
+        "engine": engine,
+        "code": __code_version__(),
+    }, sort_keys=True, default=repr)
+    return hashlib.sha256(description.encode()).hexdigest()
+
+
+def __run_cell__(config: dict, seed: int, ticks: int, engine: str, path: str) -> None:
+    """Worker of the sweep. Simulates one configuration with one seed and stores the population of every tick.
+
+    Args:
+        config (dict): The setting overrides.
+        seed (int): The run seed.
+        ticks (int): Amount of ticks.
+        engine (str): The engine of the world.
+        path (str): File the counts get stored in.
+    """
+    world = World(engine=engine, seed=seed, config=SimulationConfig(**config))
+    counts = np.zeros((ticks, len(SPECIES)), dtype=np.int32)
+    for tick in range(ticks):
+        world.step()
+        population = world.population()
+        counts[tick] = [population[species] for species in SPECIES]
+
+    # written under a temporary name first, so an interrupted sweep never leaves a broken cell behind
+    temporary = f"{path}.{os.getpid()}.tmp.npy"
+    np.save(temporary, counts)
+    os.replace(temporary, path)
+
+
+def __summarize__(config: dict, seed: int, counts: np.ndarray) -> dict:
+    """Builds the summary row of one sweep cell.
+
+    Args:
+        config (dict): The setting overrides.
+        seed (int): The run seed.
+        counts (np.ndarray): population of every tick
+
+    Returns:
+        dict: the row
+    """
+    row = dict(config)
+    row["seed"] = seed
+    for i, species in enumerate(SPECIES):
+        extinct = np.flatnonzero(counts[:, i] == 0)
+        row[f"{species}_final"] = int(counts[-1, i]) if len(counts) else 0
+        row[f"{species}_mean"] = round(float(counts[:, i].mean()), 3) if len(counts) else 0.0
+        row[f"{species}_extinct_tick"] = int(extinct[0]) + 1 if len(extinct) else -1
+    return row
+
+
+def run_sweep(configs: list, seeds: list, ticks: int, engine: str = "sprites", workers: int = None,
+              cache_dir: str = ".sweep_cache", out: str = "sweep.csv") -> list:
+    """Runs every configuration with every seed in parallel. Cells that are already cached get skipped.
+
+    Args:
+        configs (list): dicts of setting overrides, e.g. from grid() or sample()
+        seeds (list): run seeds every configuration gets simulated with
+        ticks (int): Amount of ticks per run.
+        engine (str, optional): The engine of the worlds. Defaults to "sprites".
+        workers (int, optional): Amount of worker processes. Defaults to None so that every core gets used.
+        cache_dir (str, optional): Directory of the cached cells. Defaults to ".sweep_cache".
+        out (str, optional): CSV file the summary table gets written to. Defaults to "sweep.csv", None to skip it.
+
+    Returns:
+        list: the summary rows
+    """
+    for config in configs:
+        for name in config:
+            if name not in FIELDS:
+                raise ValueError(f"Unknown setting: {name}")
+
+    os.makedirs(cache_dir, exist_ok=True)
+    cells = [
+        (config, seed, os.path.join(cache_dir, cache_key(config, seed, ticks, engine) + ".npy"))
+        for config in configs
+        for seed in seeds
+    ]
+
+    missing = [cell for cell in cells if not os.path.exists(cell[2])]
+    if missing:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            futures = [pool.submit(__run_cell__, config, seed, ticks, engine, path) for config, seed, path in missing]
+            for future in futures:
+                future.result()  # raises the exception of a failed cell
+
+    rows = [__summarize__(config, seed, np.load(path)) for config, seed, path in cells]
+
+    if out and rows:
+        fields = list(dict.fromkeys(key for row in rows for key in row))
+        with open(out, "w", newline="") as file:
+            writer = csv.DictWriter(file, fieldnames=fields)
+            writer.writeheader()
+            writer.writerows(rows)
+
+    return rows
+
+
+def __parse_space__(items: list, ranges: bool) -> dict:
+    """Parses NAME=v1,v2,... (or NAME=low:high for ranges) command line items.
+
+    Args:
+        items (list): the command line items
+        ranges (bool): Whether low:high ranges are allowed.
+
+    Returns:
+        dict: setting name mapped to its values
+    """
+    space = {}
+    for item in items:
+        name, _, values = item.partition("=")
+        if ranges and ":" in values:
+            low, high = values.split(":")
+            space[name] = (literal_eval(low), literal_eval(high))
+        else:
+            space[name] = [literal_eval(value) for value in values.split(",")]
+    return space
+
+
+def main() -> None:
+    """Runs a sweep from the command line."""
+    parser = argparse.ArgumentParser(description="Runs a parameter sweep over the settings.")
+    parser.add_argument("settings", nargs="+", help="NAME=v1,v2,... or, with --random, NAME=low:high")
+    parser.add_argument("--random", type=int, metavar="N", help="draws N random combinations instead of the full grid")
+    parser.add_argument("--seeds", type=int, default=3, help="runs per combination")
+    parser.add_argument("--seed", type=int, default=0, help="seed the run seeds and the sampling derive from")
+    parser.add_argument("--ticks", type=int, default=1000)
+    parser.add_argument("--engine", choices=("sprites", "arrays"), default="sprites")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--cache", default=".sweep_cache")
+    parser.add_argument("--out", default="sweep.csv")
+    args = parser.parse_args()
+
+    space = __parse_space__(args.settings, args.random is not None)
+    configs = sample(space, args.random, args.seed) if args.random is not None else grid(space)
+    seeds = [int(s) for s in np.random.SeedSequence(args.seed).generate_state(args.seeds, np.uint64)]
+
+    rows = run_sweep(configs, seeds, args.ticks, args.engine, args.workers, args.cache, args.out)
+    print(f"{len(configs)} configurations x {len(seeds)} seeds, {len(rows)} rows written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
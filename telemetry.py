@@ -0,0 +1,239 @@
+import os
+import csv
+import glob
+import queue
+import threading
+import numpy as np
+from Animals.species_arrays import GENOME_FIELDS
+from World.world import DEATH_CAUSES
+
+try:  # only needed for Parquet files
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+SPECIES = ("rabbit", "fox", "pig")
+
+FORMATS = ("csv", "parquet", "npz")
+
+
+def __columns__() -> dict:
+    """Returns the columns of a telemetry record with their types.
+
+    Returns:
+        dict: column name mapped to its dtype
+    """
+    columns = {"tick": np.int64, "season": "U6"}
+    for species in SPECIES:
+        columns[f"{species}_count"] = np.int64
+        columns[f"{species}_births"] = np.int64
+        for cause in DEATH_CAUSES:
+            columns[f"{species}_deaths_{cause}"] = np.int64
+        for field in GENOME_FIELDS:
+            columns[f"{species}_{field}_mean"] = np.float64
+            columns[f"{species}_{field}_var"] = np.float64
+    return columns
+
+
+class TelemetrySink:
+    """Records per tick statistics of a world and streams them to a file in columnar batches.
+
+    The sink gets attached to the world as an observer. Records are written into preallocated arrays and full batches
+    get written by a background thread, so a run of millions of ticks never has to fit into memory.
+    """
+
+    def __init__(self, path: str, format: str = None, batch: int = 4096, every: int = 1) -> None:
+        """Initializes the sink and starts its writer thread.
+
+        Args:
+            path (str): The output. For "npz" a directory every batch gets its own file in.
+            format (str, optional): "csv", "parquet" or "npz". Defaults to None so that it follows the extension of the path, npz otherwise.
+            batch (int, optional): Amount of records written at once. Defaults to 4096.
+            every (int, optional): Records every n-th tick, births and deaths are summed up in between. Defaults to 1.
+        """
+        if format is None:
+            extension = os.path.splitext(path)[1].lstrip(".")
+            format = extension if extension in FORMATS else "npz"
+        if format not in FORMATS:
+            raise ValueError(f"Unknown telemetry format: {format}")
+        if format == "parquet" and pa is None:
+            raise ImportError("Parquet telemetry needs pyarrow, install it with: pip install pyarrow")
+
+        self.path = path
+        self.format = format
+        self.batch = batch
+        self.every = every
+        self.types = __columns__()
+        self.seasons = None  # season names of the recorded world
+        self.__new_buffer__()
+
+        self.births = dict.fromkeys(SPECIES, 0)  # totals of the world at the last record
+        self.deaths = {species: dict.fromkeys(DEATH_CAUSES, 0) for species in SPECIES}
+
+        self.queue = queue.Queue(maxsize=4)  # full batches waiting to be written, blocks if the disk can't keep up
+        self.error = None
+        self.batches = 0
+        self.writer = None  # csv writer or ParquetWriter, opened with the first batch
+        self.file = None
+        self.thread = threading.Thread(target=self.__write_batches__, daemon=True)
+        self.thread.start()
+
+    def __enter__(self) -> "TelemetrySink":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def __new_buffer__(self) -> None:
+        """Allocates the array of the next batch, one row per record and one column per entry of types."""
+        self.buffer = np.zeros((self.batch, len(self.types)), dtype=np.float64)
+        self.row = 0
+
+    # observer interface of the World
+
+    def draw(self, world) -> None:
+        """Telemetry has nothing to draw."""
+
+    def map_updated(self, world, tiles: list) -> None:
+        """Telemetry doesn't track tiles."""
+
+    def ticked(self, world) -> None:
+        """Records the world after a tick, see record.
+
+        Args:
+            world: The World that advanced.
+        """
+        if world.ticks % self.every == 0:
+            self.record(world)
+
+    def record(self, world) -> None:
+        """Appends one record of the current state of a world.
+
+        Args:
+            world: The World.
+        """
+        # the row is filled in the order of the columns, the season is kept as its index until the batch gets written
+        row = self.buffer[self.row]
+        row[0] = world.ticks
+        row[1] = world.current_season
+        self.seasons = world.config.SEASONS
+
+        population = world.population()
+        means, variances = self.__genome_stats__(world, population)
+        column = 2
+        for index, species in enumerate(SPECIES):
+            deaths = world.deaths[species]
+            counts = [population[species], world.births[species] - self.births[species]]
+            counts += [deaths[cause] - self.deaths[species][cause] for cause in DEATH_CAUSES]
+            row[column : column + len(counts)] = counts
+            column += len(counts)
+            self.births[species] = world.births[species]
+            self.deaths[species] = dict(deaths)
+
+            width = 2 * len(GENOME_FIELDS)
+            row[column : column + width : 2] = means[index]
+            row[column + 1 : column + width : 2] = variances[index]
+            column += width
+
+        self.row += 1
+        if self.row == self.batch:
+            self.flush()
+
+    def __genome_stats__(self, world, population: dict) -> tuple:
+        """Computes mean and variance of every genome field per species from the running sums of the world, so the
+        cost doesn't grow with the amount of animals.
+
+        Args:
+            world: The World.
+            population (dict): The population of the world.
+
+        Returns:
+            tuple: means and variances, both of shape (species, 6) ordered like SPECIES and GENOME_FIELDS, NaN for extinct species
+        """
+        sums = world.genome_sums()
+        totals = np.array([sums[species] for species in SPECIES])
+        amount = np.array([population[species] for species in SPECIES], dtype=np.float64)[:, None]
+
+        with np.errstate(invalid="ignore", divide="ignore"):
+            means = totals[:, 0] / amount
+            variances = np.maximum(totals[:, 1] / amount - means * means, 0)
+        return means, np.where(amount > 0, variances, np.nan)
+
+    def flush(self) -> None:
+        """Hands the recorded part of the current batch to the writer thread."""
+        if self.error is not None:
+            raise self.error
+        if self.row == 0:
+            return
+
+        records = self.buffer[: self.row]
+        batch = {name: records[:, index].astype(dtype) for index, (name, dtype) in enumerate(self.types.items()) if name != "season"}
+        batch["season"] = np.array(self.seasons)[records[:, 1].astype(np.intp)]
+        batch = {name: batch[name] for name in self.types}  # keeps the order of the columns
+        self.queue.put(batch)
+        self.__new_buffer__()
+
+    def close(self) -> None:
+        """Writes the remaining records and waits for the writer thread. Raises the error of a failed write."""
+        if self.thread.is_alive():
+            self.flush()
+            self.queue.put(None)
+            self.thread.join()
+        if self.error is not None:
+            raise self.error
+
+    # writer thread
+
+    def __write_batches__(self) -> None:
+        """Writes the batches of the queue until close puts None into it."""
+        try:
+            while (batch := self.queue.get()) is not None:
+                self.__write__(batch)
+                self.batches += 1
+        except Exception as error:
+            self.error = error
+        finally:
+            if self.format == "parquet" and self.writer is not None:
+                self.writer.close()
+            if self.file is not None:
+                self.file.close()
+
+    def __write__(self, batch: dict) -> None:
+        """Writes one batch in the format of the sink.
+
+        Args:
+            batch (dict): column name mapped to its values
+        """
+        if self.format == "npz":
+            os.makedirs(self.path, exist_ok=True)
+            np.savez(os.path.join(self.path, f"batch-{self.batches:06d}.npz"), **batch)
+        elif self.format == "csv":
+            if self.writer is None:
+                self.file = open(self.path, "w", newline="")
+                self.writer = csv.writer(self.file)
+                self.writer.writerow(batch)
+            self.writer.writerows(zip(*(column.tolist() for column in batch.values())))
+        else:
+            table = pa.table(batch)
+            if self.writer is None:
+                self.writer = pq.ParquetWriter(self.path, table.schema)
+            self.writer.write_table(table)
+
+
+def load_npz(path: str) -> dict:
+    """Reads all batches of an npz telemetry directory, e.g. for pandas.DataFrame(load_npz(path)).
+
+    Args:
+        path (str): The directory of the sink.
+
+    Returns:
+        dict: column name mapped to the values of every record
+    """
+    batches = []
+    for name in sorted(glob.glob(os.path.join(path, "batch-*.npz"))):
+        with np.load(name) as file:
+            batches.append({column: file[column] for column in file.files})
+    if not batches:
+        return {}
+    return {column: np.concatenate([batch[column] for batch in batches]) for column in batches[0]}
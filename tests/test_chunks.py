@@ -0,0 +1,21 @@
+import numpy as np
+from config import SimulationConfig
+from World.chunks import ChunkedTerrain
+from World.terrain import BERRY
+from World.world import World
+
+
+def test_world_on_a_chunked_window(tmp_path):
+    config = SimulationConfig(B_PERCENT=0.1, SEASON_LENGTH=20)
+    terrain = ChunkedTerrain(size=96, gseed=7, chunk_size=32, path=str(tmp_path / "big"), config=config)
+    terrain = ChunkedTerrain.open(str(tmp_path / "big"), mode="c")
+    window = terrain[16:64, 40:88]
+    before = np.array(window)
+
+    world = World(map=window, seed=1, config=terrain.config, spawn=False)
+    for _ in range(100):
+        world.step()
+
+    assert (world.map != before).any()  # berries grew and withered
+    np.testing.assert_array_equal(world.terrain.berry, world.map == BERRY)
+    np.testing.assert_array_equal(terrain[16:64, 40:88], before)
@@ -0,0 +1,59 @@
+import numpy as np
+from World.world import World
+
+SEEDS = (1, 2, 3, 4)
+TICKS = 400
+TOLERANCE = 0.2  # relative difference the two engines may have on average over the seeds
+
+
+def __run__(engine: str) -> tuple:
+    """Runs the seeded worlds of one engine.
+
+    Args:
+        engine (str): The engine of the worlds.
+
+    Returns:
+        tuple: mean population per species over all ticks and seeds, births per species summed over the seeds
+    """
+    populations = {"rabbit": 0, "fox": 0, "pig": 0}
+    births = dict(populations)
+    for seed in SEEDS:
+        world = World(engine=engine, seed=seed)
+        for _ in range(TICKS):
+            world.step()
+            for animal_type, population in world.population().items():
+                populations[animal_type] += population
+        for animal_type in births:
+            births[animal_type] += world.births[animal_type]
+
+    means = {animal_type: total / (TICKS * len(SEEDS)) for animal_type, total in populations.items()}
+    return means, births
+
+
+def test_engines_agree_on_seeded_runs():
+    sprites, arrays = __run__("sprites"), __run__("arrays")
+    for expected, actual in zip(sprites, arrays):
+        for animal_type in expected:
+            assert np.isclose(actual[animal_type], expected[animal_type], rtol=TOLERANCE), (animal_type, expected, actual)
+
+
+def test_every_rabbit_feeds_one_hunter():
+    world = World(engine="arrays", seed=1)
+    rabbits, foxes, pigs = world.herds["rabbit"], world.herds["fox"], world.herds["pig"]
+    rabbits.remove(np.arange(rabbits.count) > 0)
+    foxes.remove(np.arange(foxes.count) > 0)
+    pigs.remove(np.arange(pigs.count) > 0)
+
+    # a fox and a pig hunt the same rabbit and stand on its tile, the rabbit rests so it stays there
+    x, y = int(rabbits.x[0]), int(rabbits.y[0])
+    rabbits.set_timer[0] = 5
+    for herd in (foxes, pigs):
+        herd.x[0], herd.y[0] = x, y
+        herd.target[0] = rabbits.id[0]
+        herd.set_timer[0] = 5
+        herd.hunger[0] = 800
+    world.step()
+
+    assert rabbits.count == 0
+    assert world.deaths["rabbit"]["predation"] == 1
+    assert (foxes.hunger[0] < 800) != (pigs.hunger[0] < 800)
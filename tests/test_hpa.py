@@ -0,0 +1,15 @@
+import numpy as np
+import Algorithms.astar as ast
+from Algorithms.hpa import HierarchicalPathfinder
+from World.terrain import GRASS, WATER
+
+
+def test_neighboring_clusters_get_the_shortest_path():
+    tiles = np.full((32, 48), GRASS, dtype=np.uint8)
+    tiles[:28, 16] = WATER  # the only entrance between the left clusters lies at the bottom
+    pathfinder, nav_grid = HierarchicalPathfinder(tiles), ast.NavGrid(tiles)
+
+    for start, end in (((14, 1), (18, 1)), ((2, 30), (20, 5)), ((30, 3), (33, 20))):
+        path = pathfinder.find_path(start, end)
+        assert len(path) == len(nav_grid.search(start, end)), (start, end)
+    assert len(pathfinder.find_path((14, 1), (18, 1))) == 2 * 27 + 4
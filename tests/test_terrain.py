@@ -0,0 +1,23 @@
+import numpy as np
+from World.terrain import Terrain, BERRY, GRASS, WATER
+
+
+def test_set_writes_through_sliced_maps():
+    whole = np.full((20, 20), GRASS, dtype=np.uint8)
+    whole[5, 8] = WATER
+    terrain = Terrain(whole[2:12, 4:16])  # rows with a stride, not contiguous
+
+    terrain.set([3 * terrain.width + 4], BERRY)
+    terrain.set([5 * terrain.width + 2], WATER)
+
+    assert terrain[3, 4] == BERRY and terrain.berry[3, 4]
+    assert terrain[5, 2] == WATER and not terrain.passable[5, 2]
+    np.testing.assert_array_equal(terrain.berry, terrain.tiles == BERRY)
+    np.testing.assert_array_equal(terrain.passable, terrain.tiles != WATER)
+
+
+def test_contiguous_maps_get_shared():
+    tiles = np.full((10, 10), GRASS, dtype=np.uint8)
+    terrain = Terrain(tiles)
+    terrain.set([12], BERRY)
+    assert tiles[1, 2] == BERRY
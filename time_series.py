@@ -0,0 +1,101 @@
+import numpy as np
+
+
+class TimeSeries:
+    """Preallocated ring buffer of samples with one value per column, e.g. the population of every species per tick.
+
+    Appending is O(1) and the oldest samples get overwritten once the buffer is full, so memory stays the same no
+    matter how long the simulation runs. Downsampling for drawing is one vectorized pass over the kept samples, its
+    cost grows with the samples until the buffer is full and is bounded by the capacity from then on.
+    """
+
+    def __init__(self, columns: int, capacity: int = 100000) -> None:
+        """Initializes an empty buffer.
+
+        Args:
+            columns (int): Amount of values per sample.
+            capacity (int, optional): Amount of samples that are kept. Defaults to 100000.
+        """
+        self.columns = columns
+        self.capacity = capacity
+        self.times = np.zeros(capacity, dtype=np.int64)
+        self.values = np.zeros((capacity, columns), dtype=np.float64)
+        self.start = 0  # index of the oldest sample
+        self.count = 0
+        self.maximum = 0.0  # largest value ever appended, including overwritten samples
+
+    def __len__(self) -> int:
+        return self.count
+
+    def append(self, time: int, values: tuple) -> None:
+        """Adds a sample, overwriting the oldest one if the buffer is full.
+
+        Args:
+            time (int): The time of the sample.
+            values (tuple): One value per column.
+        """
+        index = (self.start + self.count) % self.capacity
+        self.times[index] = time
+        self.values[index] = values
+        if self.count < self.capacity:
+            self.count += 1
+        else:
+            self.start = (self.start + 1) % self.capacity
+
+        self.maximum = max(self.maximum, max(values))
+
+    def span(self) -> tuple:
+        """Returns the time of the oldest and of the newest sample.
+
+        Returns:
+            tuple: (oldest, newest), None if the buffer is empty
+        """
+        if not self.count:
+            return None
+        return int(self.times[self.start]), int(self.times[(self.start + self.count - 1) % self.capacity])
+
+    def ordered(self) -> tuple:
+        """Returns the samples from oldest to newest.
+
+        Returns:
+            tuple: times of shape (count,) and values of shape (count, columns)
+        """
+        end = self.start + self.count
+        if end <= self.capacity:
+            return self.times[self.start : end], self.values[self.start : end]
+
+        end -= self.capacity
+        return (
+            np.concatenate((self.times[self.start :], self.times[:end])),
+            np.concatenate((self.values[self.start :], self.values[:end])),
+        )
+
+    def downsample(self, points: int = 1000) -> tuple:
+        """Reduces the samples to at most the given amount of points per column. Every bucket of consecutive samples
+        is represented by its minimum and maximum in the order they occurred, so spikes stay visible. It costs
+        O(count) per call.
+
+        Args:
+            points (int, optional): Maximum amount of points per column. Defaults to 1000.
+
+        Returns:
+            tuple: times and values, both of shape (n, columns) as every column keeps other samples. n is the amount
+            of samples if there are at most points of them, otherwise twice the amount of buckets, at most points.
+        """
+        times, values = self.ordered()
+        if self.count <= points:
+            return np.repeat(times[:, None], self.columns, axis=1), values
+
+        buckets = max(points // 2, 1)
+        size = -(-self.count // buckets)
+        padding = -self.count % size
+        if padding:  # the last bucket gets filled up with its last sample
+            times = np.concatenate((times, np.repeat(times[-1:], padding)))
+            values = np.concatenate((values, np.repeat(values[-1:], padding, axis=0)))
+
+        grouped = values.reshape(-1, size, self.columns)
+        low, high = grouped.argmin(axis=1), grouped.argmax(axis=1)
+        offsets = np.arange(len(grouped))[:, None, None] * size
+        indices = (np.stack((np.minimum(low, high), np.maximum(low, high)), axis=1) + offsets).reshape(-1, self.columns)
+
+        return times[indices], np.take_along_axis(values, indices, axis=0)
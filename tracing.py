@@ -0,0 +1,233 @@
+import os
+import json
+import time
+import threading
+from collections import deque
+import Algorithms.astar as ast
+import Algorithms.hpa as hpa
+from profiler import instrument, restore
+
+# sections of profiler.TARGETS that get a span, the others are called too often per tick and stay untouched
+SPANS = ("tick", "regrowth", "animals", "find_prey", "find_mate", "find_path", "render")
+
+
+class TraceRecorder:
+    """Records spans of ticks, their phases and every pathfinding call as Chrome trace events, which can be opened in
+    chrome://tracing or https://ui.perfetto.dev.
+
+    Events are kept in a ring buffer of fixed capacity, so the recorder can stay enabled during runs of many hours and
+    always holds the most recent ones. Every tick and frame gets its span, the spans inside of it are only kept for
+    every n-th tick and for ticks that took longer than a threshold, which are the ones worth looking at.
+    """
+
+    def __init__(self, path: str = "trace.json", capacity: int = 200000, sample: int = 100,
+                 slow_ms: float = 20.0, max_children: int = 10000) -> None:
+        """Initializes a disabled recorder.
+
+        Args:
+            path (str, optional): File flush writes to. Defaults to "trace.json".
+            capacity (int, optional): Maximum amount of buffered events, the oldest get dropped. Defaults to 200000.
+            sample (int, optional): The spans inside every n-th tick and frame are kept. Defaults to 100.
+            slow_ms (float, optional): The spans inside ticks and frames taking at least this long are kept. Defaults to 20.0.
+            max_children (int, optional): Maximum amount of spans kept inside one tick or frame. Defaults to 10000.
+        """
+        self.path = path
+        self.sample = sample
+        self.slow_ms = slow_ms
+        self.max_children = max_children
+
+        self.events = deque(maxlen=capacity)
+        self.evicted = 0  # events pushed out of the buffer by newer ones
+        self.truncated = 0  # spans over max_children
+        self.pending = []  # (name, start, duration, args) of the spans inside the running tick or frame
+        self.depth = 0
+        self.roots = {}  # name of a top level span -> amount recorded
+        self.totals = {}  # id of a world -> its births and deaths at the end of the last tick
+
+        self.patches = None
+        self.origin = time.perf_counter_ns()
+        self.pid = os.getpid()
+        self.tid = threading.get_ident()
+
+    def __enter__(self) -> "TraceRecorder":
+        self.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+        self.flush()
+
+    @property
+    def enabled(self) -> bool:
+        return self.patches is not None
+
+    def start(self) -> None:
+        """Instruments the simulation, fails if a Profiler is enabled."""
+        if self.patches is None:
+            self.patches = instrument(self, self.__wrap__)
+
+    def stop(self) -> None:
+        """Removes the instrumentation, the buffered events are kept until flush."""
+        if self.patches is not None:
+            restore(self.patches)
+            self.patches = None
+            self.pending = []
+            self.depth = 0
+
+    def __wrap__(self, section: str, function):
+        """Builds the recording replacement of a function.
+
+        Args:
+            section (str): The section of the function.
+            function: The original function.
+
+        Returns:
+            the replacement, the original function for sections without spans
+        """
+        if section not in SPANS:
+            return function
+
+        clock = time.perf_counter_ns
+        if section == "find_path":
+            registry = ast.__nav_grids__ if function.__module__ == ast.__name__ else hpa.__pathfinders__
+
+            def recorded(grid, start, end):
+                cache = ast.path_cache
+                hits, misses = cache.hits, cache.misses
+                path = None
+                self.depth += 1
+                begin = clock()
+                try:
+                    path = function(grid, start, end)
+                    return path
+                finally:
+                    duration = clock() - begin
+                    self.depth -= 1
+                    # a failed call still gets its span, only without the description of the path
+                    args = None
+                    if path is not None:
+                        # paths from start to start never reach the cache, they are neither cached nor searched
+                        args = {"start": start, "end": end, "length": len(path), "cached": cache.hits > hits}
+                        if cache.misses > misses:
+                            args["expanded"] = registry[id(grid)][1].expanded
+                    self.__span__(section, begin, duration, args)
+
+        elif section == "tick":
+            def recorded(world, *args, **kwargs):
+                self.depth += 1
+                begin = clock()
+                try:
+                    return function(world, *args, **kwargs)
+                finally:
+                    duration = clock() - begin
+                    self.depth -= 1
+                    self.__span__(section, begin, duration, self.__tick_args__(world))
+
+        else:
+            def recorded(*args, **kwargs):
+                self.depth += 1
+                begin = clock()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    duration = clock() - begin
+                    self.depth -= 1
+                    self.__span__(section, begin, duration, None)
+
+        recorded.__wrapped__ = function
+        return recorded
+
+    def __tick_args__(self, world) -> dict:
+        """Describes a finished tick of a world.
+
+        Args:
+            world: The World.
+
+        Returns:
+            dict: tick, season, births and deaths of the tick
+        """
+        births = sum(world.births.values())
+        deaths = sum(sum(causes.values()) for causes in world.deaths.values())
+        last = self.totals.get(id(world), (births, deaths))
+        self.totals[id(world)] = (births, deaths)
+        return {
+            "tick": world.ticks,
+            "season": world.config.SEASONS[world.current_season],
+            "births": births - last[0],
+            "deaths": deaths - last[1],
+        }
+
+    def __span__(self, name: str, begin: int, duration: int, args: dict) -> None:
+        """Adds a finished span. Nested spans wait for their top level span, which decides whether they are kept.
+
+        Args:
+            name (str): The section.
+            begin (int): Start in nanoseconds of perf_counter_ns.
+            duration (int): Duration in nanoseconds.
+            args (dict): Shown with the span in the viewer, None for none.
+        """
+        if self.depth:
+            if len(self.pending) < self.max_children:
+                self.pending.append((name, begin, duration, args))
+            else:
+                self.truncated += 1
+            return
+
+        number = self.roots.get(name, 0)
+        self.roots[name] = number + 1
+        if number % self.sample == 0 or duration >= self.slow_ms * 1e6:
+            spans = self.pending
+            spans.append((name, begin, duration, args))
+        else:
+            spans = ((name, begin, duration, args),)
+        self.pending = []
+
+        self.evicted += max(len(self.events) + len(spans) - self.events.maxlen, 0)
+        self.events.extend(self.__event__(*span) for span in spans)
+
+    def __event__(self, name: str, begin: int, duration: int, args: dict) -> dict:
+        """Converts a span into a complete event of the trace event format.
+
+        Args:
+            name (str): The section.
+            begin (int): Start in nanoseconds of perf_counter_ns.
+            duration (int): Duration in nanoseconds.
+            args (dict): Shown with the span in the viewer, None for none.
+
+        Returns:
+            dict: the event with its times in microseconds
+        """
+        event = {
+            "name": name,
+            "cat": "pathfinding" if name == "find_path" else "simulation",
+            "ph": "X",
+            "ts": (begin - self.origin) / 1000,
+            "dur": duration / 1000,
+            "pid": self.pid,
+            "tid": self.tid,
+        }
+        if args:
+            event["args"] = args
+        return event
+
+    def flush(self, path: str = None) -> None:
+        """Writes the buffered events in one go, replacing the file of an earlier flush.
+
+        Args:
+            path (str, optional): The JSON file. Defaults to None so that the path of the recorder is used.
+        """
+        path = self.path if path is None else path
+        trace = {
+            "traceEvents": [
+                {"name": "process_name", "ph": "M", "pid": self.pid, "args": {"name": "Ecosystem Simulation"}},
+                *self.events,
+            ],
+            "displayTimeUnit": "ms",
+            "otherData": {"evicted": self.evicted, "truncated": self.truncated, "sample": self.sample, "slow_ms": self.slow_ms},
+        }
+
+        # written next to the file first, so an interrupted flush never leaves a broken trace behind
+        temporary = f"{path}.tmp"
+        with open(temporary, "w") as file:
+            json.dump(trace, file, separators=(",", ":"))
+        os.replace(temporary, path)